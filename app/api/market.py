@@ -5,13 +5,41 @@ Uses yfinance for live market data with mock fallback.
 """
 
 from fastapi import APIRouter, Query
+from fastapi.responses import StreamingResponse
 
+from app.core.errors import ValidationError
 from app.models.ticker import ChartTimeRange, PriceHistory, TickerSnapshot
 from app.services.ticker_service import TickerService
 
 router = APIRouter()
 ticker_service = TickerService()
 
+MAX_SNAPSHOT_SYMBOLS = 50
+
+
+@router.get("/snapshots", response_model=list[TickerSnapshot])
+async def get_ticker_snapshots(
+    symbols: str = Query(..., description="Comma-separated ticker symbols, e.g. AAPL,NVDA"),
+) -> list[TickerSnapshot]:
+    """
+    Get snapshot information for several tickers in one request.
+
+    Quotes are fetched through the provider's bulk path, so a watchlist view
+    costs a few batched upstream requests instead of one per symbol.
+
+    **Query params:**
+    - **symbols**: Comma-separated symbols (1-50); duplicates are collapsed
+
+    **Errors:**
+    - 400: No symbols, or more than 50
+    - 404: Unknown symbol
+    - 502: External service unavailable
+    """
+    requested = [symbol.strip() for symbol in symbols.split(",") if symbol.strip()]
+    if not requested or len(requested) > MAX_SNAPSHOT_SYMBOLS:
+        raise ValidationError(f"Provide between 1 and {MAX_SNAPSHOT_SYMBOLS} symbols")
+    return await ticker_service.get_snapshots(requested)
+
 
 @router.get("/{symbol}/snapshot", response_model=TickerSnapshot)
 async def get_ticker_snapshot(symbol: str) -> TickerSnapshot:
@@ -68,3 +96,35 @@ async def get_ticker_history(
     - 502: External service unavailable
     """
     return await ticker_service.get_history(symbol, range)
+
+
+@router.get(
+    "/{symbol}/history.ndjson",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/x-ndjson": {}}}},
+)
+async def stream_ticker_history(
+    symbol: str,
+    range: ChartTimeRange = Query(
+        default=ChartTimeRange.ONE_MONTH,
+        description="Time range: 1D, 1M, 6M, or 1Y",
+    ),
+) -> StreamingResponse:
+    """
+    Stream price history for a ticker as newline-delimited JSON.
+
+    Each line is one price point, oldest first, so clients can start
+    rendering before the whole range has arrived.
+
+    **Query params:**
+    - **range**: Time range (1D, 1M, 6M, 1Y). Default: 1M
+
+    **Line fields:**
+    - **date**, **close**, **high**, **low** (same as history points)
+
+    **Errors:**
+    - 404: Unknown symbol
+    - 502: External service unavailable
+    """
+    lines = await ticker_service.stream_history(symbol, range)
+    return StreamingResponse(lines, media_type="application/x-ndjson")
@@ -7,7 +7,12 @@ All outputs are descriptive — no predictions or financial advice.
 
 from fastapi import APIRouter
 
-from app.models.outlook import Outlook, OutlookComposerWithMeta, OutlookRequest
+from app.models.outlook import (
+    Outlook,
+    OutlookBatchRequest,
+    OutlookComposerWithMeta,
+    OutlookRequest,
+)
 from app.services.outlook_engine import OutlookComposer, OutlookEngine
 
 router = APIRouter()
@@ -40,6 +45,27 @@ async def generate_outlook(request: OutlookRequest) -> Outlook:
     )
 
 
+@router.post("/outlooks", response_model=list[Outlook])
+async def generate_outlooks(request: OutlookBatchRequest) -> list[Outlook]:
+    """
+    Generate structured outlooks for several tickers in one request.
+
+    Histories are fetched concurrently and the rolling statistics for all
+    tickers are computed in a single vectorized pass.
+
+    **Request Body:**
+    - **symbols**: Stock/ETF ticker symbols (1-25)
+    - **timeframeDays**: Outlook window in days (10-365, default 30)
+
+    **Returns:**
+    - One outlook per symbol, in request order
+    """
+    return await outlook_engine.compute_outlooks(
+        symbols=request.symbols,
+        timeframe_days=request.timeframe_days,
+    )
+
+
 @router.get("/outlook/{ticker}", response_model=OutlookComposerWithMeta)
 async def get_outlook_summary(ticker: str) -> OutlookComposerWithMeta:
     """
@@ -0,0 +1,21 @@
+"""
+Response classes.
+"""
+
+from typing import Any
+
+import pydantic_core
+from fastapi.responses import JSONResponse
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse encoded by pydantic-core's Rust serializer instead of stdlib json.
+
+    Produces the same compact UTF-8 bytes as JSONResponse for JSON-compatible
+    content, several times faster on large payloads such as price histories.
+    Non-finite floats encode as null rather than failing the response.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return pydantic_core.to_json(content)
@@ -9,6 +9,7 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from app.api import ai, health, market, outlook, pattern
 from app.core.logging import get_logger
+from app.core.responses import FastJSONResponse
 
 logger = get_logger(__name__)
 
@@ -28,6 +29,7 @@ def create_app() -> FastAPI:
         version="0.1.0",
         docs_url="/docs",
         redoc_url="/redoc",
+        default_response_class=FastJSONResponse,
     )
 
     app.add_middleware(
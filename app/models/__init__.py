@@ -5,6 +5,7 @@ from app.models.catalyst import CatalystEvent, CatalystType, ConfidenceLevel
 from app.models.explain import ExplainRequest
 from app.models.outlook import (
     Outlook,
+    OutlookBatchRequest,
     OutlookComposerResponse,
     OutlookComposerSources,
     OutlookComposerTimestamps,
@@ -37,6 +38,7 @@ __all__ = [
     "VolatilityLevel",
     # Outlook models
     "Outlook",
+    "OutlookBatchRequest",
     "OutlookComposerResponse",
     "OutlookComposerSources",
     "OutlookComposerTimestamps",
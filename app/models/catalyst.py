@@ -7,6 +7,8 @@ macro events for the TradeLens app.
 
 from datetime import datetime
 from enum import Enum
+from functools import cached_property
+from typing import Any
 
 from pydantic import BaseModel, ConfigDict, Field, field_validator
 
@@ -61,3 +63,13 @@ class CatalystEvent(BaseModel):
             return None
         normalized = value.strip().upper()
         return normalized or None
+
+    @cached_property
+    def json_payload(self) -> dict[str, Any]:
+        """
+        JSON-mode dump of this event, serialized once per instance.
+
+        Catalyst events are cached for the day and treated as read-only, so the
+        payload is shared by every response; callers must not mutate it.
+        """
+        return self.model_dump(mode="json")
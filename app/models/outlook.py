@@ -4,7 +4,7 @@ Outlook models.
 These models align with the iOS app's OutlookEngine.swift Outlook struct.
 """
 
-from datetime import datetime
+from datetime import UTC, datetime
 from enum import Enum
 from typing import Annotated
 
@@ -34,6 +34,31 @@ class OutlookRequest(BaseModel):
         return v.upper().strip()
 
 
+class OutlookBatchRequest(BaseModel):
+    """Request model for generating outlooks for several tickers at once."""
+
+    model_config = ConfigDict(
+        populate_by_name=True,
+        json_schema_extra={
+            "example": {
+                "symbols": ["AAPL", "NVDA", "SPY"],
+                "timeframeDays": 30,
+            }
+        },
+    )
+
+    symbols: list[str] = Field(
+        ..., description="Stock/ETF ticker symbols", min_length=1, max_length=25
+    )
+    timeframe_days: Annotated[int, Field(ge=10, le=365, alias="timeframeDays")] = 30
+
+    @field_validator("symbols")
+    @classmethod
+    def normalize_symbols(cls, v: list[str]) -> list[str]:
+        """Normalize symbols to uppercase."""
+        return [symbol.upper().strip() for symbol in v]
+
+
 class SentimentSummary(str, Enum):
     """Sentiment categories — descriptive, not predictive."""
 
@@ -114,7 +139,7 @@ class Outlook(BaseModel):
     volatility_warning: str | None = Field(None, description="Warning if volatility is high")
     timeframe_note: str | None = Field(None, description="Note if timeframe differs from style")
     generated_at: datetime = Field(
-        default_factory=datetime.utcnow,
+        default_factory=lambda: datetime.now(UTC),
         description="When this outlook was generated",
     )
     source: str = Field(default="yfinance", description="Data source identifier")
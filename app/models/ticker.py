@@ -6,7 +6,9 @@ These models align with the iOS app's TickerInfo.swift and PriceData.swift.
 
 from datetime import datetime
 from enum import Enum
+from functools import cached_property
 
+import numpy as np
 from pydantic import BaseModel, ConfigDict, Field
 
 
@@ -99,6 +101,10 @@ class TickerSnapshot(BaseModel):
 class PricePoint(BaseModel):
     """A single price point for charting. Aligns with iOS PricePoint struct."""
 
+    # Immutable once built, so the column arrays cached on PriceHistory stay in sync
+    # with its points. (Pydantic v2 has no slots option; instances keep a __dict__.)
+    model_config = ConfigDict(frozen=True)
+
     date: datetime = Field(..., description="Date/time of the price point")
     close: float = Field(..., description="Closing price", ge=0)
     high: float = Field(..., description="High price for the period", ge=0)
@@ -137,6 +143,29 @@ class PriceHistory(BaseModel):
         """Whether the change is positive."""
         return self.change >= 0
 
+    # Column views for numeric consumers; built once per history instead of per caller
+    @cached_property
+    def closes(self) -> np.ndarray:
+        """Close prices as a float64 array."""
+        return self._column("close")
+
+    @cached_property
+    def highs(self) -> np.ndarray:
+        """High prices as a float64 array."""
+        return self._column("high")
+
+    @cached_property
+    def lows(self) -> np.ndarray:
+        """Low prices as a float64 array."""
+        return self._column("low")
+
+    def _column(self, name: str) -> np.ndarray:
+        return np.fromiter(
+            (getattr(point, name) for point in self.points),
+            dtype=np.float64,
+            count=len(self.points),
+        )
+
     @property
     def min_price(self) -> float:
         """Minimum low price in the history."""
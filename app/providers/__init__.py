@@ -5,7 +5,7 @@ All API endpoints and services MUST use these providers for data access.
 Direct yfinance or external API calls outside these providers are prohibited.
 """
 
-from app.providers.cache import cache
+from app.providers.cache import SingleFlight, cache, inflight
 from app.providers.guards import (
     DirectAPIAccessError,
     guard_direct_access,
@@ -28,6 +28,8 @@ __all__ = [
     "NewsItem",
     # Cache
     "cache",
+    "inflight",
+    "SingleFlight",
     # Guards
     "DirectAPIAccessError",
     "guard_direct_access",
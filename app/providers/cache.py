@@ -3,18 +3,28 @@ Unified caching layer for data providers.
 
 Cache TTLs:
 - Prices: 15-30 seconds (real-time data)
-- Historical: 1-6 hours (rarely changes)
+- Historical: 5 minutes for intraday bars, 1 hour for daily/weekly bars
 - News: 6-12 hours (updated periodically)
+- Outlooks: 15 minutes (also invalidated when the underlying history changes)
+- Unknown symbols: 1 minute (so repeated lookups of a bogus symbol skip the upstream call)
 """
 
+import asyncio
 import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
 from dataclasses import dataclass, field
-from typing import Any
+from typing import Any, TypeVar
 
 from app.core.logging import get_logger
 
 logger = get_logger(__name__)
 
+T = TypeVar("T")
+
+# History periods served as intraday bars (see history_provider.PERIOD_MAP)
+INTRADAY_PERIODS = frozenset({"1D", "1W"})
+
 
 @dataclass
 class CacheEntry:
@@ -22,11 +32,12 @@ class CacheEntry:
 
     value: Any
     expires_at: float
-    created_at: float = field(default_factory=time.time)
+    # Monotonic clock, so wall-clock adjustments never extend or cut short a TTL
+    created_at: float = field(default_factory=time.monotonic)
 
     @property
     def is_expired(self) -> bool:
-        return time.time() > self.expires_at
+        return time.monotonic() > self.expires_at
 
 
 class Cache:
@@ -40,10 +51,16 @@ class Cache:
     # Default TTLs in seconds
     TTL_PRICE = 30  # 30 seconds for real-time prices
     TTL_HISTORY = 3600  # 1 hour for historical data
+    TTL_HISTORY_INTRADAY = 300  # 5 minutes for intraday bars, which change within the day
+    TTL_NOT_FOUND = 60  # 1 minute for symbols the upstream reported as unknown
     TTL_NEWS = 21600  # 6 hours for news
+    TTL_OUTLOOK = 900  # 15 minutes for computed outlooks
+
+    # Entry cap; past it the oldest-written entries are evicted first
+    MAX_ENTRIES = 4096
 
     def __init__(self):
-        self._cache: dict[str, CacheEntry] = {}
+        self._cache: OrderedDict[str, CacheEntry] = OrderedDict()
         self._hits = 0
         self._misses = 0
 
@@ -68,8 +85,14 @@ class Cache:
         ttl = ttl or self.TTL_PRICE
         self._cache[key] = CacheEntry(
             value=value,
-            expires_at=time.time() + ttl,
+            expires_at=time.monotonic() + ttl,
         )
+        # A rewritten key counts as the newest write
+        self._cache.move_to_end(key)
+        # Unread entries never expire on their own; the cap keeps memory bounded, and
+        # OrderedDict pops its oldest entry in O(1) (a plain dict rescans dummy slots)
+        while len(self._cache) > self.MAX_ENTRIES:
+            self._cache.popitem(last=False)
 
     def delete(self, key: str) -> None:
         """Remove a key from cache."""
@@ -108,7 +131,8 @@ class Cache:
         return self.get(f"history:{symbol.upper()}:{period}")
 
     def set_history(self, symbol: str, period: str, value: Any) -> None:
-        self.set(f"history:{symbol.upper()}:{period}", value, self.TTL_HISTORY)
+        ttl = self.TTL_HISTORY_INTRADAY if period in INTRADAY_PERIODS else self.TTL_HISTORY
+        self.set(f"history:{symbol.upper()}:{period}", value, ttl)
 
     def get_news(self, symbol: str | None = None) -> Any | None:
         key = f"news:{symbol.upper()}" if symbol else "news:market"
@@ -118,8 +142,54 @@ class Cache:
         key = f"news:{symbol.upper()}" if symbol else "news:market"
         self.set(key, value, self.TTL_NEWS)
 
+    def get_outlook(self, symbol: str, timeframe_days: int) -> Any | None:
+        return self.get(f"outlook:{symbol.upper()}:{timeframe_days}")
+
+    def set_outlook(self, symbol: str, timeframe_days: int, value: Any) -> None:
+        self.set(f"outlook:{symbol.upper()}:{timeframe_days}", value, self.TTL_OUTLOOK)
+
+    def is_unknown_symbol(self, symbol: str) -> bool:
+        # Peeks without touching hit/miss stats; this runs on every provider cache miss
+        entry = self._cache.get(f"unknown:{symbol.upper()}")
+        return entry is not None and not entry.is_expired
+
+    def set_unknown_symbol(self, symbol: str) -> None:
+        self.set(f"unknown:{symbol.upper()}", True, self.TTL_NOT_FOUND)
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent loads of the same key into one in-flight task.
+
+    The first caller for a key starts the load; callers arriving before it
+    finishes await that same task instead of starting their own. Each waiter
+    is shielded, so one cancelled request does not cancel the shared load.
+    """
+
+    def __init__(self) -> None:
+        self._pending: dict[Hashable, asyncio.Future[Any]] = {}
+
+    async def run(self, key: Hashable, load: Callable[[], Awaitable[T]]) -> T:
+        """Return the result of `load()`, shared with any in-flight load for `key`."""
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = asyncio.ensure_future(load())
+            self._pending[key] = pending
+            pending.add_done_callback(lambda done: self._forget(key, done))
+        return await asyncio.shield(pending)
+
+    def _forget(self, key: Hashable, done: asyncio.Future[Any]) -> None:
+        if self._pending.get(key) is done:
+            del self._pending[key]
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
 
 # Global cache instance
 cache = Cache()
 
+# In-flight upstream fetches shared by every provider instance
+inflight = SingleFlight()
+
 
@@ -0,0 +1,27 @@
+"""
+Helpers for yfinance batch downloads.
+
+yf.download(..., group_by="ticker") returns (ticker, field) MultiIndex columns on
+current yfinance. Versions before its `multi_level_index` option (still allowed by
+the dependency floor) return flat OHLCV columns when a single symbol is requested.
+"""
+
+import pandas as pd
+
+
+def frames_by_symbol(frame: pd.DataFrame, symbols: list[str]) -> dict[str, pd.DataFrame]:
+    """
+    Split a batch download into one OHLCV frame per requested symbol.
+
+    Symbols the download has no columns for are left out, so callers can tell
+    an unknown symbol from a column layout they did not expect.
+    """
+    if frame.empty:
+        return {}
+    if isinstance(frame.columns, pd.MultiIndex):
+        downloaded = set(frame.columns.get_level_values(0))
+        return {symbol: frame[symbol] for symbol in symbols if symbol in downloaded}
+    # Flat columns: a one-symbol download from a yfinance without multi_level_index
+    if len(symbols) == 1 and "Close" in frame.columns:
+        return {symbols[0]: frame}
+    return {}
@@ -0,0 +1,27 @@
+"""
+Bounded thread pool for blocking upstream calls.
+
+yfinance fetches over synchronous HTTP. Providers run those calls here instead
+of on the event loop, so one slow Yahoo request no longer stalls every other
+in-flight API request, and the worker cap keeps thread growth bounded.
+"""
+
+import asyncio
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import ParamSpec, TypeVar
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+# Upper bound on concurrent blocking upstream calls across all providers
+MAX_UPSTREAM_WORKERS = 32
+
+executor = ThreadPoolExecutor(max_workers=MAX_UPSTREAM_WORKERS, thread_name_prefix="yf")
+
+
+async def run_blocking(func: Callable[P, T], *args: P.args, **kwargs: P.kwargs) -> T:
+    """Run a blocking call on the shared upstream pool and await its result."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, partial(func, *args, **kwargs))
@@ -4,8 +4,11 @@ Canonical historical data provider — single source of truth for price history.
 All historical price data in the application MUST come through this provider.
 """
 
+from collections.abc import Iterator, Sequence
 from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
+from functools import cached_property
+from typing import TYPE_CHECKING, Any, cast, overload
 
 import numpy as np
 import yfinance as yf
@@ -13,14 +16,19 @@ import yfinance as yf
 from app.core.config import settings
 from app.core.errors import ExternalServiceError, TickerNotFoundError
 from app.core.logging import get_logger
-from app.providers.cache import cache
+from app.providers.cache import cache, inflight
+from app.providers.downloads import frames_by_symbol
+from app.providers.executor import run_blocking
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 logger = get_logger(__name__)
 
 SOURCE = "yfinance"
 
 
-@dataclass
+@dataclass(slots=True)
 class HistoryPoint:
     """A single price point in history."""
 
@@ -42,29 +50,122 @@ class HistoryPoint:
         }
 
 
-@dataclass
+class _PointsView(Sequence[HistoryPoint]):
+    """Read-only sequence of HistoryPoints over a HistoryData's columns, built on access."""
+
+    __slots__ = ("_data",)
+
+    def __init__(self, data: "HistoryData") -> None:
+        self._data = data
+
+    def __len__(self) -> int:
+        return len(self._data.dates)
+
+    @overload
+    def __getitem__(self, index: int) -> HistoryPoint: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[HistoryPoint]: ...
+
+    def __getitem__(self, index: int | slice) -> HistoryPoint | list[HistoryPoint]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        data = self._data
+        return HistoryPoint(
+            date=data.dates[index],
+            open=data.opens[index].item(),
+            high=data.highs[index].item(),
+            low=data.lows[index].item(),
+            close=data.closes[index].item(),
+            volume=data.volumes[index].item(),
+        )
+
+    def __iter__(self) -> Iterator[HistoryPoint]:
+        data = self._data
+        # One tolist() per column instead of a numpy scalar per field
+        for date, open_, high, low, close, volume in zip(
+            data.dates,
+            data.opens.tolist(),
+            data.highs.tolist(),
+            data.lows.tolist(),
+            data.closes.tolist(),
+            data.volumes.tolist(),
+        ):
+            yield HistoryPoint(date, open_, high, low, close, volume)
+
+
+@dataclass(eq=False)
 class HistoryData:
     """
     Canonical historical data structure.
 
-    All endpoints receiving history data get this exact shape.
+    All endpoints receiving history data get this exact shape. Bars are stored
+    column-wise: one list of dates and one numpy array per OHLCV field, indexed
+    in parallel (float64 prices, int64 volumes). `points` presents the same bars
+    as HistoryPoints, built only when read.
     """
 
     ticker: str
     period: str
     interval: str
-    points: list[HistoryPoint]
+    dates: list[datetime]
+    opens: np.ndarray
+    highs: np.ndarray
+    lows: np.ndarray
+    closes: np.ndarray
+    volumes: np.ndarray
     timestamp: datetime
     source: str = SOURCE
 
+    def __post_init__(self) -> None:
+        # Histories are cached and their columns shared with every consumer, so no
+        # caller may write into them
+        for column in (self.opens, self.highs, self.lows, self.closes, self.volumes):
+            column.flags.writeable = False
+
+    @classmethod
+    def from_points(
+        cls,
+        ticker: str,
+        period: str,
+        interval: str,
+        points: Sequence[HistoryPoint],
+        timestamp: datetime,
+        source: str = SOURCE,
+    ) -> "HistoryData":
+        """Build a history from per-bar points, splitting them into columns."""
+        count = len(points)
+
+        def column(field: str, dtype: type[np.generic]) -> np.ndarray:
+            return np.fromiter((getattr(p, field) for p in points), dtype=dtype, count=count)
+
+        return cls(
+            ticker=ticker,
+            period=period,
+            interval=interval,
+            dates=[p.date for p in points],
+            opens=column("open", np.float64),
+            highs=column("high", np.float64),
+            lows=column("low", np.float64),
+            closes=column("close", np.float64),
+            volumes=column("volume", np.int64),
+            timestamp=timestamp,
+            source=source,
+        )
+
+    @property
+    def points(self) -> Sequence[HistoryPoint]:
+        """The bars as HistoryPoints, materialized from the columns on access."""
+        return _PointsView(self)
+
     # Computed properties
     @property
     def start_price(self) -> float:
-        return self.points[0].close if self.points else 0
+        return self.closes[0].item() if len(self.closes) else 0
 
     @property
     def end_price(self) -> float:
-        return self.points[-1].close if self.points else 0
+        return self.closes[-1].item() if len(self.closes) else 0
 
     @property
     def change(self) -> float:
@@ -76,17 +177,42 @@ class HistoryData:
             return 0
         return round((self.change / self.start_price) * 100, 2)
 
-    @property
-    def closes(self) -> np.ndarray:
-        """Return close prices as numpy array for analysis."""
-        return np.array([p.close for p in self.points])
+    @cached_property
+    def log_closes(self) -> np.ndarray:
+        """
+        Natural log of close prices, computed once per fetched history.
+
+        Any window's return is expm1 of a difference of two entries, so every
+        timeframe analysed on this (cached) history shares the same array.
+        """
+        log_closes: np.ndarray = np.log(self.closes)
+        log_closes.flags.writeable = False
+        return log_closes
 
     def to_dict(self) -> dict:
         return {
             "ticker": self.ticker,
             "period": self.period,
             "interval": self.interval,
-            "points": [p.to_dict() for p in self.points],
+            # Rows straight from the columns; no HistoryPoint per bar
+            "points": [
+                {
+                    "date": date.isoformat(),
+                    "open": open_,
+                    "high": high,
+                    "low": low,
+                    "close": close,
+                    "volume": volume,
+                }
+                for date, open_, high, low, close, volume in zip(
+                    self.dates,
+                    self.opens.tolist(),
+                    self.highs.tolist(),
+                    self.lows.tolist(),
+                    self.closes.tolist(),
+                    self.volumes.tolist(),
+                )
+            ],
             "startPrice": self.start_price,
             "endPrice": self.end_price,
             "change": self.change,
@@ -96,6 +222,31 @@ class HistoryData:
         }
 
 
+def _utc_dates(index: "pd.Index") -> list[datetime]:
+    """Convert a yfinance frame index to aware UTC datetimes, the whole index at once."""
+    if hasattr(index, "tz_convert"):
+        # DatetimeIndex: intraday bars carry the exchange zone, naive bars are taken as UTC
+        utc = index.tz_convert("UTC") if index.tz is not None else index.tz_localize("UTC")
+        dates: list[datetime] = utc.to_pydatetime().tolist()
+        return dates
+    return [datetime.fromisoformat(str(idx)).replace(tzinfo=UTC) for idx in index]
+
+
+def _columns_from_frame(hist: "pd.DataFrame") -> dict[str, Any]:
+    """Split a yfinance OHLCV frame into HistoryData columns, converting each once."""
+    return {
+        "dates": _utc_dates(hist.index),
+        "opens": hist["Open"].to_numpy(dtype=np.float64).round(2),
+        "highs": hist["High"].to_numpy(dtype=np.float64).round(2),
+        "lows": hist["Low"].to_numpy(dtype=np.float64).round(2),
+        "closes": hist["Close"].to_numpy(dtype=np.float64).round(2),
+        "volumes": hist["Volume"].fillna(0).to_numpy(dtype=np.int64),
+    }
+
+
+# Signed max offset of the mock open/high/low from the close, as a fraction of price
+_MOCK_OHL_OFFSET_SCALE = np.array([[-0.02], [0.02], [-0.02]])
+
 # Period to yfinance mapping
 PERIOD_MAP = {
     "1D": ("1d", "5m"),
@@ -118,6 +269,10 @@ class HistoryProvider:
         history = await provider.get_history("AAPL", "1M")
     """
 
+    def __init__(self, seed: int | None = None) -> None:
+        # Mock histories draw from a provider-owned generator; pass a seed to reproduce them
+        self._rng = np.random.default_rng(seed)
+
     async def get_history(
         self,
         symbol: str,
@@ -147,20 +302,91 @@ class HistoryProvider:
 
         # Check cache first
         if use_cache:
-            cached = cache.get_history(symbol, period)
+            cached = cast("HistoryData | None", cache.get_history(symbol, period))
             if cached:
                 logger.debug(f"Cache hit for history:{symbol}:{period}")
                 return cached
+            if cache.is_unknown_symbol(symbol):
+                raise TickerNotFoundError(symbol)
+
+        # Concurrent misses for the same history share one upstream fetch
+        return await inflight.run(
+            ("history", symbol, period), lambda: self._fetch_history(symbol, period)
+        )
+
+    async def get_histories(
+        self,
+        symbols: list[str],
+        period: str = "1M",
+        use_cache: bool = True,
+    ) -> dict[str, HistoryData]:
+        """
+        Get historical price data for several symbols.
+
+        Cached histories are reused. In live mode the rest are fetched with a
+        single yfinance download, which requests the symbols concurrently
+        instead of one blocking Ticker.history call after another.
+
+        Args:
+            symbols: Ticker symbols (duplicates are collapsed)
+            period: Time period (1D, 1W, 1M, 3M, 6M, 1Y, 3Y, 5Y)
+            use_cache: Whether to use cached data (default True)
 
-        # Fetch from source
+        Returns:
+            HistoryData keyed by uppercase symbol, in request order
+
+        Raises:
+            TickerNotFoundError: A symbol was not found
+            ExternalServiceError: Provider unavailable
+        """
+        symbols = list(dict.fromkeys(symbol.upper() for symbol in symbols))
+        period = period.upper()
+
+        if period not in PERIOD_MAP:
+            period = "1M"
+
+        histories: dict[str, HistoryData] = {}
+        missing: list[str] = []
+        for symbol in symbols:
+            cached = (
+                cast("HistoryData | None", cache.get_history(symbol, period))
+                if use_cache
+                else None
+            )
+            if cached:
+                histories[symbol] = cached
+            elif use_cache and cache.is_unknown_symbol(symbol):
+                raise TickerNotFoundError(symbol)
+            else:
+                missing.append(symbol)
+
+        if missing:
+            unknown: list[str] = []
+            if settings.USE_MOCK_DATA:
+                fetched = {symbol: self._get_mock_history(symbol, period) for symbol in missing}
+            else:
+                fetched, unknown = await run_blocking(self._get_yfinance_histories, missing, period)
+            # Cache every valid symbol before reporting an unknown one, so a retry
+            # without the bad symbol does not download the whole batch again
+            for symbol, data in fetched.items():
+                cache.set_history(symbol, period, data)
+            logger.info(f"Fetched {period} history for {len(fetched)} of {len(symbols)} symbols")
+            if unknown:
+                raise TickerNotFoundError(unknown[0])
+            histories.update(fetched)
+
+        return {symbol: histories[symbol] for symbol in symbols}
+
+    async def _fetch_history(self, symbol: str, period: str) -> HistoryData:
+        """Fetch history from the configured source and cache it."""
         if settings.USE_MOCK_DATA:
             data = self._get_mock_history(symbol, period)
         else:
-            data = self._get_yfinance_history(symbol, period)
+            data = await run_blocking(self._get_yfinance_history, symbol, period)
 
         # Cache the result
         cache.set_history(symbol, period, data)
-        logger.info(f"Fetched {period} history for {symbol}: {len(data.points)} points")
+        logger.info(f"Fetched {period} history for {symbol}: {len(data.dates)} points")
 
         return data
 
@@ -173,37 +399,15 @@ class HistoryProvider:
             hist = ticker.history(period=yf_period, interval=yf_interval)
 
             if hist.empty:
+                cache.set_unknown_symbol(symbol)
                 raise TickerNotFoundError(symbol)
 
-            points: list[HistoryPoint] = []
-            for idx, row in hist.iterrows():
-                # Convert index to UTC datetime
-                if hasattr(idx, "tz_convert"):
-                    dt = idx.tz_convert("UTC").to_pydatetime()
-                elif hasattr(idx, "to_pydatetime"):
-                    dt = idx.to_pydatetime()
-                    if dt.tzinfo is None:
-                        dt = dt.replace(tzinfo=UTC)
-                else:
-                    dt = datetime.fromisoformat(str(idx)).replace(tzinfo=UTC)
-
-                points.append(
-                    HistoryPoint(
-                        date=dt,
-                        open=round(float(row["Open"]), 2),
-                        high=round(float(row["High"]), 2),
-                        low=round(float(row["Low"]), 2),
-                        close=round(float(row["Close"]), 2),
-                        volume=int(row["Volume"]),
-                    )
-                )
-
             return HistoryData(
                 ticker=symbol,
                 period=period,
                 interval=yf_interval,
-                points=points,
                 timestamp=datetime.now(UTC),
+                **_columns_from_frame(hist),
             )
 
         except TickerNotFoundError:
@@ -212,49 +416,89 @@ class HistoryProvider:
             logger.error(f"yfinance history error for {symbol}: {e}")
             raise ExternalServiceError("yfinance", "Failed to fetch history data")
 
+    def _get_yfinance_histories(
+        self, symbols: list[str], period: str
+    ) -> tuple[dict[str, HistoryData], list[str]]:
+        """
+        Fetch history for several symbols with one threaded yfinance download.
+
+        Returns the histories of the symbols that had data, plus the symbols that
+        had none (already recorded as unknown in the cache).
+        """
+        yf_period, yf_interval = PERIOD_MAP.get(period, ("1mo", "1d"))
+        try:
+            frame = yf.download(
+                symbols,
+                period=yf_period,
+                interval=yf_interval,
+                group_by="ticker",
+                auto_adjust=True,
+                threads=True,
+                progress=False,
+            )
+        except Exception as e:
+            logger.error(f"yfinance batch history error for {symbols}: {e}")
+            raise ExternalServiceError("yfinance", "Failed to fetch history data")
+
+        now = datetime.now(UTC)
+        by_symbol = frames_by_symbol(frame, symbols)
+        histories: dict[str, HistoryData] = {}
+        unknown: list[str] = []
+        for symbol in symbols:
+            # Bars are aligned across symbols; drop dates this symbol did not trade
+            hist = by_symbol.get(symbol)
+            hist = hist.dropna(subset=["Close"]) if hist is not None else None
+            if hist is None or hist.empty:
+                cache.set_unknown_symbol(symbol)
+                unknown.append(symbol)
+                continue
+            histories[symbol] = HistoryData(
+                ticker=symbol,
+                period=period,
+                interval=yf_interval,
+                timestamp=now,
+                **_columns_from_frame(hist),
+            )
+        return histories, unknown
+
     def _get_mock_history(self, symbol: str, period: str) -> HistoryData:
         """Generate mock history data."""
-        import random
-
         # Determine number of points based on period
         point_counts = {"1D": 78, "1W": 35, "1M": 22, "3M": 65, "6M": 130, "1Y": 252, "3Y": 756, "5Y": 260}
         num_points = point_counts.get(period, 22)
 
         yf_period, yf_interval = PERIOD_MAP.get(period, ("1mo", "1d"))
-
-        # Generate price series with random walk
-        base_price = random.uniform(100, 500)
-        prices = [base_price]
-        for _ in range(num_points - 1):
-            change = random.gauss(0.0005, 0.02)
-            prices.append(prices[-1] * (1 + change))
-
-        # Generate points
+        rng = self._rng
+
+        # Random walk from a random base price: one draw per step, compounded in place
+        prices = rng.normal(0.0005, 0.02, num_points)
+        prices[0] = rng.uniform(100, 500)
+        prices[1:] += 1
+        np.cumprod(prices, out=prices)
+
+        # Rows: open, high, low, close. One uniform draw for all offsets (up to 2% of
+        # the price, below/above/below), then every column is offset and rounded in place
+        bars = np.zeros((4, num_points))
+        rng.random(out=bars[:3])
+        bars[:3] *= _MOCK_OHL_OFFSET_SCALE
+        bars *= prices
+        bars += prices
+        np.round(bars, 2, out=bars)
+        opens, highs, lows, closes = bars
+
+        # Bars one day apart and ending now
         now = datetime.now(UTC)
-        points: list[HistoryPoint] = []
-
-        for i, price in enumerate(prices):
-            days_back = num_points - i - 1
-            date = now - timedelta(days=days_back)
-
-            daily_vol = price * 0.02
-            points.append(
-                HistoryPoint(
-                    date=date,
-                    open=round(price - random.uniform(0, daily_vol), 2),
-                    high=round(price + random.uniform(0, daily_vol), 2),
-                    low=round(price - random.uniform(0, daily_vol), 2),
-                    close=round(price, 2),
-                    volume=random.randint(1_000_000, 50_000_000),
-                )
-            )
-
         return HistoryData(
             ticker=symbol,
             period=period,
             interval=yf_interval,
-            points=points,
-            timestamp=datetime.now(UTC),
+            dates=[now - timedelta(days=num_points - i - 1) for i in range(num_points)],
+            opens=opens,
+            highs=highs,
+            lows=lows,
+            closes=closes,
+            volumes=rng.integers(1_000_000, 50_000_000, num_points, endpoint=True),
+            timestamp=now,
         )
 
 
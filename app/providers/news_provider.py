@@ -8,6 +8,8 @@ Currently a placeholder — will integrate with news APIs when available.
 from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
 
+import numpy as np
+
 from app.core.logging import get_logger
 from app.providers.cache import cache
 
@@ -15,6 +17,8 @@ logger = get_logger(__name__)
 
 SOURCE = "mock"  # Will change when real news API is integrated
 
+_MOCK_SOURCES = ("Reuters", "Bloomberg", "MarketWatch", "CNBC")
+
 
 @dataclass
 class NewsItem:
@@ -84,6 +88,10 @@ class NewsProvider:
         ("Investors watch Fed policy developments", "neutral"),
     ]
 
+    def __init__(self, seed: int | None = None) -> None:
+        # Mock items draw from a provider-owned generator; pass a seed to reproduce them
+        self._rng = np.random.default_rng(seed)
+
     async def get_news(
         self,
         symbol: str | None = None,
@@ -121,12 +129,15 @@ class NewsProvider:
 
     def _get_mock_news(self, symbol: str | None, limit: int) -> NewsData:
         """Generate mock news data."""
-        import random
-
         items: list[NewsItem] = []
         now = datetime.now(UTC)
 
-        for i in range(min(limit, len(self._MOCK_HEADLINES))):
+        # Draw every item's source and age in one call each
+        count = min(limit, len(self._MOCK_HEADLINES))
+        source_indices = self._rng.integers(len(_MOCK_SOURCES), size=count).tolist()
+        hours_ago = self._rng.integers(1, 49, size=count).tolist()
+
+        for i in range(count):
             headline, sentiment = self._MOCK_HEADLINES[i]
 
             # Customize headline for symbol
@@ -138,8 +149,8 @@ class NewsProvider:
                     title=headline,
                     summary="Market analysis and commentary on recent developments. "
                     "Investors continue to monitor key indicators.",
-                    source=random.choice(["Reuters", "Bloomberg", "MarketWatch", "CNBC"]),
-                    published_at=now - timedelta(hours=random.randint(1, 48)),
+                    source=_MOCK_SOURCES[source_indices[i]],
+                    published_at=now - timedelta(hours=hours_ago[i]),
                     url=None,
                     sentiment=sentiment,
                 )
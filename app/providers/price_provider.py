@@ -4,21 +4,34 @@ Canonical price data provider — single source of truth for current prices.
 All price data in the application MUST come through this provider.
 """
 
+import math
+import random
+from collections.abc import Mapping
 from dataclasses import dataclass
 from datetime import UTC, datetime
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, NamedTuple
 
 import yfinance as yf
 
 from app.core.config import settings
 from app.core.errors import ExternalServiceError, TickerNotFoundError
 from app.core.logging import get_logger
-from app.providers.cache import cache
+from app.providers.cache import cache, inflight
+from app.providers.downloads import frames_by_symbol
+from app.providers.executor import run_blocking
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 logger = get_logger(__name__)
 
 # Source identifier for all data from this provider
 SOURCE = "yfinance"
 
+# Symbols per yfinance download in get_prices; bounds the downloader's thread fan-out
+_QUOTE_BATCH_SIZE = 20
+
 
 @dataclass
 class PriceData:
@@ -61,6 +74,51 @@ class PriceData:
         }
 
 
+class _MockQuote(NamedTuple):
+    """Reference levels for a mock quote; the current price is jittered per request."""
+
+    price: float
+    prev: float
+    high: float
+    low: float
+    w52h: float
+    w52l: float
+
+    @classmethod
+    def around(cls, base: float) -> "_MockQuote":
+        """Derive plausible levels for an unknown symbol from one base price."""
+        return cls(base, base * 0.99, base * 1.02, base * 0.98, base * 1.25, base * 0.75)
+
+
+# Mock data for testing
+_MOCK_PRICES: Mapping[str, _MockQuote] = MappingProxyType(
+    {
+        "AAPL": _MockQuote(185.0, 183.5, 186.2, 184.1, 231.25, 138.75),
+        "NVDA": _MockQuote(485.0, 478.0, 490.5, 476.3, 520.0, 220.0),
+        "SPY": _MockQuote(475.0, 473.2, 476.8, 472.5, 495.0, 410.0),
+        "QQQ": _MockQuote(405.0, 402.5, 407.3, 401.2, 430.0, 340.0),
+        "TSLA": _MockQuote(245.0, 248.0, 252.0, 243.5, 290.0, 150.0),
+    }
+)
+
+
+def _finite_or_none(value: float | None) -> float | None:
+    """Return value as a float, or None when it is missing or NaN/inf."""
+    if value is None:
+        return None
+    value = float(value)
+    return value if math.isfinite(value) else None
+
+
+def _fast_info_market_cap(quote: Any) -> int | None:
+    """Market cap from fast_info; funds without share counts have none."""
+    try:
+        market_cap = _finite_or_none(quote.market_cap)
+    except Exception:
+        return None
+    return int(market_cap) if market_cap is not None else None
+
+
 class PriceProvider:
     """
     Canonical provider for current price data.
@@ -70,14 +128,9 @@ class PriceProvider:
         price = await provider.get_price("AAPL")
     """
 
-    # Mock data for testing
-    _MOCK_PRICES: dict[str, dict] = {
-        "AAPL": {"price": 185.0, "prev": 183.5, "high": 186.2, "low": 184.1, "w52h": 231.25, "w52l": 138.75},
-        "NVDA": {"price": 485.0, "prev": 478.0, "high": 490.5, "low": 476.3, "w52h": 520.0, "w52l": 220.0},
-        "SPY": {"price": 475.0, "prev": 473.2, "high": 476.8, "low": 472.5, "w52h": 495.0, "w52l": 410.0},
-        "QQQ": {"price": 405.0, "prev": 402.5, "high": 407.3, "low": 401.2, "w52h": 430.0, "w52l": 340.0},
-        "TSLA": {"price": 245.0, "prev": 248.0, "high": 252.0, "low": 243.5, "w52h": 290.0, "w52l": 150.0},
-    }
+    def __init__(self, seed: int | None = None) -> None:
+        # Mock quotes draw from a provider-owned generator; pass a seed to reproduce them
+        self._rng = random.Random(seed)
 
     async def get_price(self, symbol: str, use_cache: bool = True) -> PriceData:
         """
@@ -102,12 +155,18 @@ class PriceProvider:
             if cached:
                 logger.debug(f"Cache hit for price:{symbol}")
                 return cached
+            if cache.is_unknown_symbol(symbol):
+                raise TickerNotFoundError(symbol)
+
+        # Concurrent misses for the same symbol share one upstream fetch
+        return await inflight.run(("price", symbol), lambda: self._fetch_price(symbol))
 
-        # Fetch from source
+    async def _fetch_price(self, symbol: str) -> PriceData:
+        """Fetch a quote from the configured source and cache it."""
         if settings.USE_MOCK_DATA:
             data = self._get_mock_price(symbol)
         else:
-            data = self._get_yfinance_price(symbol)
+            data = await run_blocking(self._get_yfinance_price, symbol)
 
         # Cache the result
         cache.set_price(symbol, data)
@@ -115,32 +174,141 @@ class PriceProvider:
 
         return data
 
+    async def get_prices(self, symbols: list[str], use_cache: bool = True) -> dict[str, PriceData]:
+        """
+        Get current price data for several symbols.
+
+        Cached quotes are reused. In live mode the rest are fetched in batched
+        yfinance downloads of daily bars (up to 20 symbols each) instead of one
+        quote-page request per symbol. Batched quotes carry no market cap, so
+        they are returned but not written to the single-symbol price cache.
+
+        Args:
+            symbols: Ticker symbols (duplicates are collapsed)
+            use_cache: Whether to use cached data (default True)
+
+        Returns:
+            PriceData keyed by uppercase symbol, in request order
+
+        Raises:
+            TickerNotFoundError: A symbol was not found
+            ExternalServiceError: Provider unavailable
+        """
+        symbols = list(dict.fromkeys(symbol.upper() for symbol in symbols))
+
+        prices: dict[str, PriceData] = {}
+        missing: list[str] = []
+        for symbol in symbols:
+            cached = cache.get_price(symbol) if use_cache else None
+            if cached:
+                prices[symbol] = cached
+            elif use_cache and cache.is_unknown_symbol(symbol):
+                raise TickerNotFoundError(symbol)
+            else:
+                missing.append(symbol)
+
+        if missing:
+            if settings.USE_MOCK_DATA:
+                prices.update((symbol, self._get_mock_price(symbol)) for symbol in missing)
+            else:
+                prices.update(await run_blocking(self._get_yfinance_prices, missing))
+            logger.info(f"Fetched prices for {len(missing)} of {len(symbols)} symbols")
+
+        return {symbol: prices[symbol] for symbol in symbols}
+
+    def _get_yfinance_prices(self, symbols: list[str]) -> dict[str, PriceData]:
+        """Fetch quotes from one year of daily bars, one yfinance download per batch."""
+        prices: dict[str, PriceData] = {}
+        now = datetime.now(UTC)
+        for start in range(0, len(symbols), _QUOTE_BATCH_SIZE):
+            batch = symbols[start : start + _QUOTE_BATCH_SIZE]
+            try:
+                bars = yf.download(
+                    batch,
+                    period="1y",
+                    interval="1d",
+                    group_by="ticker",
+                    auto_adjust=False,
+                    threads=True,
+                    progress=False,
+                )
+            except Exception as e:
+                logger.error(f"yfinance batch price error for {batch}: {e}")
+                raise ExternalServiceError("yfinance", "Failed to fetch price data")
+
+            by_symbol = frames_by_symbol(bars, batch)
+            for symbol in batch:
+                rows = by_symbol.get(symbol)
+                rows = rows.dropna(subset=["Close"]) if rows is not None else None
+                if rows is None or rows.empty:
+                    cache.set_unknown_symbol(symbol)
+                    raise TickerNotFoundError(symbol)
+                prices[symbol] = self._price_from_daily_bars(symbol, rows, now)
+        return prices
+
+    @staticmethod
+    def _price_from_daily_bars(
+        symbol: str, rows: "pd.DataFrame", timestamp: datetime
+    ) -> PriceData:
+        """Derive a quote from a symbol's daily OHLCV bars (latest bar last)."""
+        closes = rows["Close"]
+        latest = rows.iloc[-1]
+        current_price = float(closes.iloc[-1])
+        previous_close = float(closes.iloc[-2]) if len(closes) > 1 else current_price
+        change = current_price - previous_close
+        change_percent = (change / previous_close * 100) if previous_close else 0
+
+        return PriceData(
+            ticker=symbol,
+            current_price=round(current_price, 2),
+            previous_close=round(previous_close, 2),
+            change=round(change, 2),
+            change_percent=round(change_percent, 2),
+            day_high=round(float(latest["High"]), 2),
+            day_low=round(float(latest["Low"]), 2),
+            week_52_high=round(float(rows["High"].max()), 2),
+            week_52_low=round(float(rows["Low"].min()), 2),
+            # The latest (often still open) bar can carry a NaN volume
+            volume=int(rows["Volume"].fillna(0).iloc[-1]),
+            market_cap=None,
+            timestamp=timestamp,
+        )
+
     def _get_yfinance_price(self, symbol: str) -> PriceData:
-        """Fetch price from yfinance."""
+        """
+        Fetch price from yfinance.
+
+        Reads Ticker.fast_info, which is served from the lightweight chart
+        endpoint, instead of Ticker.info and its multi-module quote-summary
+        scrape. Company details come from the service layer, not from Yahoo.
+        """
         try:
-            ticker = yf.Ticker(symbol)
-            info = ticker.info
+            quote = yf.Ticker(symbol).fast_info
 
-            if not info or info.get("regularMarketPrice") is None:
+            current_price = _finite_or_none(quote.last_price)
+            if current_price is None:
+                cache.set_unknown_symbol(symbol)
                 raise TickerNotFoundError(symbol)
 
-            current_price = info.get("regularMarketPrice") or info.get("previousClose", 0)
-            previous_close = info.get("previousClose", current_price)
+            previous_close = _finite_or_none(quote.previous_close) or current_price
             change = current_price - previous_close
             change_percent = (change / previous_close * 100) if previous_close else 0
 
+            def level(value: float | None) -> float:
+                return round(_finite_or_none(value) or current_price, 2)
+
             return PriceData(
                 ticker=symbol,
                 current_price=round(current_price, 2),
                 previous_close=round(previous_close, 2),
                 change=round(change, 2),
                 change_percent=round(change_percent, 2),
-                day_high=round(info.get("dayHigh", current_price), 2),
-                day_low=round(info.get("dayLow", current_price), 2),
-                week_52_high=round(info.get("fiftyTwoWeekHigh", current_price), 2),
-                week_52_low=round(info.get("fiftyTwoWeekLow", current_price), 2),
-                volume=info.get("volume", 0) or 0,
-                market_cap=info.get("marketCap"),
+                day_high=level(quote.day_high),
+                day_low=level(quote.day_low),
+                week_52_high=level(quote.year_high),
+                week_52_low=level(quote.year_low),
+                volume=int(_finite_or_none(quote.last_volume) or 0),
+                market_cap=_fast_info_market_cap(quote),
                 timestamp=datetime.now(UTC),
             )
 
@@ -152,23 +320,15 @@ class PriceProvider:
 
     def _get_mock_price(self, symbol: str) -> PriceData:
         """Generate mock price data."""
-        import random
+        rng = self._rng
 
-        mock = self._MOCK_PRICES.get(symbol)
-        if not mock:
+        mock = _MOCK_PRICES.get(symbol)
+        if mock is None:
             # Generate random mock for unknown symbols
-            base = random.uniform(50, 500)
-            mock = {
-                "price": base,
-                "prev": base * 0.99,
-                "high": base * 1.02,
-                "low": base * 0.98,
-                "w52h": base * 1.25,
-                "w52l": base * 0.75,
-            }
-
-        price = mock["price"] * random.uniform(0.99, 1.01)
-        prev = mock["prev"]
+            mock = _MockQuote.around(rng.uniform(50, 500))
+
+        price = mock.price * rng.uniform(0.99, 1.01)
+        prev = mock.prev
         change = price - prev
 
         return PriceData(
@@ -177,12 +337,12 @@ class PriceProvider:
             previous_close=round(prev, 2),
             change=round(change, 2),
             change_percent=round((change / prev) * 100, 2),
-            day_high=round(mock["high"], 2),
-            day_low=round(mock["low"], 2),
-            week_52_high=round(mock["w52h"], 2),
-            week_52_low=round(mock["w52l"], 2),
-            volume=random.randint(1_000_000, 50_000_000),
-            market_cap=random.randint(100_000_000_000, 3_000_000_000_000),
+            day_high=round(mock.high, 2),
+            day_low=round(mock.low, 2),
+            week_52_high=round(mock.w52h, 2),
+            week_52_low=round(mock.w52l, 2),
+            volume=rng.randint(1_000_000, 50_000_000),
+            market_cap=rng.randint(100_000_000_000, 3_000_000_000_000),
             timestamp=datetime.now(UTC),
         )
 
@@ -7,7 +7,10 @@ All outputs are descriptive — no predictions or financial advice.
 
 import json
 import re
+from collections.abc import Mapping
 from datetime import UTC, datetime
+from types import MappingProxyType
+from typing import Any
 
 from openai import AsyncOpenAI
 
@@ -72,6 +75,22 @@ NORMAL_MODE_INSTRUCTION = (
     """You can use standard financial terminology that everyday investors would understand."""
 )
 
+REQUIRED_RESPONSE_KEYS = frozenset(
+    {
+        "whatsHappeningNow",
+        "keyDrivers",
+        "riskVsOpportunity",
+        "historicalBehavior",
+        "simpleRecap",
+    }
+)
+
+# Parsing patterns are compiled once at import instead of on every response
+_TRAILING_COMMA_RE = re.compile(r",\s*([}\]])")
+_CONTROL_CHARS_RE = re.compile(r"[\x00-\x1f]")
+_CODE_BLOCK_RE = re.compile(r"```(?:json)?\s*([\s\S]*?)\s*```")
+_JSON_OBJECT_RE = re.compile(r"\{[\s\S]*\}")
+
 
 def _build_context_message(
     question: str,
@@ -129,7 +148,7 @@ def _coerce_json(text: str) -> str:
     - Newlines in strings
     """
     # Remove trailing commas before } or ]
-    text = re.sub(r",\s*([}\]])", r"\1", text)
+    text = _TRAILING_COMMA_RE.sub(r"\1", text)
 
     # Replace single quotes with double quotes (simple cases)
     # Only if not already using double quotes
@@ -137,7 +156,7 @@ def _coerce_json(text: str) -> str:
         text = text.replace("'", '"')
 
     # Remove control characters that break JSON
-    text = re.sub(r"[\x00-\x1f]", " ", text)
+    text = _CONTROL_CHARS_RE.sub(" ", text)
 
     return text
 
@@ -161,12 +180,12 @@ def _parse_ai_response(content: str) -> dict | None:
     strategies.append(content.strip())
 
     # Strategy 2: Extract from markdown code blocks
-    json_match = re.search(r"```(?:json)?\s*([\s\S]*?)\s*```", content)
+    json_match = _CODE_BLOCK_RE.search(content)
     if json_match:
         strategies.append(json_match.group(1).strip())
 
     # Strategy 3: Find JSON object pattern
-    json_match = re.search(r"\{[\s\S]*\}", content)
+    json_match = _JSON_OBJECT_RE.search(content)
     if json_match:
         strategies.append(json_match.group(0).strip())
 
@@ -195,14 +214,50 @@ def _validate_response_keys(parsed: dict | None) -> bool:
     if not parsed or not isinstance(parsed, dict):
         return False
 
-    required_keys = [
-        "whatsHappeningNow",
-        "keyDrivers",
-        "riskVsOpportunity",
-        "historicalBehavior",
-        "simpleRecap",
-    ]
-    return all(k in parsed for k in required_keys)
+    return REQUIRED_RESPONSE_KEYS.issubset(parsed)
+
+
+# Fallback content is static, so it is built once and shared across requests.
+# Driver lists are tuples so the shared objects cannot be mutated by callers.
+_TICKER_FALLBACK_DRIVERS = (
+    "Company earnings and guidance",
+    "Sector-wide trends",
+    "Broader market conditions",
+    "Investor sentiment",
+)
+
+_MACRO_FALLBACK_RESPONSE: Mapping[str, str | tuple[str, ...]] = MappingProxyType(
+    {
+        "whatsHappeningNow": (
+            "Markets are navigating a complex environment shaped by monetary policy, "
+            "economic data releases, and global events. Investor sentiment continues "
+            "to react to shifts in inflation expectations and central bank guidance."
+        ),
+        "keyDrivers": (
+            "Federal Reserve policy and interest rate trajectory",
+            "Inflation data and economic growth indicators",
+            "Corporate earnings trends across sectors",
+            "Geopolitical developments and global trade dynamics",
+            "Labor market conditions and consumer spending",
+        ),
+        "riskVsOpportunity": (
+            "The current environment presents a mix of opportunities and risks. "
+            "While economic resilience supports growth expectations, elevated rates "
+            "and valuation concerns warrant a balanced perspective. Diversification "
+            "remains a key consideration for managing uncertainty."
+        ),
+        "historicalBehavior": (
+            "Markets have historically moved through cycles of expansion and contraction, "
+            "often driven by shifts in monetary policy and economic conditions. "
+            "Periods of volatility tend to create both challenges and opportunities "
+            "for different investment approaches."
+        ),
+        "simpleRecap": (
+            "Markets are balancing growth signals against rate and inflation concerns, "
+            "with multiple cross-currents affecting different sectors."
+        ),
+    }
+)
 
 
 def _generate_fallback_response(
@@ -210,7 +265,7 @@ def _generate_fallback_response(
     symbol: str | None,
     snapshot: TickerSnapshot | None,
     outlook: Outlook | None,
-) -> dict:
+) -> Mapping[str, Any]:
     """Generate a fallback response when AI parsing fails."""
     if symbol and snapshot:
         # Get volatility as string value
@@ -225,12 +280,7 @@ def _generate_fallback_response(
                 f"The stock has shown {vol_level} volatility recently, "
                 f"within its 52-week range of ${snapshot.week_52_low} to ${snapshot.week_52_high}."
             ),
-            "keyDrivers": [
-                "Company earnings and guidance",
-                "Sector-wide trends",
-                "Broader market conditions",
-                "Investor sentiment",
-            ],
+            "keyDrivers": _TICKER_FALLBACK_DRIVERS,
             "riskVsOpportunity": (
                 f"Like any investment, {symbol} presents both potential opportunities and risks. "
                 f"The {vol_level} volatility level suggests the typical range of price movements."
@@ -248,38 +298,9 @@ def _generate_fallback_response(
                 f"{symbol} is showing {vol_level} volatility with multiple factors at play."
             ),
         }
-    else:
-        # Macro mode: high-level market explanation without ticker-specific data
-        return {
-            "whatsHappeningNow": (
-                "Markets are navigating a complex environment shaped by monetary policy, "
-                "economic data releases, and global events. Investor sentiment continues "
-                "to react to shifts in inflation expectations and central bank guidance."
-            ),
-            "keyDrivers": [
-                "Federal Reserve policy and interest rate trajectory",
-                "Inflation data and economic growth indicators",
-                "Corporate earnings trends across sectors",
-                "Geopolitical developments and global trade dynamics",
-                "Labor market conditions and consumer spending",
-            ],
-            "riskVsOpportunity": (
-                "The current environment presents a mix of opportunities and risks. "
-                "While economic resilience supports growth expectations, elevated rates "
-                "and valuation concerns warrant a balanced perspective. Diversification "
-                "remains a key consideration for managing uncertainty."
-            ),
-            "historicalBehavior": (
-                "Markets have historically moved through cycles of expansion and contraction, "
-                "often driven by shifts in monetary policy and economic conditions. "
-                "Periods of volatility tend to create both challenges and opportunities "
-                "for different investment approaches."
-            ),
-            "simpleRecap": (
-                "Markets are balancing growth signals against rate and inflation concerns, "
-                "with multiple cross-currents affecting different sectors."
-            ),
-        }
+
+    # Macro mode: high-level market explanation without ticker-specific data
+    return _MACRO_FALLBACK_RESPONSE
 
 
 class AIService:
@@ -356,7 +377,7 @@ class AIService:
         outlook: Outlook | None,
         simple_mode: bool,
         max_retries: int = 2,
-    ) -> dict:
+    ) -> Mapping[str, Any]:
         """
         Call OpenAI API and parse response with retry logic.
 
@@ -7,20 +7,29 @@ Provides upcoming macro and company-specific catalysts with daily caching.
 from __future__ import annotations
 
 from dataclasses import dataclass
-from datetime import datetime, timedelta, timezone
+from datetime import UTC, datetime, timedelta
+from typing import NamedTuple
 
 from app.core.logging import get_logger
 from app.models.catalyst import CatalystEvent, CatalystType, ConfidenceLevel
 
 logger = get_logger(__name__)
 
-_CACHE_DATE: datetime | None = None
-_CACHED_EVENTS: list[CatalystEvent] | None = None
-_CACHE_TIMESTAMP: datetime | None = None
-
 SOURCE = "mock"
 
 
+class _CacheState(NamedTuple):
+    """Daily catalyst cache entry, published as one immutable object."""
+
+    date: datetime
+    events: list[CatalystEvent]
+    timestamp: datetime
+
+
+# Replaced by a single assignment, so readers never observe a half-updated cache.
+_cache_state: _CacheState | None = None
+
+
 @dataclass(frozen=True)
 class CatalystSnapshot:
     """Snapshot of catalyst data with metadata."""
@@ -30,56 +39,32 @@ class CatalystSnapshot:
     source: str = SOURCE
 
 
-def _utc_today() -> datetime:
-    now = datetime.now(timezone.utc)
-    return now.replace(hour=0, minute=0, second=0, microsecond=0)
+def _start_of_day(moment: datetime) -> datetime:
+    return moment.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+# (type, ticker, days after today's 13:00 UTC anchor, confidence)
+_MOCK_EVENT_SCHEDULE: tuple[tuple[CatalystType, str | None, int, ConfidenceLevel], ...] = (
+    (CatalystType.EARNINGS, "UNH", 1, ConfidenceLevel.HIGH),
+    (CatalystType.DIVIDEND, "AAPL", 2, ConfidenceLevel.MEDIUM),
+    (CatalystType.SPLIT, "NVDA", 5, ConfidenceLevel.MEDIUM),
+    (CatalystType.FED_MEETING, None, 9, ConfidenceLevel.HIGH),
+    (CatalystType.CPI, None, 12, ConfidenceLevel.HIGH),
+    (CatalystType.PPI, None, 13, ConfidenceLevel.MEDIUM),
+    (CatalystType.SECTOR, "XLK", 4, ConfidenceLevel.MEDIUM),
+)
 
 
 def _generate_mock_events(now: datetime) -> list[CatalystEvent]:
     base = now.replace(hour=13, minute=0, second=0, microsecond=0)
     return [
         CatalystEvent(
-            type=CatalystType.EARNINGS,
-            ticker="UNH",
-            date=base + timedelta(days=1),
-            confidence=ConfidenceLevel.HIGH,
-        ),
-        CatalystEvent(
-            type=CatalystType.DIVIDEND,
-            ticker="AAPL",
-            date=base + timedelta(days=2),
-            confidence=ConfidenceLevel.MEDIUM,
-        ),
-        CatalystEvent(
-            type=CatalystType.SPLIT,
-            ticker="NVDA",
-            date=base + timedelta(days=5),
-            confidence=ConfidenceLevel.MEDIUM,
-        ),
-        CatalystEvent(
-            type=CatalystType.FED_MEETING,
-            ticker=None,
-            date=base + timedelta(days=9),
-            confidence=ConfidenceLevel.HIGH,
-        ),
-        CatalystEvent(
-            type=CatalystType.CPI,
-            ticker=None,
-            date=base + timedelta(days=12),
-            confidence=ConfidenceLevel.HIGH,
-        ),
-        CatalystEvent(
-            type=CatalystType.PPI,
-            ticker=None,
-            date=base + timedelta(days=13),
-            confidence=ConfidenceLevel.MEDIUM,
-        ),
-        CatalystEvent(
-            type=CatalystType.SECTOR,
-            ticker="XLK",
-            date=base + timedelta(days=4),
-            confidence=ConfidenceLevel.MEDIUM,
-        ),
+            type=event_type,
+            ticker=ticker,
+            date=base + timedelta(days=offset_days),
+            confidence=confidence,
+        )
+        for event_type, ticker, offset_days, confidence in _MOCK_EVENT_SCHEDULE
     ]
 
 
@@ -91,17 +76,21 @@ class CatalystService:
         return snapshot.events
 
     async def get_catalyst_snapshot(self) -> CatalystSnapshot:
-        global _CACHE_DATE, _CACHED_EVENTS, _CACHE_TIMESTAMP
-
-        today = _utc_today()
-        if _CACHE_DATE == today and _CACHED_EVENTS is not None and _CACHE_TIMESTAMP:
+        global _cache_state
+
+        # One clock read per call: the cache day and a regenerated snapshot's timestamp
+        # then always agree, even when a request straddles midnight UTC
+        now = datetime.now(UTC)
+        today = _start_of_day(now)
+        state = _cache_state
+        if state is not None and state.date == today:
             logger.info("Returning cached catalyst calendar")
-            return CatalystSnapshot(events=_CACHED_EVENTS, timestamp=_CACHE_TIMESTAMP)
+            return CatalystSnapshot(events=state.events, timestamp=state.timestamp)
 
         logger.info("Generating catalyst calendar snapshot")
-        now = datetime.now(timezone.utc)
         events = sorted(_generate_mock_events(now), key=lambda event: event.date)
-        _CACHE_DATE = today
-        _CACHED_EVENTS = events
-        _CACHE_TIMESTAMP = now
+        # Serialize once per refresh; composers reuse the payloads for the whole day
+        for event in events:
+            event.json_payload
+        _cache_state = _CacheState(date=today, events=events, timestamp=now)
         return CatalystSnapshot(events=events, timestamp=now)
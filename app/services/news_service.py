@@ -6,8 +6,13 @@ Transforms provider data into the API-facing response shape.
 
 from __future__ import annotations
 
+import heapq
+import re
+from bisect import bisect_right
 from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
+from operator import attrgetter
+from typing import NamedTuple
 
 from app.core.logging import get_logger
 from app.providers.news_provider import NewsItem, NewsProvider
@@ -29,22 +34,70 @@ _KEYWORDS = [
     "warning",
 ]
 
+# Zero-width lookahead reports every keyword occurrence, including overlapping ones,
+# so a single scan finds the same keywords as individual substring checks.
+_KEYWORD_PATTERN = re.compile(
+    "(?=(" + "|".join(re.escape(keyword) for keyword in _KEYWORDS) + "))"
+)
+
 _PRIMARY_WINDOW_DAYS = 7
 _MACRO_FALLBACK_MIN_DAYS = 30
 _MACRO_FALLBACK_MAX_DAYS = 60
 _MAX_NEWS_AGE_DAYS = 60
 
+# Above this many items the sector filter scans one joined buffer instead of each item.
+_BULK_SECTOR_SCAN_MIN_ITEMS = 64
+# Separator for the joined buffer; never produced by lowercasing headline text.
+_SCAN_SEPARATOR = "\x00"
+
+
+class _RankedItem(NamedTuple):
+    """Lightweight ranking record; converted to the API dict shape only for returned items."""
+
+    headline: str
+    summary: str
+    url: str | None
+    published: str
+    relevance: float
+    ticker_match: bool
+
+
+_rank_key = attrgetter("relevance", "published")
+
 
 @dataclass(frozen=True)
 class _QueryContext:
     ticker: str | None
     sector: str | None
+    ticker_lower: str | None = None
+    sector_lower: str | None = None
 
     @property
     def macro_theme(self) -> bool:
         return self.ticker is None and self.sector is not None
 
 
+@dataclass(frozen=True, slots=True)
+class _PreparedItem:
+    """News item with its lowercased text computed once for all filtering and scoring."""
+
+    item: NewsItem
+    title_lower: str
+    summary_lower: str
+    combined_lower: str
+
+    @classmethod
+    def from_item(cls, item: NewsItem) -> _PreparedItem:
+        title_lower = item.title.lower()
+        summary_lower = item.summary.lower()
+        return cls(
+            item=item,
+            title_lower=title_lower,
+            summary_lower=summary_lower,
+            combined_lower=f"{title_lower} {summary_lower}",
+        )
+
+
 class NewsService:
     """Service that returns relevance-ranked news with ticker/sector filtering."""
 
@@ -83,21 +136,29 @@ class NewsService:
         context = _QueryContext(
             ticker=ticker.upper() if ticker else None,
             sector=sector,
+            ticker_lower=ticker.lower() if ticker else None,
+            sector_lower=sector.lower() if sector else None,
         )
         provider_symbol = context.ticker if context.ticker else None
 
         news = await self._provider.get_news(provider_symbol, limit=limit)
         items = self._filter_by_date(news.items, context)
-        items = self._filter_by_sector(items, context)
-
-        ranked = [
-            self._format_item(item, context)
-            for item in items
-        ]
-        ranked.sort(key=lambda item: (item["relevance"], item["published"]), reverse=True)
+        if not items:
+            return NewsSnapshot(items=[], timestamp=news.timestamp, source=news.source)
+
+        prepared = [_PreparedItem.from_item(item) for item in items]
+        prepared = self._filter_by_sector(prepared, context)
+
+        # nlargest keeps only `limit` candidates instead of sorting the whole feed, and
+        # consuming a generator means scored records are never held as a full list.
+        ranked = heapq.nlargest(
+            limit,
+            (self._format_item(entry, context) for entry in prepared),
+            key=_rank_key,
+        )
 
         return NewsSnapshot(
-            items=ranked[:limit],
+            items=[item._asdict() for item in ranked],
             timestamp=news.timestamp,
             source=news.source,
         )
@@ -105,86 +166,128 @@ class NewsService:
     def _filter_by_date(self, items: list[NewsItem], context: _QueryContext) -> list[NewsItem]:
         now = datetime.now(UTC)
         max_age_cutoff = now - timedelta(days=_MAX_NEWS_AGE_DAYS)
-        stale_items = [item for item in items if item.published_at < max_age_cutoff]
-        if stale_items:
+        recent_cutoff = now - timedelta(days=_PRIMARY_WINDOW_DAYS)
+        # The macro fallback window is only reachable for sector-only queries, so the
+        # single partitioning pass collects its candidates only when they can be used.
+        collect_fallback = context.macro_theme
+        fallback_start = now - timedelta(days=_MACRO_FALLBACK_MAX_DAYS)
+        fallback_end = now - timedelta(days=_MACRO_FALLBACK_MIN_DAYS)
+
+        stale_count = 0
+        recent_items: list[NewsItem] = []
+        fallback_items: list[NewsItem] = []
+        for item in items:
+            published_at = item.published_at
+            if published_at < max_age_cutoff:
+                stale_count += 1
+            elif published_at >= recent_cutoff:
+                recent_items.append(item)
+            elif collect_fallback and fallback_start <= published_at <= fallback_end:
+                fallback_items.append(item)
+
+        if stale_count:
             logger.warning(
                 "Rejected %s stale news items older than %s days.",
-                len(stale_items),
+                stale_count,
                 _MAX_NEWS_AGE_DAYS,
             )
-        fresh_items = [item for item in items if item.published_at >= max_age_cutoff]
-        if not fresh_items:
+        if stale_count == len(items):
             logger.info(
                 "No news items within %s days; returning empty list.",
                 _MAX_NEWS_AGE_DAYS,
             )
             return []
 
-        recent_cutoff = now - timedelta(days=_PRIMARY_WINDOW_DAYS)
-        recent_items = [item for item in fresh_items if item.published_at >= recent_cutoff]
-
-        if recent_items or not context.macro_theme:
+        if recent_items or not collect_fallback:
             return recent_items
 
-        fallback_start = now - timedelta(days=_MACRO_FALLBACK_MAX_DAYS)
-        fallback_end = now - timedelta(days=_MACRO_FALLBACK_MIN_DAYS)
-        fallback_items = [
-            item
-            for item in fresh_items
-            if fallback_start <= item.published_at <= fallback_end
-        ]
         if fallback_items:
             logger.info("Using macro fallback window for news results.")
         else:
             logger.info("No macro news in fallback window; returning empty list.")
         return fallback_items
 
-    def _filter_by_sector(self, items: list[NewsItem], context: _QueryContext) -> list[NewsItem]:
-        if not context.sector:
+    def _filter_by_sector(
+        self,
+        items: list[_PreparedItem],
+        context: _QueryContext,
+    ) -> list[_PreparedItem]:
+        sector_lower = context.sector_lower
+        if not sector_lower:
             return items
-        sector_lower = context.sector.lower()
-        return [
-            item
-            for item in items
-            if sector_lower in self._combined_text(item).lower()
-        ]
-
-    def _format_item(self, item: NewsItem, context: _QueryContext) -> dict:
-        relevance = self._calculate_relevance(item, context)
-        ticker_match = False
-        if context.ticker:
-            ticker_match = context.ticker.lower() in self._combined_text(item).lower()
-
-        return {
-            "headline": item.title,
-            "summary": item.summary,
-            "url": item.url,
-            "published": item.published_at.isoformat(),
-            "relevance": relevance,
-            "ticker_match": ticker_match,
-        }
-
-    def _calculate_relevance(self, item: NewsItem, context: _QueryContext) -> float:
-        title_lower = item.title.lower()
-        summary_lower = item.summary.lower()
-        combined_lower = f"{title_lower} {summary_lower}"
+        if len(items) < _BULK_SECTOR_SCAN_MIN_ITEMS or _SCAN_SEPARATOR in sector_lower:
+            return [
+                entry
+                for entry in items
+                if sector_lower in entry.combined_lower
+            ]
+        return self._bulk_filter_by_sector(items, sector_lower)
+
+    @staticmethod
+    def _bulk_filter_by_sector(
+        items: list[_PreparedItem],
+        sector_lower: str,
+    ) -> list[_PreparedItem]:
+        """Locate sector hits with str.find over one joined buffer, skipping to the next item."""
+        starts: list[int] = []
+        offset = 0
+        for entry in items:
+            starts.append(offset)
+            offset += len(entry.combined_lower) + 1
+        buffer = _SCAN_SEPARATOR.join(entry.combined_lower for entry in items)
+
+        matched: list[_PreparedItem] = []
+        position = buffer.find(sector_lower)
+        while position != -1:
+            index = bisect_right(starts, position) - 1
+            matched.append(items[index])
+            if index + 1 == len(items):
+                break
+            position = buffer.find(sector_lower, starts[index + 1])
+        return matched
+
+    def _format_item(self, entry: _PreparedItem, context: _QueryContext) -> _RankedItem:
+        item = entry.item
+        ticker_lower = context.ticker_lower
+        ticker_match = ticker_lower is not None and ticker_lower in entry.combined_lower
+        relevance = self._calculate_relevance(entry, context, ticker_match)
+
+        return _RankedItem(
+            headline=item.title,
+            summary=item.summary,
+            url=item.url,
+            published=item.published_at.isoformat(),
+            relevance=relevance,
+            ticker_match=ticker_match,
+        )
+
+    def _calculate_relevance(
+        self,
+        entry: _PreparedItem,
+        context: _QueryContext,
+        ticker_match: bool,
+    ) -> float:
+        title_keywords = self._matched_keywords(entry.title_lower)
+        summary_keywords = self._matched_keywords(entry.summary_lower)
 
-        title_hits = sum(1 for keyword in _KEYWORDS if keyword in title_lower)
-        summary_hits = sum(1 for keyword in _KEYWORDS if keyword in summary_lower)
-        combined_hits = sum(1 for keyword in _KEYWORDS if keyword in combined_lower)
+        title_hits = len(title_keywords)
+        summary_hits = len(summary_keywords)
+        combined_hits = len(title_keywords | summary_keywords)
 
         relevance = 0.1 * combined_hits + 0.15 * summary_hits + 0.2 * title_hits
 
-        if context.ticker and context.ticker.lower() in combined_lower:
+        if ticker_match:
             relevance += 0.2
-        if context.sector and context.sector.lower() in combined_lower:
+        # Items are scored after _filter_by_sector, so a sector query always matches here.
+        if context.sector_lower:
             relevance += 0.1
 
         return min(relevance, 1.0)
 
     @staticmethod
-    def _combined_text(item: NewsItem) -> str:
-        return f"{item.title} {item.summary}"
+    def _matched_keywords(text: str) -> set[str]:
+        """Return the distinct relevance keywords found in already-lowercased text."""
+        return set(_KEYWORD_PATTERN.findall(text))
 
 
 @dataclass(frozen=True)
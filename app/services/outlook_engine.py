@@ -6,15 +6,16 @@ using historical price data from canonical providers.
 All outputs are descriptive — no predictions or financial advice.
 """
 
+import asyncio
+import math
 from datetime import UTC, datetime
+from typing import Any, cast
 
 import numpy as np
 
 from app.core.errors import TickerNotFoundError
 from app.core.logging import get_logger
-from statistics import median
-
-from app.models.catalyst import CatalystEvent
+from app.models.catalyst import CatalystEvent, CatalystType
 from app.models.outlook import (
     Outlook,
     OutlookComposerResponse,
@@ -26,10 +27,10 @@ from app.models.outlook import (
 from app.models.ticker import (
     ChartTimeRange,
     PriceHistory,
-    PricePoint,
     TickerSnapshot,
 )
-from app.providers.history_provider import HistoryProvider
+from app.providers.cache import SingleFlight, cache
+from app.providers.history_provider import HistoryData, HistoryProvider
 from app.services.catalyst_service import CatalystService
 from app.services.news_service import NewsService
 from app.services.pattern_engine import PatternEngine
@@ -38,11 +39,76 @@ from app.services.ticker_service import TickerService
 logger = get_logger(__name__)
 
 # Placeholder key drivers — descriptive, not predictive
-DEFAULT_KEY_DRIVERS = [
+DEFAULT_KEY_DRIVERS = (
     "Company earnings and guidance",
     "Sector trends",
     "Broader market conditions",
-]
+)
+
+# Condition-specific drivers appended after the defaults; labels not listed add none
+_VOLATILITY_DRIVERS: dict[str, str] = {
+    "high": "Elevated price swings observed in recent trading",
+    "low": "Relatively stable price action in recent history",
+}
+_SENTIMENT_DRIVERS: dict[SentimentSummary, str] = {
+    SentimentSummary.POSITIVE: "Historical patterns show above-average positive windows",
+    SentimentSummary.CAUTIOUS: "Recent performance below historical averages",
+}
+
+# Precision for rolling-window return buffers. Log differences are taken in float64
+# and only the result is narrowed, so each return keeps float32's ~1e-7 *relative*
+# error (casting the log closes first would quantize it to the ulp of log(price)).
+# Outputs are rounded to 4 decimals and bucketed at 20%/40%, far coarser than that.
+_STATS_DTYPE = np.float32
+
+
+def _log_differences(later: np.ndarray, earlier: np.ndarray) -> np.ndarray:
+    """`later - earlier` computed in float64, stored in a new _STATS_DTYPE buffer."""
+    out = np.empty(np.broadcast_shapes(later.shape, earlier.shape), dtype=_STATS_DTYPE)
+    np.subtract(later, earlier, out=out, casting="same_kind")
+    return out
+
+
+# Upcoming catalysts listed in a composed outlook
+_MAX_FORMATTED_CATALYSTS = 6
+
+# Pattern-engine context tags, in the sorted order they are emitted
+_CONTEXT_TAG_ORDER = ("earnings", "fed week", "high inflation")
+
+# Bit (index into _CONTEXT_TAG_ORDER) set by each catalyst type; others add no tag
+_CATALYST_CONTEXT_TAG_BITS = {
+    CatalystType.EARNINGS: 1 << 0,
+    CatalystType.FED_MEETING: 1 << 1,
+    CatalystType.CPI: 1 << 2,
+    CatalystType.PPI: 1 << 2,
+}
+
+# sqrt(252 / timeframe_days) for every timeframe the API accepts (index 0 unused)
+_MAX_TABLED_TIMEFRAME = 365
+_ANNUALIZATION_FACTORS = (0.0,) + tuple(
+    math.sqrt(252 / days) for days in range(1, _MAX_TABLED_TIMEFRAME + 1)
+)
+
+# Indexed by the number of volatility thresholds crossed (20%, 40% annualized)
+_VOLATILITY_LABELS = ("low", "moderate", "high")
+
+# Indexed by [positive][cautious]; positive takes precedence over cautious
+_SENTIMENT_TABLE = (
+    (SentimentSummary.MIXED, SentimentSummary.CAUTIOUS),
+    (SentimentSummary.POSITIVE, SentimentSummary.POSITIVE),
+)
+
+# Full driver tuple for every (volatility label, sentiment) pair, built once at import
+_KEY_DRIVER_SETS: dict[tuple[str, SentimentSummary], tuple[str, ...]] = {
+    (label, sentiment): DEFAULT_KEY_DRIVERS
+    + tuple(
+        driver
+        for driver in (_VOLATILITY_DRIVERS.get(label), _SENTIMENT_DRIVERS.get(sentiment))
+        if driver
+    )
+    for label in _VOLATILITY_LABELS
+    for sentiment in SentimentSummary
+}
 
 
 def _classify_volatility(annualized_std: float) -> str:
@@ -53,13 +119,64 @@ def _classify_volatility(annualized_std: float) -> str:
     - low: < 20% annualized
     - moderate: 20-40% annualized
     - high: > 40% annualized
+
+    Each crossed threshold bumps the index into _VOLATILITY_LABELS; the negated
+    comparisons keep NaN classified as "high", as an if/elif chain would.
+    """
+    return _VOLATILITY_LABELS[(not annualized_std < 0.20) + (not annualized_std < 0.40)]
+
+
+def _summarize_returns(rolling_returns: np.ndarray) -> tuple[float, float]:
+    """
+    Summarize rolling returns as (hit_rate, population std).
+
+    The variance is taken over mean-centered returns (one dot product on a single
+    temporary) rather than E[x^2] - E[x]^2, which cancels catastrophically when the
+    spread is tiny relative to the mean.
     """
-    if annualized_std < 0.20:
-        return "low"
-    elif annualized_std < 0.40:
-        return "moderate"
-    else:
-        return "high"
+    count = rolling_returns.size
+    mean = float(rolling_returns.sum()) / count
+    centered = rolling_returns - mean
+    variance = float(np.dot(centered, centered)) / count
+    hit_rate = np.count_nonzero(rolling_returns > 0) / count
+    return float(hit_rate), math.sqrt(variance)
+
+
+def _rolling_returns(log_closes: np.ndarray, window: int) -> np.ndarray:
+    """
+    Window returns closes[i] / closes[i - window] - 1, as expm1 of log differences.
+
+    Works along the first axis, so a (T, N) matrix yields every column's returns.
+    expm1 runs in place on the single _STATS_DTYPE difference buffer. Empty when
+    there are no more rows than `window`.
+    """
+    if len(log_closes) <= window:
+        return np.empty(0, dtype=_STATS_DTYPE)
+    returns = _log_differences(log_closes[window:], log_closes[:-window])
+    np.expm1(returns, out=returns)
+    return returns
+
+
+def _recent_return(log_closes: np.ndarray, days: int) -> float:
+    """Return over the last `days` bars, capped at the history; 0.0 without two closes."""
+    days = min(days, len(log_closes) - 1)
+    return math.expm1(log_closes[-1] - log_closes[-(days + 1)]) if days > 0 else 0.0
+
+
+def _outlook_stats(
+    log_closes: np.ndarray,
+    window: int,
+    recent_days: int,
+) -> tuple[float, float, float]:
+    """
+    Compute (hit_rate, rolling_std, recent_return) for one ticker in a single pass.
+
+    Requires len(log_closes) > window. Both reductions read the single window-return
+    buffer from _rolling_returns; the recent return is a scalar lookup on the same
+    log array rather than a separate price computation.
+    """
+    hit_rate, rolling_std = _summarize_returns(_rolling_returns(log_closes, window))
+    return hit_rate, rolling_std, _recent_return(log_closes, recent_days)
 
 
 def _determine_sentiment(
@@ -74,12 +191,10 @@ def _determine_sentiment(
     - cautious: hit_rate < 45% OR recent return < -10%
     - mixed: everything else
     """
-    if hit_rate > 0.55 and recent_90d_return > 0:
-        return SentimentSummary.POSITIVE
-    elif hit_rate < 0.45 or recent_90d_return < -0.10:
-        return SentimentSummary.CAUTIOUS
-    else:
-        return SentimentSummary.MIXED
+    # bool() so NumPy scalar comparisons still index a tuple
+    positive = bool(hit_rate > 0.55 and recent_90d_return > 0)
+    cautious = bool(hit_rate < 0.45 or recent_90d_return < -0.10)
+    return _SENTIMENT_TABLE[positive][cautious]
 
 
 class OutlookEngine:
@@ -92,6 +207,8 @@ class OutlookEngine:
 
     def __init__(self):
         self._history_provider = HistoryProvider()
+        # In-flight computations, so concurrent identical requests share one result
+        self._pending_outlooks = SingleFlight()
 
     async def compute_outlook(
         self,
@@ -101,6 +218,10 @@ class OutlookEngine:
         """
         Compute an outlook for a ticker based on historical price data.
 
+        Results are cached per (symbol, timeframe) for the history they were
+        computed from, and concurrent requests for the same key await a single
+        computation instead of each fetching and computing.
+
         Args:
             symbol: Stock/ETF ticker symbol.
             timeframe_days: Window for rolling return analysis (10-365 days).
@@ -113,31 +234,156 @@ class OutlookEngine:
             ExternalServiceError: If data provider fails.
         """
         symbol = symbol.upper()
+        return await self._pending_outlooks.run(
+            (symbol, timeframe_days), lambda: self._compute_outlook(symbol, timeframe_days)
+        )
+
+    async def _compute_outlook(self, symbol: str, timeframe_days: int) -> Outlook:
+        """Fetch history and compute (or reuse) the outlook for one key."""
         logger.info(f"Computing {timeframe_days}-day outlook for {symbol}")
 
         # Get 3 years of history from canonical provider
         history = await self._history_provider.get_history(symbol, "3Y", use_cache=True)
 
-        if len(history.points) < timeframe_days + 1:
+        if len(history.closes) < timeframe_days + 1:
             raise TickerNotFoundError(symbol)
 
-        # Extract close prices
-        closes = history.closes
+        # Reuse a cached outlook only if it was computed from the same history
+        history_version = history.dates[-1]
+        cached = cast("tuple[datetime, Outlook] | None", cache.get_outlook(symbol, timeframe_days))
+        if cached is not None and cached[0] == history_version:
+            logger.debug(f"Cache hit for outlook:{symbol}:{timeframe_days}")
+            return cached[1]
 
-        # Compute rolling returns over timeframe_days windows
-        rolling_returns = self._compute_rolling_returns(closes, timeframe_days)
+        # Log closes are memoized on the history, so other timeframes reuse them
+        hit_rate, rolling_std, recent_90d_return = _outlook_stats(
+            history.log_closes, timeframe_days, recent_days=90
+        )
 
-        if len(rolling_returns) == 0:
-            raise TickerNotFoundError(symbol)
+        outlook = self._build_outlook(
+            symbol,
+            timeframe_days,
+            hit_rate=hit_rate,
+            rolling_std=rolling_std,
+            recent_90d_return=recent_90d_return,
+            generated_at=datetime.now(UTC),
+        )
+        cache.set_outlook(symbol, timeframe_days, (history_version, outlook))
+        return outlook
+
+    async def compute_outlooks(
+        self,
+        symbols: list[str],
+        timeframe_days: int = 30,
+    ) -> list[Outlook]:
+        """
+        Compute outlooks for several tickers in one vectorized pass.
+
+        Histories come from one batched provider fetch. Outlooks already cached for
+        the same history (by this or `compute_outlook`) are reused; the rest are
+        computed together and cached per (symbol, timeframe).
+
+        Args:
+            symbols: Stock/ETF ticker symbols.
+            timeframe_days: Window for rolling return analysis (10-365 days).
 
-        # Hit rate: fraction of windows with positive return
-        hit_rate = float(np.mean(rolling_returns > 0))
+        Returns:
+            Outlooks in the same order as `symbols`.
 
-        # Standard deviation of rolling returns
-        rolling_std = float(np.std(rolling_returns))
+        Raises:
+            TickerNotFoundError: If any ticker is not found.
+            ExternalServiceError: If data provider fails.
+        """
+        symbols = [symbol.upper() for symbol in symbols]
+        if not symbols:
+            return []
+        logger.info(f"Computing {timeframe_days}-day outlooks for {len(symbols)} tickers")
+
+        # One batched fetch for every uncached history (keys: unique, in request order)
+        histories = await self._history_provider.get_histories(symbols, "3Y", use_cache=True)
+        for symbol, history in histories.items():
+            if len(history.closes) < timeframe_days + 1:
+                raise TickerNotFoundError(symbol)
+
+        # Reuse outlooks cached by either path for the same history; compute the rest
+        outlooks: dict[str, Outlook] = {}
+        for symbol, history in histories.items():
+            cached = cast(
+                "tuple[datetime, Outlook] | None", cache.get_outlook(symbol, timeframe_days)
+            )
+            if cached is not None and cached[0] == history.dates[-1]:
+                outlooks[symbol] = cached[1]
+
+        missing = {symbol: h for symbol, h in histories.items() if symbol not in outlooks}
+        if missing:
+            outlooks.update(self._compute_outlook_batch(missing, timeframe_days))
+        return [outlooks[symbol] for symbol in symbols]
+
+    def _compute_outlook_batch(
+        self,
+        histories: dict[str, HistoryData],
+        timeframe_days: int,
+    ) -> dict[str, Outlook]:
+        """
+        Compute and cache outlooks for several histories in one vectorized pass.
 
+        Histories are stacked into a (T, N) log-close matrix, front-padded with NaN
+        so shorter histories keep exactly the statistics `compute_outlook` would
+        produce for them. Each history must have more than `timeframe_days` closes.
+        """
+        symbols = list(histories)
+        lengths = np.array([len(history.closes) for history in histories.values()])
+
+        log_closes = np.full((int(lengths.max()), len(symbols)), np.nan)
+        for column, history in enumerate(histories.values()):
+            log_closes[-len(history.closes) :, column] = history.log_closes
+
+        rolling_returns = _rolling_returns(log_closes, timeframe_days)
+
+        # NaN padding yields NaN returns, which are excluded from every reduction.
+        # Padding is only at the front, so each column has exactly length - window
+        # valid returns; no NaN mask has to be built to count them.
+        window_counts = lengths - timeframe_days
+        hit_rates = np.count_nonzero(rolling_returns > 0, axis=0) / window_counts
+        rolling_stds = np.nanstd(rolling_returns, axis=0)
+
+        recent_days = np.minimum(90, lengths - 1)
+        columns = np.arange(len(symbols))
+        recent_returns = np.expm1(log_closes[-1] - log_closes[-(recent_days + 1), columns])
+
+        # One timestamp for the whole batch: every outlook comes from the same pass
+        generated_at = datetime.now(UTC)
+        outlooks: dict[str, Outlook] = {}
+        for column, (symbol, history) in enumerate(histories.items()):
+            outlook = self._build_outlook(
+                symbol,
+                timeframe_days,
+                hit_rate=float(hit_rates[column]),
+                rolling_std=float(rolling_stds[column]),
+                recent_90d_return=float(recent_returns[column]),
+                generated_at=generated_at,
+            )
+            # Same entry shape as compute_outlook, so either path serves the other
+            cache.set_outlook(symbol, timeframe_days, (history.dates[-1], outlook))
+            outlooks[symbol] = outlook
+        return outlooks
+
+    def _build_outlook(
+        self,
+        symbol: str,
+        timeframe_days: int,
+        hit_rate: float,
+        rolling_std: float,
+        recent_90d_return: float,
+        generated_at: datetime,
+    ) -> Outlook:
+        """Turn computed return statistics into an Outlook."""
         # Annualized standard deviation (for volatility classification)
-        annualized_std = rolling_std * np.sqrt(252 / timeframe_days)
+        annualized_std = rolling_std * (
+            _ANNUALIZATION_FACTORS[timeframe_days]
+            if 0 < timeframe_days <= _MAX_TABLED_TIMEFRAME
+            else math.sqrt(252 / timeframe_days)
+        )
 
         # Typical range percent: 1 std dev magnitude as percentage
         typical_range_percent = rolling_std
@@ -145,9 +391,6 @@ class OutlookEngine:
         # Volatility label based on annualized std dev
         volatility_label = _classify_volatility(annualized_std)
 
-        # Recent 90-day return for sentiment
-        recent_90d_return = self._compute_recent_return(closes, 90)
-
         # Determine sentiment from hit rate + recent trend
         sentiment = _determine_sentiment(hit_rate, recent_90d_return)
 
@@ -164,67 +407,17 @@ class OutlookEngine:
             personal_context=None,
             volatility_warning=self._get_volatility_warning(volatility_label),
             timeframe_note=None,
-            generated_at=datetime.now(UTC),
+            generated_at=generated_at,
         )
 
-    def _compute_rolling_returns(
-        self,
-        closes: np.ndarray,
-        window: int,
-    ) -> np.ndarray:
-        """
-        Compute rolling returns over a given window.
-
-        For each position i >= window, compute:
-        return[i] = (closes[i] - closes[i-window]) / closes[i-window]
-        """
-        if len(closes) <= window:
-            return np.array([])
-
-        start_prices = closes[:-window]
-        end_prices = closes[window:]
-
-        returns = (end_prices - start_prices) / start_prices
-        return returns
-
-    def _compute_recent_return(
-        self,
-        closes: np.ndarray,
-        days: int,
-    ) -> float:
-        """Compute return over the most recent N days."""
-        if len(closes) < days + 1:
-            days = len(closes) - 1
-
-        if days <= 0:
-            return 0.0
-
-        start_price = closes[-(days + 1)]
-        end_price = closes[-1]
-
-        return float((end_price - start_price) / start_price)
-
     def _build_key_drivers(
         self,
         volatility_label: str,
         sentiment: SentimentSummary,
     ) -> list[str]:
         """Build list of key drivers based on current conditions."""
-        drivers = list(DEFAULT_KEY_DRIVERS)
-
-        # Add volatility-aware driver
-        if volatility_label == "high":
-            drivers.append("Elevated price swings observed in recent trading")
-        elif volatility_label == "low":
-            drivers.append("Relatively stable price action in recent history")
-
-        # Add sentiment-aware driver
-        if sentiment == SentimentSummary.POSITIVE:
-            drivers.append("Historical patterns show above-average positive windows")
-        elif sentiment == SentimentSummary.CAUTIOUS:
-            drivers.append("Recent performance below historical averages")
-
-        return drivers
+        # Shared tuples are immutable; each outlook gets its own list
+        return list(_KEY_DRIVER_SETS[(volatility_label, sentiment)])
 
     def _get_volatility_warning(self, volatility_label: str) -> str | None:
         """Return a warning if volatility is high."""
@@ -253,19 +446,18 @@ class OutlookComposer:
         symbol = symbol.upper()
         logger.info("Composing outlook summary for %s", symbol)
 
-        snapshot = await self._ticker_service.get_snapshot(symbol)
-        history = await self._ticker_service.get_history(
-            symbol,
-            time_range=ChartTimeRange.ONE_MONTH,
+        # Independent fetches run concurrently; only the pattern step needs catalysts
+        snapshot, history, catalysts, recent_articles = await asyncio.gather(
+            self._ticker_service.get_snapshot(symbol),
+            self._ticker_service.get_history(symbol, time_range=ChartTimeRange.ONE_MONTH),
+            self._catalyst_service.get_catalysts(),
+            self._news_service.get_news(ticker=symbol, limit=6),
         )
-        catalysts = await self._catalyst_service.get_catalysts()
-        recent_articles = await self._news_service.get_news(ticker=symbol, limit=6)
 
-        context_tags = self._build_context_tags(symbol, catalysts)
+        context_tags, what_could_move_it = self._scan_catalysts(symbol, catalysts)
         behavior = await self._pattern_engine.compute_pattern(symbol, context_tags)
 
         big_picture = self._build_big_picture(snapshot)
-        what_could_move_it = self._format_catalysts(symbol, catalysts)
         expected_swings = self._build_expected_swings(snapshot, history)
 
         return OutlookComposerResponse(
@@ -281,22 +473,24 @@ class OutlookComposer:
         symbol = symbol.upper()
         logger.info("Composing outlook summary with metadata for %s", symbol)
 
-        snapshot = await self._ticker_service.get_snapshot(symbol)
-        history = await self._ticker_service.get_history(
-            symbol,
-            time_range=ChartTimeRange.ONE_MONTH,
+        # Independent fetches run concurrently; only the pattern step needs catalysts
+        snapshot, history, catalyst_snapshot, news_snapshot = await asyncio.gather(
+            self._ticker_service.get_snapshot(symbol),
+            self._ticker_service.get_history(symbol, time_range=ChartTimeRange.ONE_MONTH),
+            self._catalyst_service.get_catalyst_snapshot(),
+            self._news_service.get_news_snapshot(ticker=symbol, limit=6),
         )
-        catalyst_snapshot = await self._catalyst_service.get_catalyst_snapshot()
-        news_snapshot = await self._news_service.get_news_snapshot(ticker=symbol, limit=6)
 
-        context_tags = self._build_context_tags(symbol, catalyst_snapshot.events)
+        context_tags, what_could_move_it = self._scan_catalysts(
+            symbol,
+            catalyst_snapshot.events,
+        )
         pattern_snapshot = await self._pattern_engine.compute_pattern_snapshot(
             symbol,
             context_tags,
         )
 
         big_picture = self._build_big_picture(snapshot)
-        what_could_move_it = self._format_catalysts(symbol, catalyst_snapshot.events)
         expected_swings = self._build_expected_swings(snapshot, history)
 
         timestamps = OutlookComposerTimestamps(
@@ -340,7 +534,7 @@ class OutlookComposer:
         snapshot: TickerSnapshot,
         history: PriceHistory,
     ) -> dict[str, float | str]:
-        typical_daily_range = self._median_daily_range(history.points)
+        typical_daily_range = self._median_daily_range(history)
         week_52_range = self._week_52_range(snapshot.week_52_high, snapshot.week_52_low)
 
         return {
@@ -350,40 +544,38 @@ class OutlookComposer:
             "last_change_percent": round(snapshot.change_percent, 4),
         }
 
-    def _median_daily_range(self, points: list[PricePoint]) -> float:
-        ranges: list[float] = []
-        for point in points:
-            if point.close <= 0:
-                continue
-            ranges.append((point.high - point.low) / point.close)
-
-        if not ranges:
+    def _median_daily_range(self, history: PriceHistory) -> float:
+        closes = history.closes
+        valid = closes > 0
+        if not valid.any():
             return 0.0
-        return float(median(ranges))
+        ranges = (history.highs[valid] - history.lows[valid]) / closes[valid]
+        return float(np.median(ranges))
 
     def _week_52_range(self, week_52_high: float, week_52_low: float) -> float:
         if week_52_high <= 0 or week_52_low <= 0:
             return 0.0
         return (week_52_high - week_52_low) / week_52_low
 
-    def _build_context_tags(self, symbol: str, catalysts: list[CatalystEvent]) -> list[str]:
-        tags: list[str] = []
-        for event in catalysts:
-            if event.ticker not in {None, symbol}:
-                continue
-            if event.type.value == "earnings":
-                tags.append("earnings")
-            elif event.type.value in {"cpi", "ppi"}:
-                tags.append("high inflation")
-            elif event.type.value == "fed":
-                tags.append("fed week")
-        return sorted(set(tags))
-
-    def _format_catalysts(self, symbol: str, catalysts: list[CatalystEvent]) -> list[dict]:
-        formatted = []
+    def _scan_catalysts(
+        self,
+        symbol: str,
+        catalysts: list[CatalystEvent],
+    ) -> tuple[list[str], list[dict[str, Any]]]:
+        """
+        Derive pattern context tags and the formatted catalyst list in one pass.
+
+        Tags consider every event for the symbol (or macro); formatting keeps the
+        first _MAX_FORMATTED_CATALYSTS of them.
+        """
+        tag_mask = 0
+        formatted: list[dict[str, Any]] = []
         for event in catalysts:
-            if event.ticker not in {None, symbol}:
+            if event.ticker is not None and event.ticker != symbol:
                 continue
-            payload = event.model_dump(mode="json")
-            formatted.append(payload)
-        return formatted[:6]
+            tag_mask |= _CATALYST_CONTEXT_TAG_BITS.get(event.type, 0)
+            if len(formatted) < _MAX_FORMATTED_CATALYSTS:
+                formatted.append(event.json_payload)
+        # Walking the fixed order yields deduplicated, sorted tags without a set or sort
+        tags = [tag for bit, tag in enumerate(_CONTEXT_TAG_ORDER) if tag_mask >> bit & 1]
+        return tags, formatted
@@ -8,15 +8,18 @@ All outputs are descriptive — no predictions or financial advice.
 
 from __future__ import annotations
 
+import re
+from collections import OrderedDict
 from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
 
 import numpy as np
 
 from app.core.errors import TickerNotFoundError
 from app.core.logging import get_logger
 from app.models.pattern import BehaviorPattern
-from app.providers.history_provider import HistoryPoint, HistoryProvider
+from app.providers.history_provider import HistoryData, HistoryProvider
 
 logger = get_logger(__name__)
 
@@ -32,12 +35,127 @@ _CONTEXT_SYNONYMS: dict[str, str] = {
     "cpi": "high inflation",
 }
 
+# One compiled alternation over every synonym (longest first, whole words only) for
+# free-text tags such as "q3 earnings season"; a single left-to-right scan per tag
+_CONTEXT_SYNONYM_PATTERN = re.compile(
+    r"\b(?:"
+    + "|".join(re.escape(key) for key in sorted(_CONTEXT_SYNONYMS, key=len, reverse=True))
+    + r")\b"
+)
+
+
+def _lookup_table(values: tuple[int, ...]) -> np.ndarray:
+    """
+    Read-only bool table that is True at each accepted value, indexed by the value.
+
+    One trailing False entry absorbs any larger value when lookups clip the index.
+    """
+    table = np.zeros(max(values) + 2, dtype=bool)
+    table[list(values)] = True
+    table.flags.writeable = False
+    return table
+
+
+# Calendar column (a _HistoryArrays field) and lookup table of the values a window's
+# start date must have for each tag; built once, so selection is one gather per tag
+_CONTEXT_FILTERS: dict[str, tuple[str, np.ndarray]] = {
+    "earnings": ("months", _lookup_table((1, 4, 7, 10))),
+    "fed week": ("months", _lookup_table((1, 3, 5, 6, 7, 9, 11, 12))),
+    "high inflation": ("years", _lookup_table((2021, 2022))),
+}
+
+# Window length from which _rolling_extreme switches from folding offsets to doubling
+# spans; below it the W-1 contiguous passes beat log2(W) passes with fresh buffers
+_DOUBLING_MIN_WINDOW = 5
+
+# Histories whose column arrays are kept in PatternEngine's array cache
+_ARRAY_CACHE_SIZE = 256
+
+
+@dataclass(frozen=True)
+class _HistoryArrays:
+    """Struct-of-arrays view of a history's points, indexed in parallel."""
+
+    dates: list[datetime]
+    closes: np.ndarray
+    highs: np.ndarray
+    lows: np.ndarray
+    months: np.ndarray  # int8
+    years: np.ndarray  # int16
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+
+@lru_cache(maxsize=512)
+def _normalize_context_tags(context: tuple[str, ...]) -> tuple[str, ...]:
+    """
+    Map raw context tags to canonical names: trimmed, lowercased, deduplicated, sorted.
+
+    Exact synonyms resolve by dict lookup; longer free-text tags resolve to the first
+    synonym they mention, and are kept as-is when they mention none.
+    """
+    normalized = set()
+    for raw in context:
+        cleaned = raw.strip().lower()
+        if not cleaned:
+            continue
+        canonical = _CONTEXT_SYNONYMS.get(cleaned)
+        if canonical is None:
+            match = _CONTEXT_SYNONYM_PATTERN.search(cleaned)
+            canonical = _CONTEXT_SYNONYMS[match.group()] if match else cleaned
+        normalized.add(canonical)
+    return tuple(sorted(normalized))
+
+
+def _to_arrays(history: HistoryData) -> _HistoryArrays:
+    """Take a history's price columns as-is and derive its calendar columns."""
+    dates = history.dates
+    count = len(dates)
+    return _HistoryArrays(
+        dates=dates,
+        closes=history.closes,
+        highs=history.highs,
+        lows=history.lows,
+        months=np.fromiter((date.month for date in dates), dtype=np.int8, count=count),
+        years=np.fromiter((date.year for date in dates), dtype=np.int16, count=count),
+    )
+
+
+def _rolling_extreme(values: np.ndarray, window: int, reduce: np.ufunc) -> np.ndarray:
+    """
+    Rolling max/min of `values` over `window` elements (requires len(values) >= window).
+
+    Short windows fold each in-window offset into one preallocated output with a
+    contiguous ufunc pass (O(N*W)). From _DOUBLING_MIN_WINDOW up, spans are doubled
+    instead, so each pass reduces two overlapping half-windows: O(N log W) and still
+    only contiguous whole-array ufunc passes.
+    """
+    count = len(values) - window + 1
+    if window < _DOUBLING_MIN_WINDOW:
+        result = values[:count].copy()
+        for offset in range(1, window):
+            reduce(result, values[offset : offset + count], out=result)
+        return result
+
+    # spans[i] holds the extreme of values[i : i + span]
+    spans = values.copy()
+    span = 1
+    while span * 2 <= window:
+        length = len(spans) - span
+        spans = reduce(spans[:length], spans[span : span + length])
+        span *= 2
+    # Two (possibly overlapping) spans cover each window exactly
+    return reduce(spans[:count], spans[window - span : window - span + count])
+
 
 class PatternEngine:
     """Engine for descriptive historical behavior patterns."""
 
     def __init__(self) -> None:
         self._history_provider = HistoryProvider()
+        # LRU of column arrays per fetched history, keyed by (symbol, timestamp, source)
+        self._array_cache: OrderedDict[tuple[str, datetime, str], _HistoryArrays] = OrderedDict()
 
     async def compute_pattern(self, symbol: str, context: list[str]) -> BehaviorPattern:
         """
@@ -59,50 +177,57 @@ class PatternEngine:
         logger.info("Computing behavior pattern for %s", symbol)
 
         history = await self._history_provider.get_history(symbol, "5Y", use_cache=True)
-        if len(history.points) < 6:
+        if len(history.dates) < 6:
             raise TickerNotFoundError(symbol)
 
-        pattern = self._build_pattern(history.points, context)
+        pattern = self._build_pattern(self._cached_arrays(history), context)
         return PatternSnapshot(
             pattern=pattern,
             timestamp=history.timestamp,
             source=history.source,
         )
 
+    def _cached_arrays(self, history: HistoryData) -> _HistoryArrays:
+        """Return cached column arrays for a history, extracting them on first use."""
+        key = (history.ticker, history.timestamp, history.source)
+        arrays = self._array_cache.get(key)
+        if arrays is not None:
+            self._array_cache.move_to_end(key)
+            return arrays
+
+        arrays = _to_arrays(history)
+        self._array_cache[key] = arrays
+        if len(self._array_cache) > _ARRAY_CACHE_SIZE:
+            self._array_cache.popitem(last=False)
+        return arrays
+
     def _compute_window_metrics(
         self,
-        points: list[HistoryPoint],
+        arrays: _HistoryArrays,
         window_size: int,
     ) -> tuple[np.ndarray, np.ndarray]:
         """Compute window returns and swing ranges for all rolling windows."""
-        window_count = len(points) - window_size + 1
+        closes = arrays.closes
+        window_count = len(closes) - window_size + 1
         if window_count <= 0:
             return np.array([]), np.array([])
 
-        returns: list[float] = []
-        ranges: list[float] = []
-
-        for idx in range(window_count):
-            window = points[idx : idx + window_size]
-            start_price = window[0].close
-            end_price = window[-1].close
-            max_high = max(point.high for point in window)
-            min_low = min(point.low for point in window)
-
-            if start_price == 0:
-                returns.append(0.0)
-                ranges.append(0.0)
-                continue
+        max_highs = _rolling_extreme(arrays.highs, window_size, np.maximum)
+        min_lows = _rolling_extreme(arrays.lows, window_size, np.minimum)
+        start_prices = closes[:window_count]
+        end_prices = closes[window_size - 1 :]
 
-            returns.append((end_price - start_price) / start_price)
-            ranges.append((max_high - min_low) / start_price)
+        # Windows starting at a zero close report zero return and range
+        valid = start_prices != 0
+        safe_starts = np.where(valid, start_prices, 1.0)
+        returns = np.where(valid, (end_prices - start_prices) / safe_starts, 0.0)
+        ranges = np.where(valid, (max_highs - min_lows) / safe_starts, 0.0)
+        return returns, ranges
 
-        return np.array(returns), np.array(ranges)
-
-    def _build_pattern(self, points: list[HistoryPoint], context: list[str]) -> BehaviorPattern:
+    def _build_pattern(self, arrays: _HistoryArrays, context: list[str]) -> BehaviorPattern:
         window_size = 5
-        returns, ranges = self._compute_window_metrics(points, window_size)
-        indices = self._select_window_indices(points, window_size, context)
+        returns, ranges = self._compute_window_metrics(arrays, window_size)
+        indices = self._select_window_indices(arrays, window_size, context)
 
         note = self._build_notes(context, filtered=True)
         if not indices:
@@ -113,9 +238,12 @@ class PatternEngine:
         selected_ranges = ranges[indices]
 
         sample_size = int(len(selected_returns))
-        win_rate = float(np.mean(selected_returns > 0)) if sample_size else 0.0
-        typical_range = float(np.median(selected_ranges)) if sample_size else 0.0
-        max_move = float(np.max(np.abs(selected_returns))) if sample_size else 0.0
+        win_rate = typical_range = max_move = 0.0
+        if sample_size:
+            # Integer count and two reductions; no float mean or abs() temporaries
+            win_rate = np.count_nonzero(selected_returns > 0) / sample_size
+            typical_range = float(np.median(selected_ranges))
+            max_move = float(max(selected_returns.max(), -selected_returns.min()))
 
         return BehaviorPattern(
             sample_size=sample_size,
@@ -127,48 +255,26 @@ class PatternEngine:
 
     def _select_window_indices(
         self,
-        points: list[HistoryPoint],
+        arrays: _HistoryArrays,
         window_size: int,
         context: list[str],
     ) -> list[int]:
         """Select window indices whose start dates match all recognized context tags."""
+        window_count = len(arrays) - window_size + 1
         normalized = self._normalize_context(context)
-        if not normalized:
-            return list(range(len(points) - window_size + 1))
-
-        indices: list[int] = []
-        for idx in range(len(points) - window_size + 1):
-            start_date = points[idx].date
-            if self._matches_context(start_date, normalized):
-                indices.append(idx)
-        return indices
-
-    def _matches_context(self, date: datetime, context: list[str]) -> bool:
-        """Return True if date matches all recognized context tags."""
-        matchers = [self._context_matcher(tag) for tag in context]
-        matchers = [matcher for matcher in matchers if matcher is not None]
-        if not matchers:
-            return True
-        return all(matcher(date) for matcher in matchers)
-
-    def _context_matcher(self, tag: str):
-        normalized = _CONTEXT_SYNONYMS.get(tag, tag)
-        if normalized == "earnings":
-            return lambda date: date.month in {1, 4, 7, 10}
-        if normalized == "fed week":
-            return lambda date: date.month in {1, 3, 5, 6, 7, 9, 11, 12}
-        if normalized == "high inflation":
-            return lambda date: date.year in {2021, 2022}
-        return None
+        filters = [_CONTEXT_FILTERS[tag] for tag in normalized if tag in _CONTEXT_FILTERS]
+        if not filters:
+            return list(range(window_count))
+
+        start_count = max(window_count, 0)
+        mask = np.ones(start_count, dtype=bool)
+        for field, table in filters:
+            mask &= table.take(getattr(arrays, field)[:start_count], mode="clip")
+        return np.flatnonzero(mask).tolist()
 
     def _normalize_context(self, context: list[str]) -> list[str]:
-        normalized = []
-        for raw in context:
-            cleaned = raw.strip().lower()
-            if not cleaned:
-                continue
-            normalized.append(_CONTEXT_SYNONYMS.get(cleaned, cleaned))
-        return sorted(set(normalized))
+        # Memoized on the tag tuple: selection and notes normalize the same context
+        return list(_normalize_context_tags(tuple(context)))
 
     def _build_notes(self, context: list[str], filtered: bool) -> str:
         normalized = self._normalize_context(context)
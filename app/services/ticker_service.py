@@ -5,31 +5,45 @@ Transforms provider data into API response models.
 All raw data comes from app.providers (single source of truth).
 """
 
+from bisect import bisect_right
+from collections.abc import AsyncIterator, Iterator, Mapping
+from itertools import islice
+from types import MappingProxyType
+from typing import Any, NamedTuple
+
+import pydantic_core
+
 from app.core.logging import get_logger
 from app.models.ticker import (
     ChartTimeRange,
     PriceHistory,
-    PricePoint,
     TickerSnapshot,
     VolatilityLevel,
 )
-from app.providers.history_provider import HistoryProvider
-from app.providers.price_provider import PriceProvider
+from app.providers.history_provider import HistoryData, HistoryProvider
+from app.providers.price_provider import PriceData, PriceProvider
 
 logger = get_logger(__name__)
 
 
+# Market cap display units, ascending; bisect picks the largest threshold not above the value
+_MARKET_CAP_THRESHOLDS = (1e6, 1e9, 1e12)
+_MARKET_CAP_SUFFIXES = ("M", "B", "T")
+
+
 def _format_market_cap(market_cap: int | None) -> str:
     """Format market cap as human-readable string (e.g., 2.89T, 485B)."""
     if market_cap is None:
         return "N/A"
-    if market_cap >= 1e12:
-        return f"{market_cap / 1e12:.2f}T"
-    if market_cap >= 1e9:
-        return f"{market_cap / 1e9:.2f}B"
-    if market_cap >= 1e6:
-        return f"{market_cap / 1e6:.2f}M"
-    return f"{market_cap:,.0f}"
+    unit = bisect_right(_MARKET_CAP_THRESHOLDS, market_cap)
+    if not unit:
+        return f"{market_cap:,.0f}"
+    return f"{market_cap / _MARKET_CAP_THRESHOLDS[unit - 1]:.2f}{_MARKET_CAP_SUFFIXES[unit - 1]}"
+
+
+# 52-week range bands (percent of the low), ascending; bisect maps a range to its level
+_VOLATILITY_THRESHOLDS = (30, 60)
+_VOLATILITY_LEVELS = (VolatilityLevel.LOW, VolatilityLevel.MODERATE, VolatilityLevel.HIGH)
 
 
 def _calculate_volatility(week_52_high: float, week_52_low: float) -> VolatilityLevel:
@@ -38,28 +52,107 @@ def _calculate_volatility(week_52_high: float, week_52_low: float) -> Volatility
         return VolatilityLevel.MODERATE
 
     range_percent = (week_52_high - week_52_low) / week_52_low * 100
+    return _VOLATILITY_LEVELS[bisect_right(_VOLATILITY_THRESHOLDS, range_percent)]
+
+
+class _CompanyInfo(NamedTuple):
+    """Static company details merged into every snapshot."""
+
+    name: str
+    sector: str
+    summary: str
+
+    @classmethod
+    def placeholder(cls, symbol: str) -> "_CompanyInfo":
+        """Details for a symbol with no company data on file."""
+        return cls(symbol, "Unknown", f"{symbol} - market data")
+
+
+# Company info cache (would come from a company data provider in production); read-only
+# so the shared entries can be handed to every request without copying
+_COMPANY_INFO: Mapping[str, _CompanyInfo] = MappingProxyType(
+    {
+        "AAPL": _CompanyInfo(
+            "Apple Inc.",
+            "Technology",
+            "Consumer electronics and software company known for iPhone, Mac, and services ecosystem.",
+        ),
+        "NVDA": _CompanyInfo(
+            "NVIDIA Corporation",
+            "Technology",
+            "Leading designer of graphics processing units (GPUs) for gaming, data centers, and AI.",
+        ),
+        "MSFT": _CompanyInfo(
+            "Microsoft Corporation",
+            "Technology",
+            "Enterprise software giant with cloud computing (Azure), productivity tools, and gaming.",
+        ),
+        "GOOGL": _CompanyInfo(
+            "Alphabet Inc.",
+            "Communication Services",
+            "Parent company of Google, leading in search, advertising, cloud computing, and AI.",
+        ),
+        "AMZN": _CompanyInfo(
+            "Amazon.com Inc.",
+            "Consumer Discretionary",
+            "E-commerce and cloud computing leader with AWS, retail, and streaming services.",
+        ),
+        "META": _CompanyInfo(
+            "Meta Platforms Inc.",
+            "Communication Services",
+            "Social media conglomerate operating Facebook, Instagram, WhatsApp, and Reality Labs.",
+        ),
+        "TSLA": _CompanyInfo(
+            "Tesla Inc.",
+            "Consumer Discretionary",
+            "Electric vehicle manufacturer and clean energy company with autonomous driving technology.",
+        ),
+        "SPY": _CompanyInfo(
+            "SPDR S&P 500 ETF Trust",
+            "Broad Market",
+            "Exchange-traded fund tracking the S&P 500 index.",
+        ),
+        "QQQ": _CompanyInfo(
+            "Invesco QQQ Trust",
+            "Technology",
+            "ETF tracking the Nasdaq-100 Index, focused on large-cap tech and growth stocks.",
+        ),
+        "AMD": _CompanyInfo(
+            "Advanced Micro Devices Inc.",
+            "Technology",
+            "Semiconductor company competing in CPUs, GPUs, and data center processors.",
+        ),
+    }
+)
+
+
+# ChartTimeRange to HistoryProvider period
+_PERIOD_MAP: Mapping[ChartTimeRange, str] = MappingProxyType(
+    {
+        ChartTimeRange.ONE_DAY: "1D",
+        ChartTimeRange.ONE_MONTH: "1M",
+        ChartTimeRange.SIX_MONTHS: "6M",
+        ChartTimeRange.ONE_YEAR: "1Y",
+    }
+)
+
+# History points encoded per chunk of a streamed NDJSON response
+_NDJSON_CHUNK_POINTS = 256
 
-    if range_percent < 30:
-        return VolatilityLevel.LOW
-    elif range_percent < 60:
-        return VolatilityLevel.MODERATE
-    else:
-        return VolatilityLevel.HIGH
 
+def _price_point_rows(history: HistoryData) -> Iterator[dict[str, Any]]:
+    """PricePoint-shaped dicts straight from the history's columns."""
+    for date, close, high, low in zip(
+        history.dates, history.closes.tolist(), history.highs.tolist(), history.lows.tolist()
+    ):
+        yield {"date": date, "close": close, "high": high, "low": low}
 
-# Company info cache (would come from a company data provider in production)
-_COMPANY_INFO: dict[str, dict] = {
-    "AAPL": {"name": "Apple Inc.", "sector": "Technology", "summary": "Consumer electronics and software company known for iPhone, Mac, and services ecosystem."},
-    "NVDA": {"name": "NVIDIA Corporation", "sector": "Technology", "summary": "Leading designer of graphics processing units (GPUs) for gaming, data centers, and AI."},
-    "MSFT": {"name": "Microsoft Corporation", "sector": "Technology", "summary": "Enterprise software giant with cloud computing (Azure), productivity tools, and gaming."},
-    "GOOGL": {"name": "Alphabet Inc.", "sector": "Communication Services", "summary": "Parent company of Google, leading in search, advertising, cloud computing, and AI."},
-    "AMZN": {"name": "Amazon.com Inc.", "sector": "Consumer Discretionary", "summary": "E-commerce and cloud computing leader with AWS, retail, and streaming services."},
-    "META": {"name": "Meta Platforms Inc.", "sector": "Communication Services", "summary": "Social media conglomerate operating Facebook, Instagram, WhatsApp, and Reality Labs."},
-    "TSLA": {"name": "Tesla Inc.", "sector": "Consumer Discretionary", "summary": "Electric vehicle manufacturer and clean energy company with autonomous driving technology."},
-    "SPY": {"name": "SPDR S&P 500 ETF Trust", "sector": "Broad Market", "summary": "Exchange-traded fund tracking the S&P 500 index."},
-    "QQQ": {"name": "Invesco QQQ Trust", "sector": "Technology", "summary": "ETF tracking the Nasdaq-100 Index, focused on large-cap tech and growth stocks."},
-    "AMD": {"name": "Advanced Micro Devices Inc.", "sector": "Technology", "summary": "Semiconductor company competing in CPUs, GPUs, and data center processors."},
-}
+
+async def _ndjson_points(history: HistoryData) -> AsyncIterator[bytes]:
+    """Yield PricePoint-shaped NDJSON lines, a chunk of points at a time."""
+    rows = _price_point_rows(history)
+    while chunk := list(islice(rows, _NDJSON_CHUNK_POINTS)):
+        yield b"".join(pydantic_core.to_json(row) + b"\n" for row in chunk)
 
 
 class TickerService:
@@ -86,13 +179,22 @@ class TickerService:
 
         # Get price from canonical provider
         price_data = await self._price_provider.get_price(symbol)
+        return self._build_snapshot(symbol, price_data)
+
+    async def get_snapshots(self, symbols: list[str]) -> list[TickerSnapshot]:
+        """
+        Get snapshot information for several tickers.
+
+        Uses the PriceProvider bulk path, so live quotes are fetched in batches
+        rather than one request per symbol. Duplicate symbols are collapsed.
+        """
+        logger.info(f"Fetching snapshots for {len(symbols)} symbols")
+        prices = await self._price_provider.get_prices(symbols)
+        return [self._build_snapshot(symbol, price_data) for symbol, price_data in prices.items()]
 
-        # Get company info
-        company = _COMPANY_INFO.get(symbol, {
-            "name": symbol,
-            "sector": "Unknown",
-            "summary": f"{symbol} - market data",
-        })
+    def _build_snapshot(self, symbol: str, price_data: PriceData) -> TickerSnapshot:
+        # Get company info (the placeholder is only built for symbols with none on file)
+        company = _COMPANY_INFO.get(symbol) or _CompanyInfo.placeholder(symbol)
 
         # Calculate volatility from 52-week range
         volatility = _calculate_volatility(
@@ -102,11 +204,11 @@ class TickerService:
 
         return TickerSnapshot(
             ticker=symbol,
-            company_name=company["name"],
-            sector=company["sector"],
+            company_name=company.name,
+            sector=company.sector,
             market_cap=_format_market_cap(price_data.market_cap),
             volatility=volatility,
-            summary=company["summary"],
+            summary=company.summary,
             current_price=price_data.current_price,
             change_percent=price_data.change_percent,
             week_52_high=price_data.week_52_high,
@@ -128,35 +230,41 @@ class TickerService:
         symbol = symbol.upper()
         logger.info(f"Fetching {time_range.value} history for {symbol}")
 
-        # Map ChartTimeRange to provider period
-        period_map = {
-            ChartTimeRange.ONE_DAY: "1D",
-            ChartTimeRange.ONE_MONTH: "1M",
-            ChartTimeRange.SIX_MONTHS: "6M",
-            ChartTimeRange.ONE_YEAR: "1Y",
-        }
-        period = period_map.get(time_range, "1M")
+        period = _PERIOD_MAP.get(time_range, "1M")
 
         # Get history from canonical provider
         history_data = await self._history_provider.get_history(symbol, period)
 
-        # Transform to API model
-        points = [
-            PricePoint(
-                date=p.date,
-                close=p.close,
-                high=p.high,
-                low=p.low,
-            )
-            for p in history_data.points
-        ]
-
-        return PriceHistory(
-            ticker=symbol,
-            points=points,
-            current_price=history_data.end_price,
-            change=history_data.change,
-            change_percent=history_data.change_percent,
-            timestamp=history_data.timestamp,
-            source=history_data.source,
+        # Transform to API model. Points go in as plain dicts so pydantic-core validates
+        # the whole list in one call; model_construct per point measured slower, not faster.
+        return PriceHistory.model_validate(
+            {
+                "ticker": symbol,
+                "points": list(_price_point_rows(history_data)),
+                "current_price": history_data.end_price,
+                "change": history_data.change,
+                "change_percent": history_data.change_percent,
+                "timestamp": history_data.timestamp,
+                "source": history_data.source,
+            }
         )
+
+    async def stream_history(
+        self,
+        symbol: str,
+        time_range: ChartTimeRange = ChartTimeRange.ONE_MONTH,
+    ) -> AsyncIterator[bytes]:
+        """
+        Get price history for a ticker as NDJSON, one {date, close, high, low} per line.
+
+        The history is fetched before this returns, so lookup errors surface as
+        usual; the lines are then encoded chunk by chunk while the response is
+        sent instead of as one PriceHistory document.
+        """
+        symbol = symbol.upper()
+        logger.info(f"Streaming {time_range.value} history for {symbol}")
+
+        period = _PERIOD_MAP.get(time_range, "1M")
+        history_data = await self._history_provider.get_history(symbol, period)
+        return _ndjson_points(history_data)
+
@@ -0,0 +1,97 @@
+"""
+Shared test fixtures.
+"""
+
+import inspect
+import json
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from app.main import app as _app
+from app.services.catalyst_service import CatalystService
+
+AsgiRequest = Callable[..., Awaitable[tuple[int, Any]]]
+
+
+def pytest_collection_modifyitems(items: list[pytest.Item]) -> None:
+    """
+    Tag async tests as asyncio_io and group them apart from CPU-bound (cpu-marked) ones.
+
+    Lets a run select either kind (`-m cpu`), and under pytest-xdist with
+    `--dist=loadgroup` keeps each kind on its own worker group. Tests that
+    name their own xdist_group (shared mutable state) keep it.
+    """
+    for item in items:
+        grouped = item.get_closest_marker("xdist_group") is not None
+        if item.get_closest_marker("cpu"):
+            if not grouped:
+                item.add_marker(pytest.mark.xdist_group("cpu"))
+        elif inspect.iscoroutinefunction(getattr(item, "function", None)):
+            item.add_marker(pytest.mark.asyncio_io)
+            if not grouped:
+                item.add_marker(pytest.mark.xdist_group("io"))
+
+
+@pytest.fixture(scope="session")
+def app() -> FastAPI:
+    """The application, built once at conftest import and shared by every module."""
+    return _app
+
+
+@pytest_asyncio.fixture(scope="session")
+async def async_client(app: FastAPI):
+    """One in-process async test client shared by the whole session."""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+
+
+async def _asgi_request(method: str, path: str, json_body: Any = None) -> tuple[int, Any]:
+    """Call the app's ASGI interface directly; returns (status, decoded JSON body)."""
+    body = b"" if json_body is None else json.dumps(json_body).encode()
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"test"), (b"content-type", b"application/json")],
+        "server": ("test", 80),
+        "client": ("127.0.0.1", 1234),
+    }
+    messages: list[dict[str, Any]] = []
+
+    async def receive() -> dict[str, Any]:
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message: dict[str, Any]) -> None:
+        messages.append(message)
+
+    await _app(scope, receive, send)
+    status = next(m["status"] for m in messages if m["type"] == "http.response.start")
+    content = b"".join(m.get("body", b"") for m in messages if m["type"] == "http.response.body")
+    return status, json.loads(content)
+
+
+@pytest.fixture(scope="session")
+def asgi_request() -> AsgiRequest:
+    """
+    Direct ASGI caller for JSON endpoints, without httpx request/response objects.
+
+    For hot, assertion-light tests; use async_client when headers or raw bytes matter.
+    """
+    return _asgi_request
+
+
+@pytest.fixture(scope="session")
+def catalyst_service() -> CatalystService:
+    """Stateless catalyst service shared by the session (its snapshot cache is module-level)."""
+    return CatalystService()
@@ -1,26 +1,86 @@
-"""Tests ensuring API layer does not call providers directly."""
+"""Tests ensuring API and service layers respect provider boundaries."""
 
 from __future__ import annotations
 
 import ast
+from collections.abc import Callable
+from functools import cache
 from pathlib import Path
 
+import pytest
+
+# Pure source scanning; no event loop or I/O
+pytestmark = pytest.mark.cpu
+
+# Statements whose bodies can hold imports; expression subtrees are never entered
+_IMPORT_CONTAINERS = (
+    ast.Module,
+    ast.If,
+    ast.Try,
+    ast.TryStar,
+    ast.ExceptHandler,
+    ast.With,
+    ast.AsyncWith,
+    ast.For,
+    ast.AsyncFor,
+    ast.While,
+    ast.Match,
+    ast.match_case,
+    ast.FunctionDef,
+    ast.AsyncFunctionDef,
+    ast.ClassDef,
+)
+
+
+class _ImportFinder(ast.NodeVisitor):
+    """Collect imported module names accepted by `matches`, visiting statements only."""
+
+    def __init__(self, matches: Callable[[str], bool]) -> None:
+        self.matches = matches
+        self.hits: list[str] = []
+
+    def visit_Import(self, node: ast.Import) -> None:
+        self.hits.extend(alias.name for alias in node.names if self.matches(alias.name))
+
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
+        if node.module and self.matches(node.module):
+            self.hits.append(node.module)
+
+    def generic_visit(self, node: ast.AST) -> None:
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, (ast.Import, ast.ImportFrom, *_IMPORT_CONTAINERS)):
+                self.visit(child)
+
+
+@cache
+def _parse_source(path: str, mtime_ns: int, size: int, needle: bytes) -> ast.Module | None:
+    # Keyed on the file's stat so an edited module is read again. Files that never
+    # mention `needle` cannot import it and are not parsed at all.
+    data = Path(path).read_bytes()
+    if needle not in data:
+        return None
+    return ast.parse(data, filename=path)
+
+
+def _parse_module(module_path: Path, needle: str) -> ast.Module | None:
+    stat = module_path.stat()
+    return _parse_source(str(module_path), stat.st_mtime_ns, stat.st_size, needle.encode())
+
+
+def _find_imports(tree: ast.Module | None, matches: Callable[[str], bool]) -> list[str]:
+    if tree is None:
+        return []
+    finder = _ImportFinder(matches)
+    finder.visit(tree)
+    return finder.hits
+
+
+def _is_provider_module(name: str) -> bool:
+    return name == "app.providers" or name.startswith("app.providers.")
+
 
 def _find_provider_imports(module_path: Path) -> list[str]:
-    contents = module_path.read_text(encoding="utf-8")
-    tree = ast.parse(contents, filename=str(module_path))
-    imports: list[str] = []
-    for node in ast.walk(tree):
-        if isinstance(node, ast.Import):
-            for alias in node.names:
-                if alias.name == "app.providers" or alias.name.startswith("app.providers."):
-                    imports.append(alias.name)
-        if isinstance(node, ast.ImportFrom):
-            if node.module and (
-                node.module == "app.providers" or node.module.startswith("app.providers.")
-            ):
-                imports.append(node.module)
-    return imports
+    return _find_imports(_parse_module(module_path, "app.providers"), _is_provider_module)
 
 
 def test_api_routes_do_not_import_providers_directly() -> None:
@@ -32,3 +92,42 @@ def test_api_routes_do_not_import_providers_directly() -> None:
             provider_imports[str(module_path)] = found
 
     assert provider_imports == {}, f"Direct provider imports found: {provider_imports}"
+
+
+def _find_module_imports(module_path: Path, module_name: str) -> list[str]:
+    return _find_imports(
+        _parse_module(module_path, module_name), lambda name: name == module_name
+    )
+
+
+def test_services_fetch_market_data_only_through_providers() -> None:
+    services_dir = Path("app/services")
+    yfinance_imports: dict[str, list[str]] = {}
+    for module_path in services_dir.glob("*.py"):
+        found = _find_module_imports(module_path, "yfinance")
+        if found:
+            yfinance_imports[str(module_path)] = found
+
+    assert yfinance_imports == {}, f"Direct yfinance imports found: {yfinance_imports}"
+
+
+def test_import_finder_reaches_nested_statement_imports() -> None:
+    tree = ast.parse(
+        "import app.providers\n"
+        "try:\n"
+        "    from app.providers.cache import cache\n"
+        "except ImportError:\n"
+        "    import app.providers.guards\n"
+        "class Service:\n"
+        "    def load(self):\n"
+        "        if True:\n"
+        "            from app.providers import history_provider\n"
+        "value = [__import__('app.providers') for _ in range(1)]\n"
+    )
+
+    assert _find_imports(tree, _is_provider_module) == [
+        "app.providers",
+        "app.providers.cache",
+        "app.providers.guards",
+        "app.providers",
+    ]
@@ -1,15 +1,18 @@
 """Tests for catalyst calendar service."""
 
-import asyncio
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
 
 from app.models.catalyst import CatalystEvent
+from app.services import catalyst_service as catalyst_module
 from app.services.catalyst_service import CatalystService
 
 
-def test_catalyst_service_returns_events():
-    service = CatalystService()
-    events = asyncio.run(service.get_catalysts())
+@pytest.mark.asyncio
+async def test_catalyst_service_returns_events(catalyst_service):
+    events = await catalyst_service.get_catalysts()
 
     assert events
     assert all(isinstance(event, CatalystEvent) for event in events)
@@ -17,25 +20,58 @@ def test_catalyst_service_returns_events():
     assert {event.confidence for event in events}
 
 
-def test_catalyst_service_caches_daily_snapshot():
+@pytest.mark.asyncio
+async def test_catalyst_service_caches_daily_snapshot():
     service = CatalystService()
-    first = asyncio.run(service.get_catalysts())
-    second = asyncio.run(service.get_catalysts())
+    first = await service.get_catalysts()
+    second = await service.get_catalysts()
 
     assert first is second
 
 
-def test_catalyst_events_have_future_dates():
-    service = CatalystService()
-    events = asyncio.run(service.get_catalysts())
+@pytest.mark.asyncio
+async def test_catalyst_events_have_future_dates(catalyst_service):
+    events = await catalyst_service.get_catalysts()
     now = datetime.now(timezone.utc)
 
     assert all(event.date >= now for event in events)
 
 
-def test_catalyst_events_are_sorted_chronologically():
+@pytest.mark.asyncio
+async def test_catalyst_events_are_sorted_chronologically(catalyst_service):
+    events = await catalyst_service.get_catalysts()
+
+    # Aware datetimes compared as POSIX seconds: one diff pass, no sorted copy
+    times = np.fromiter((event.date.timestamp() for event in events), dtype=np.float64)
+    assert (np.diff(times) >= 0).all()
+
+
+@pytest.mark.asyncio
+async def test_catalyst_cache_regenerates_when_day_changes():
     service = CatalystService()
-    events = asyncio.run(service.get_catalysts())
+    first = await service.get_catalysts()
+
+    stale = catalyst_module._cache_state
+    catalyst_module._cache_state = stale._replace(date=stale.date - timedelta(days=1))
+    second = await service.get_catalysts()
+
+    assert second is not first
+    assert catalyst_module._cache_state.date == stale.date
+
+
+@pytest.mark.asyncio
+async def test_catalyst_cache_day_matches_snapshot_timestamp():
+    catalyst_module._cache_state = None
+    snapshot = await CatalystService().get_catalyst_snapshot()
+
+    assert catalyst_module._cache_state.date == snapshot.timestamp.replace(
+        hour=0, minute=0, second=0, microsecond=0
+    )
+
+
+@pytest.mark.asyncio
+async def test_catalyst_json_payload_is_serialized_once(catalyst_service):
+    event = (await catalyst_service.get_catalysts())[0]
 
-    dates = [event.date for event in events]
-    assert dates == sorted(dates)
+    assert event.json_payload is event.json_payload
+    assert event.json_payload == event.model_dump(mode="json")
@@ -2,24 +2,30 @@
 Tests for /explain endpoint.
 """
 
+import asyncio
+import re
+
 import pytest
-from httpx import ASGITransport, AsyncClient
 
-from app.main import app
+from app.services.ai_service import _parse_ai_response, _validate_response_keys
 
+# Recommendation language, matched anywhere in one scan of the lowercased text
+_FORBIDDEN_PHRASES = re.compile(r"you should buy|you should sell|i recommend|buy now|sell now")
 
-@pytest.fixture
-def async_client():
-    """Create async test client."""
-    transport = ASGITransport(app=app)
-    return AsyncClient(transport=transport, base_url="http://test")
+_EXPLANATION_FIELDS = (
+    "whatsHappeningNow",
+    "keyDrivers",
+    "riskVsOpportunity",
+    "historicalBehavior",
+    "simpleRecap",
+)
 
 
 @pytest.mark.asyncio
-async def test_explain_with_symbol(async_client):
-    """Test explanation with a symbol provided."""
-    async with async_client as client:
-        response = await client.post(
+async def test_explain_request_variants(async_client):
+    """Explanations with and without a symbol, and in simple mode (posted concurrently)."""
+    with_symbol, without_symbol, simple_mode = await asyncio.gather(
+        async_client.post(
             "/explain",
             json={
                 "question": "What's happening with AAPL?",
@@ -27,68 +33,43 @@ async def test_explain_with_symbol(async_client):
                 "timeframeDays": 30,
                 "simpleMode": False,
             },
-        )
-
-    assert response.status_code == 200
-    data = response.json()
-
-    # All 5 required fields must be present and non-empty
-    assert "whatsHappeningNow" in data and len(data["whatsHappeningNow"]) > 0
-    assert "keyDrivers" in data and len(data["keyDrivers"]) > 0
-    assert "riskVsOpportunity" in data and len(data["riskVsOpportunity"]) > 0
-    assert "historicalBehavior" in data and len(data["historicalBehavior"]) > 0
-    assert "simpleRecap" in data and len(data["simpleRecap"]) > 0
-
-
-@pytest.mark.asyncio
-async def test_explain_without_symbol(async_client):
-    """Test explanation without a symbol (generic market question)."""
-    async with async_client as client:
-        response = await client.post(
+        ),
+        # Generic market question
+        async_client.post(
             "/explain",
             json={"question": "How do interest rates affect stocks?"},
-        )
-
-    assert response.status_code == 200
-    data = response.json()
-
-    # All 5 required fields must be present and non-empty
-    assert "whatsHappeningNow" in data and len(data["whatsHappeningNow"]) > 0
-    assert "keyDrivers" in data and len(data["keyDrivers"]) > 0
-    assert "riskVsOpportunity" in data and len(data["riskVsOpportunity"]) > 0
-    assert "historicalBehavior" in data and len(data["historicalBehavior"]) > 0
-    assert "simpleRecap" in data and len(data["simpleRecap"]) > 0
-
-
-@pytest.mark.asyncio
-async def test_explain_simple_mode(async_client):
-    """Test explanation with simple mode enabled."""
-    async with async_client as client:
-        response = await client.post(
+        ),
+        async_client.post(
             "/explain",
             json={
                 "question": "What is happening with SPY?",
                 "symbol": "SPY",
                 "simpleMode": True,
             },
-        )
+        ),
+    )
 
-    assert response.status_code == 200
-    data = response.json()
-    assert "simpleRecap" in data
+    # All 5 required fields must be present and non-empty
+    for response in (with_symbol, without_symbol):
+        assert response.status_code == 200
+        data = response.json()
+        for field in _EXPLANATION_FIELDS:
+            assert field in data and len(data[field]) > 0, field
+
+    assert simple_mode.status_code == 200
+    assert "simpleRecap" in simple_mode.json()
 
 
 @pytest.mark.asyncio
 async def test_explain_no_recommendation_language(async_client):
     """Test that response doesn't contain buy/sell recommendations."""
-    async with async_client as client:
-        response = await client.post(
-            "/explain",
-            json={
-                "question": "Should I buy NVDA?",
-                "symbol": "NVDA",
-            },
-        )
+    response = await async_client.post(
+        "/explain",
+        json={
+            "question": "Should I buy NVDA?",
+            "symbol": "NVDA",
+        },
+    )
 
     assert response.status_code == 200
     data = response.json()
@@ -104,62 +85,39 @@ async def test_explain_no_recommendation_language(async_client):
     ).lower()
 
     # Check for forbidden recommendation language
-    forbidden_phrases = ["you should buy", "you should sell", "i recommend", "buy now", "sell now"]
-    for phrase in forbidden_phrases:
-        assert phrase not in all_text, f"Found forbidden phrase '{phrase}' in response"
-
-
-@pytest.mark.asyncio
-async def test_explain_empty_question_fails(async_client):
-    """Test that empty question is rejected."""
-    async with async_client as client:
-        response = await client.post(
-            "/explain",
-            json={"question": ""},
-        )
-
-    assert response.status_code == 422
-
-
-@pytest.mark.asyncio
-async def test_explain_question_too_long_fails(async_client):
-    """Test that overly long question is rejected."""
-    async with async_client as client:
-        response = await client.post(
-            "/explain",
-            json={"question": "x" * 501},  # Over 500 char limit
-        )
-
-    assert response.status_code == 422
-
-
+    match = _FORBIDDEN_PHRASES.search(all_text)
+    assert match is None, f"Found forbidden phrase '{match.group()}' in response"
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        pytest.param({"question": ""}, id="empty-question"),
+        pytest.param({"question": "x" * 501}, id="question-over-500-chars"),
+        pytest.param(
+            {"question": "What about AAPL?", "symbol": "AAPL", "timeframeDays": 5},
+            id="timeframe-below-10",
+        ),
+    ],
+)
 @pytest.mark.asyncio
-async def test_explain_invalid_timeframe_fails(async_client):
-    """Test that invalid timeframe is rejected."""
-    async with async_client as client:
-        response = await client.post(
-            "/explain",
-            json={
-                "question": "What about AAPL?",
-                "symbol": "AAPL",
-                "timeframeDays": 5,  # Below minimum of 10
-            },
-        )
+async def test_explain_validation_errors(asgi_request, payload):
+    """Test that invalid questions and timeframes are rejected."""
+    status, _ = await asgi_request("POST", "/explain", payload)
 
-    assert response.status_code == 422
+    assert status == 422
 
 
 @pytest.mark.asyncio
 async def test_explain_fallback_prevents_500(async_client):
     """Test that fallback logic prevents 500 errors for unknown symbols."""
-    async with async_client as client:
-        response = await client.post(
-            "/explain",
-            json={
-                "question": "What's happening with this random ticker?",
-                "symbol": "XYZNOTREAL123",
-            },
-        )
+    response = await async_client.post(
+        "/explain",
+        json={
+            "question": "What's happening with this random ticker?",
+            "symbol": "XYZNOTREAL123",
+        },
+    )
 
     # Should not return 500 - fallback should handle gracefully
     assert response.status_code == 200
@@ -170,3 +128,18 @@ async def test_explain_fallback_prevents_500(async_client):
     assert "riskVsOpportunity" in data
     assert "historicalBehavior" in data
     assert "simpleRecap" in data
+
+
+def test_parse_ai_response_handles_code_block_and_trailing_comma():
+    """Parser extracts fenced JSON and repairs trailing commas."""
+    content = (
+        "Here you go:\n```json\n"
+        '{"whatsHappeningNow": "a", "keyDrivers": ["b",], "riskVsOpportunity": "c", '
+        '"historicalBehavior": "d", "simpleRecap": "e",}\n```'
+    )
+
+    parsed = _parse_ai_response(content)
+
+    assert parsed["keyDrivers"] == ["b"]
+    assert _validate_response_keys(parsed)
+    assert not _validate_response_keys({"whatsHappeningNow": "a"})
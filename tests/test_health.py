@@ -3,24 +3,12 @@ Tests for health endpoint.
 """
 
 import pytest
-from httpx import ASGITransport, AsyncClient
-
-from app.main import app
-
-
-@pytest.fixture
-def async_client():
-    """Create async test client."""
-    transport = ASGITransport(app=app)
-    return AsyncClient(transport=transport, base_url="http://test")
 
 
 @pytest.mark.asyncio
-async def test_health_check(async_client):
+async def test_health_check(asgi_request):
     """Test health check returns ok status."""
-    async with async_client as client:
-        response = await client.get("/health")
+    status, data = await asgi_request("GET", "/health")
 
-    assert response.status_code == 200
-    data = response.json()
+    assert status == 200
     assert data["status"] == "ok"
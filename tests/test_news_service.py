@@ -1,10 +1,14 @@
 from __future__ import annotations
 
-from asyncio import run
 from datetime import UTC, datetime, timedelta
 
+import pytest
+
 from app.providers.news_provider import NewsData, NewsItem
-from app.services.news_service import NewsService
+from app.services import news_service
+from app.services.news_service import _KEYWORDS, NewsService, _PreparedItem
+
+_FROZEN_NOW = datetime(2025, 1, 15, 14, 30, tzinfo=UTC)
 
 
 class _StubNewsProvider:
@@ -19,64 +23,178 @@ class _StubNewsProvider:
         )
 
 
-def test_get_news_rejects_items_older_than_60_days() -> None:
-    now = datetime.now(UTC)
-    stale_item = NewsItem(
-        title="Older headline",
-        summary="Old summary",
-        source="Archive",
-        published_at=now - timedelta(days=61),
+class _FrozenDatetime(datetime):
+    """datetime whose now() is pinned to _FROZEN_NOW."""
+
+    @classmethod
+    def now(cls, tz=None):  # type: ignore[override]
+        return _FROZEN_NOW if tz is None else _FROZEN_NOW.astimezone(tz)
+
+
+@pytest.fixture
+def frozen_now(monkeypatch) -> datetime:
+    """Pin the news service clock, so age cutoffs are exact instant comparisons."""
+    monkeypatch.setattr(news_service, "datetime", _FrozenDatetime)
+    return _FROZEN_NOW
+
+
+def _aged_item(title: str, summary: str, source: str, published_at: datetime) -> NewsItem:
+    return NewsItem(
+        title=title,
+        summary=summary,
+        source=source,
+        published_at=published_at,
         url=None,
         sentiment=None,
     )
-    service = NewsService(provider=_StubNewsProvider([stale_item]))
-
-    result = run(service.get_news(ticker="AAPL", limit=5))
-
-    assert result == []
 
 
-def test_macro_fallback_allows_30_to_60_day_window() -> None:
-    now = datetime.now(UTC)
-    fallback_item = NewsItem(
-        title="Tech sector sees mixed demand",
-        summary="Tech companies are adjusting to macro conditions.",
-        source="MacroWire",
-        published_at=now - timedelta(days=40),
+_MACRO_TECH_ITEM = (
+    "Tech sector sees mixed demand",
+    "Tech companies are adjusting to macro conditions.",
+    "MacroWire",
+)
+
+
+@pytest.mark.parametrize(
+    ("items", "query", "expected"),
+    [
+        pytest.param(
+            [("Older headline", "Old summary", "Archive", timedelta(days=61))],
+            {"ticker": "AAPL"},
+            [],
+            id="rejects-items-older-than-60-days",
+        ),
+        pytest.param(
+            [(*_MACRO_TECH_ITEM, timedelta(days=40))],
+            {"sector": "Tech"},
+            ["Tech sector sees mixed demand"],
+            id="macro-fallback-allows-30-to-60-days",
+        ),
+        pytest.param(
+            [
+                ("Fresh headline", "Fresh summary", "Wire", timedelta(days=3)),
+                ("Stale headline", "Stale summary", "Archive", timedelta(days=75)),
+            ],
+            {"ticker": "AAPL"},
+            ["Fresh headline"],
+            id="filters-out-stale-items",
+        ),
+        pytest.param(
+            [(*_MACRO_TECH_ITEM, timedelta(days=40))],
+            {"ticker": "AAPL", "sector": "Tech"},
+            [],
+            id="ticker-query-ignores-macro-fallback",
+        ),
+        pytest.param(
+            [(*_MACRO_TECH_ITEM, timedelta(days=60))],
+            {"sector": "Tech"},
+            ["Tech sector sees mixed demand"],
+            id="exactly-60-days-is-kept",
+        ),
+        pytest.param(
+            [(*_MACRO_TECH_ITEM, timedelta(days=60, microseconds=1))],
+            {"sector": "Tech"},
+            [],
+            id="just-over-60-days-is-stale",
+        ),
+        pytest.param(
+            [("Week-old headline", "Summary", "Wire", timedelta(days=7))],
+            {"ticker": "AAPL"},
+            ["Week-old headline"],
+            id="exactly-7-days-is-recent",
+        ),
+    ],
+)
+@pytest.mark.asyncio
+async def test_get_news_age_windows(frozen_now, items, query, expected) -> None:
+    news = [
+        _aged_item(title, summary, source, frozen_now - age)
+        for title, summary, source, age in items
+    ]
+    service = NewsService(provider=_StubNewsProvider(news))
+
+    result = await service.get_news(limit=5, **query)
+
+    assert [item["headline"] for item in result] == expected
+    cutoff = frozen_now - timedelta(days=60)
+    assert all(datetime.fromisoformat(item["published"]) >= cutoff for item in result)
+
+
+@pytest.mark.asyncio
+async def test_relevance_counts_distinct_keywords_across_title_and_summary(frozen_now) -> None:
+    item = NewsItem(
+        title="Earnings recap",
+        summary="Earnings call focused on demand and earnings quality.",
+        source="Wire",
+        published_at=frozen_now - timedelta(days=1),
         url=None,
         sentiment=None,
     )
-    service = NewsService(provider=_StubNewsProvider([fallback_item]))
+    service = NewsService(provider=_StubNewsProvider([item]))
 
-    result = run(service.get_news(sector="Tech", limit=5))
+    result = await service.get_news(ticker="AAPL", limit=5)
 
-    assert len(result) == 1
-    assert result[0]["headline"] == fallback_item.title
+    # title: {earnings}; summary: {earnings, demand}; combined: {earnings, demand}
+    assert result[0]["relevance"] == pytest.approx(0.1 * 2 + 0.15 * 2 + 0.2 * 1)
 
 
-def test_get_news_filters_out_stale_items() -> None:
-    now = datetime.now(UTC)
-    fresh_item = NewsItem(
-        title="Fresh headline",
-        summary="Fresh summary",
+@pytest.mark.asyncio
+async def test_get_news_orders_by_relevance(frozen_now) -> None:
+    plain_item = NewsItem(
+        title="Shares drift",
+        summary="Quiet session.",
         source="Wire",
-        published_at=now - timedelta(days=3),
+        published_at=frozen_now - timedelta(hours=1),
         url=None,
         sentiment=None,
     )
-    stale_item = NewsItem(
-        title="Stale headline",
-        summary="Stale summary",
-        source="Archive",
-        published_at=now - timedelta(days=75),
+    keyword_item = NewsItem(
+        title="Earnings guidance cut",
+        summary="Margin warning weighs on demand.",
+        source="Wire",
+        published_at=frozen_now - timedelta(hours=5),
         url=None,
         sentiment=None,
     )
-    service = NewsService(provider=_StubNewsProvider([fresh_item, stale_item]))
+    service = NewsService(provider=_StubNewsProvider([plain_item, keyword_item]))
+
+    result = await service.get_news(ticker="AAPL", limit=2)
+
+    assert [item["headline"] for item in result] == [keyword_item.title, plain_item.title]
+
+
+def test_bulk_sector_filter_matches_per_item_scan() -> None:
+    now = datetime.now(UTC)
+    items = [
+        NewsItem(
+            title=f"Energy update {index}" if index % 3 == 0 else f"Retail note {index}",
+            summary="Energy names rally." if index % 5 == 0 else "Broad market recap.",
+            source="Wire",
+            published_at=now - timedelta(hours=1),
+            url=None,
+            sentiment=None,
+        )
+        for index in range(100)
+    ]
+    prepared = [_PreparedItem.from_item(item) for item in items]
 
-    result = run(service.get_news(ticker="AAPL", limit=5))
+    matched = NewsService._bulk_filter_by_sector(prepared, "energy")
 
-    assert len(result) == 1
-    assert result[0]["headline"] == fresh_item.title
-    published = datetime.fromisoformat(result[0]["published"])
-    assert published >= now - timedelta(days=60)
+    assert matched == [entry for entry in prepared if "energy" in entry.combined_lower]
+
+
+def test_keyword_scan_matches_individual_substring_checks() -> None:
+    text = "supply chain costs drove a margin warning; options desk eyes earnings guidance"
+
+    assert NewsService._matched_keywords(text) == {k for k in _KEYWORDS if k in text}
+
+
+def test_no_keyword_is_a_prefix_of_another() -> None:
+    # The lookahead scan reports one keyword per position, so a keyword that starts
+    # another would hide it wherever both begin at the same offset.
+    assert not any(
+        other != keyword and other.startswith(keyword)
+        for keyword in _KEYWORDS
+        for other in _KEYWORDS
+    )
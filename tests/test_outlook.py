@@ -2,30 +2,28 @@
 Tests for outlook endpoint.
 """
 
-import pytest
-from httpx import ASGITransport, AsyncClient
-
-from app.main import app
+import asyncio
+import re
 
+import pytest
 
-@pytest.fixture
-def async_client():
-    """Create async test client."""
-    transport = ASGITransport(app=app)
-    return AsyncClient(transport=transport, base_url="http://test")
+# Prediction/advice language as plain substrings (so "will" also catches "willing"),
+# matched in one scan of the lowercased text
+_FORBIDDEN_WORDS = re.compile(r"will|predict|guarantee|should buy|should sell|recommend")
 
 
 @pytest.mark.asyncio
-async def test_outlook_basic(async_client):
-    """Test basic outlook generation."""
-    async with async_client as client:
-        response = await client.post(
-            "/outlook",
-            json={"symbol": "AAPL", "timeframeDays": 30},
-        )
-
-    assert response.status_code == 200
-    data = response.json()
+async def test_outlook_request_variants(async_client):
+    """Basic, default-timeframe, custom-timeframe and lowercase requests (posted concurrently)."""
+    basic, default, custom, lowercase = await asyncio.gather(
+        async_client.post("/outlook", json={"symbol": "AAPL", "timeframeDays": 30}),
+        async_client.post("/outlook", json={"symbol": "SPY"}),
+        async_client.post("/outlook", json={"symbol": "QQQ", "timeframeDays": 90}),
+        async_client.post("/outlook", json={"symbol": "aapl", "timeframeDays": 30}),
+    )
+
+    assert basic.status_code == 200
+    data = basic.json()
     assert data["ticker"] == "AAPL"
     assert data["timeframe_days"] == 30
     assert data["sentiment_summary"] in ["positive", "mixed", "cautious"]
@@ -35,15 +33,25 @@ async def test_outlook_basic(async_client):
     assert "historical_hit_rate" in data
     assert 0 <= data["historical_hit_rate"] <= 1
 
+    # Default timeframe is 30 days
+    assert default.status_code == 200
+    assert default.json()["timeframe_days"] == 30
+
+    assert custom.status_code == 200
+    assert custom.json()["timeframe_days"] == 90
+
+    # Symbol is normalized to uppercase
+    assert lowercase.status_code == 200
+    assert lowercase.json()["ticker"] == "AAPL"
+
 
 @pytest.mark.asyncio
 async def test_outlook_response_includes_all_sections(async_client):
     """Test outlook response always includes all expected sections."""
-    async with async_client as client:
-        response = await client.post(
-            "/outlook",
-            json={"symbol": "AAPL", "timeframeDays": 30},
-        )
+    response = await async_client.post(
+        "/outlook",
+        json={"symbol": "AAPL", "timeframeDays": 30},
+    )
 
     assert response.status_code == 200
     data = response.json()
@@ -63,70 +71,30 @@ async def test_outlook_response_includes_all_sections(async_client):
     assert expected_keys.issubset(data.keys())
 
 
+@pytest.mark.parametrize(
+    ("path", "payload"),
+    [
+        pytest.param("/outlook", {"symbol": "AAPL", "timeframeDays": 5}, id="timeframe-too-low"),
+        pytest.param("/outlook", {"symbol": "AAPL", "timeframeDays": 500}, id="timeframe-too-high"),
+        pytest.param("/outlooks", {"symbols": []}, id="batch-without-symbols"),
+    ],
+)
 @pytest.mark.asyncio
-async def test_outlook_default_timeframe(async_client):
-    """Test outlook with default timeframe (30 days)."""
-    async with async_client as client:
-        response = await client.post(
-            "/outlook",
-            json={"symbol": "SPY"},
-        )
-
-    assert response.status_code == 200
-    data = response.json()
-    assert data["timeframe_days"] == 30
-
-
-@pytest.mark.asyncio
-async def test_outlook_custom_timeframe(async_client):
-    """Test outlook with custom timeframe."""
-    async with async_client as client:
-        response = await client.post(
-            "/outlook",
-            json={"symbol": "QQQ", "timeframeDays": 90},
-        )
-
-    assert response.status_code == 200
-    data = response.json()
-    assert data["timeframe_days"] == 90
-
-
-@pytest.mark.asyncio
-async def test_outlook_validation_timeframe_too_low(async_client):
-    """Test validation: timeframe < 10 should fail."""
-    async with async_client as client:
-        response = await client.post(
-            "/outlook",
-            json={"symbol": "AAPL", "timeframeDays": 5},
-        )
-
-    assert response.status_code == 422
-    data = response.json()
-    assert "detail" in data
-
+async def test_outlook_validation_errors(asgi_request, path, payload):
+    """Test validation: timeframes outside 10-365 and empty batches are rejected."""
+    status, data = await asgi_request("POST", path, payload)
 
-@pytest.mark.asyncio
-async def test_outlook_validation_timeframe_too_high(async_client):
-    """Test validation: timeframe > 365 should fail."""
-    async with async_client as client:
-        response = await client.post(
-            "/outlook",
-            json={"symbol": "AAPL", "timeframeDays": 500},
-        )
-
-    assert response.status_code == 422
-    data = response.json()
+    assert status == 422
     assert "detail" in data
 
 
 @pytest.mark.asyncio
 async def test_outlook_unknown_symbol_in_mock_mode(async_client):
     """Test that unknown symbols still work in mock mode (with generated data)."""
-    async with async_client as client:
-        response = await client.post(
-            "/outlook",
-            json={"symbol": "XYZNOTREAL123", "timeframeDays": 30},
-        )
+    response = await async_client.post(
+        "/outlook",
+        json={"symbol": "XYZNOTREAL123", "timeframeDays": 30},
+    )
 
     # In mock mode, unknown symbols get generated data
     # In live mode, this would return 404
@@ -137,27 +105,27 @@ async def test_outlook_unknown_symbol_in_mock_mode(async_client):
 
 
 @pytest.mark.asyncio
-async def test_outlook_symbol_normalization(async_client):
-    """Test that symbol is normalized to uppercase."""
-    async with async_client as client:
-        response = await client.post(
-            "/outlook",
-            json={"symbol": "aapl", "timeframeDays": 30},
-        )
+async def test_outlooks_batch_preserves_request_order(async_client):
+    """Test batch outlooks return one normalized entry per requested symbol."""
+    response = await async_client.post(
+        "/outlooks",
+        json={"symbols": ["spy", "AAPL", " nvda "], "timeframeDays": 20},
+    )
 
     assert response.status_code == 200
     data = response.json()
-    assert data["ticker"] == "AAPL"
+    assert [item["ticker"] for item in data] == ["SPY", "AAPL", "NVDA"]
+    assert all(item["timeframe_days"] == 20 for item in data)
+    assert all(0 <= item["historical_hit_rate"] <= 1 for item in data)
 
 
 @pytest.mark.asyncio
 async def test_outlook_no_prediction_language(async_client):
     """Test that response doesn't contain prediction/advice language."""
-    async with async_client as client:
-        response = await client.post(
-            "/outlook",
-            json={"symbol": "AAPL", "timeframeDays": 30},
-        )
+    response = await async_client.post(
+        "/outlook",
+        json={"symbol": "AAPL", "timeframeDays": 30},
+    )
 
     assert response.status_code == 200
     data = response.json()
@@ -173,16 +141,14 @@ async def test_outlook_no_prediction_language(async_client):
     ).lower()
 
     # No prediction/advice language
-    forbidden_words = ["will", "predict", "guarantee", "should buy", "should sell", "recommend"]
-    for word in forbidden_words:
-        assert word not in all_text, f"Found forbidden word '{word}' in response"
+    match = _FORBIDDEN_WORDS.search(all_text)
+    assert match is None, f"Found forbidden word '{match.group()}' in response"
 
 
 @pytest.mark.asyncio
 async def test_outlook_composer_with_metadata(async_client):
     """Test composed outlook endpoint returns metadata."""
-    async with async_client as client:
-        response = await client.get("/outlook/AAPL")
+    response = await async_client.get("/outlook/AAPL")
 
     assert response.status_code == 200
     data = response.json()
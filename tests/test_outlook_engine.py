@@ -5,100 +5,157 @@ Uses synthetic price series to verify statistical calculations
 without depending on external data sources.
 """
 
+import asyncio
+from datetime import UTC, datetime, timedelta
+
 import numpy as np
 import pytest
 
-from app.models.outlook import SentimentSummary
+from app.core.config import settings
+from app.models.catalyst import CatalystEvent, CatalystType, ConfidenceLevel
+from app.models.outlook import Outlook, SentimentSummary
+from app.models.ticker import PriceHistory, PricePoint
+from app.providers.cache import cache
+from app.providers.history_provider import HistoryData, HistoryPoint
 from app.services.outlook_engine import (
+    _ANNUALIZATION_FACTORS,
+    OutlookComposer,
     OutlookEngine,
     _classify_volatility,
     _determine_sentiment,
+    _outlook_stats,
+    _recent_return,
+    _rolling_returns,
+    _summarize_returns,
 )
 
 
-class TestVolatilityClassification:
-    """Tests for volatility classification logic."""
+def _closes(*prices: float) -> np.ndarray:
+    # Shared across tests, so made read-only: a test that writes into one fails loudly
+    closes = np.array(prices)
+    closes.setflags(write=False)
+    return closes
 
-    def test_low_volatility(self):
-        """Annualized std < 20% should be classified as low."""
-        assert _classify_volatility(0.15) == "low"
-        assert _classify_volatility(0.10) == "low"
-        assert _classify_volatility(0.05) == "low"
 
-    def test_moderate_volatility(self):
-        """Annualized std 20-40% should be classified as moderate."""
-        assert _classify_volatility(0.25) == "moderate"
-        assert _classify_volatility(0.30) == "moderate"
-        assert _classify_volatility(0.35) == "moderate"
+# Synthetic close series used by the computation tests
+_CLOSES_UP_10PCT = _closes(100.0, 110.0, 121.0, 133.1)
+_CLOSES_UP6 = _closes(100.0, 105.0, 110.0, 115.0, 120.0, 125.0)
+_CLOSES_UP5 = _closes(100.0, 105.0, 110.0, 115.0, 120.0)
+_CLOSES_UP2 = _closes(100.0, 105.0)
+_CLOSES_DOWN_10PCT = _closes(100.0, 90.0, 81.0)
+_CLOSES_NOISY = _closes(100.0, 103.5, 99.2, 101.7, 108.3, 104.9)
+_CLOSES_UP_20PCT = _closes(100.0, 120.0)
+_CLOSES_UP_10PCT_PAIR = _closes(100.0, 110.0)
+_CLOSES_DOWN6 = _closes(100.0, 95.0, 90.0, 85.0, 80.0, 75.0)
+_CLOSES_ALTERNATING = _closes(100.0, 110.0, 100.0, 110.0, 100.0)
+_CLOSES_CONST5 = _closes(100.0, 100.0, 100.0, 100.0, 100.0)
+_CLOSES_SWINGS_20PCT = _closes(100.0, 120.0, 96.0, 115.2, 92.16)
 
-    def test_high_volatility(self):
-        """Annualized std > 40% should be classified as high."""
-        assert _classify_volatility(0.45) == "high"
-        assert _classify_volatility(0.60) == "high"
-        assert _classify_volatility(0.80) == "high"
 
-    def test_boundary_values(self):
-        """Test exact boundary values."""
-        assert _classify_volatility(0.20) == "moderate"  # At boundary
-        assert _classify_volatility(0.40) == "high"  # At boundary
-        assert _classify_volatility(0.199) == "low"
-        assert _classify_volatility(0.399) == "moderate"
+@pytest.fixture(scope="module")
+def engine():
+    """OutlookEngine shared by the module's stateless computation tests."""
+    return OutlookEngine()
 
 
-class TestSentimentDetermination:
-    """Tests for sentiment determination logic."""
+class TestVolatilityClassification:
+    """Tests for volatility classification logic."""
 
-    def test_positive_sentiment(self):
-        """High hit rate + positive recent return = positive."""
-        assert _determine_sentiment(0.60, 0.05) == SentimentSummary.POSITIVE
-        assert _determine_sentiment(0.70, 0.10) == SentimentSummary.POSITIVE
-        assert _determine_sentiment(0.56, 0.01) == SentimentSummary.POSITIVE
+    @pytest.mark.parametrize(
+        ("annualized_std", "expected"),
+        [
+            # Annualized std < 20% is low
+            (0.05, "low"),
+            (0.10, "low"),
+            (0.15, "low"),
+            (0.199, "low"),
+            # 20-40% is moderate; the lower boundary belongs to it
+            (0.20, "moderate"),
+            (0.25, "moderate"),
+            (0.30, "moderate"),
+            (0.35, "moderate"),
+            (0.399, "moderate"),
+            # 40% and above is high
+            (0.40, "high"),
+            (0.45, "high"),
+            (0.60, "high"),
+            (0.80, "high"),
+        ],
+    )
+    def test_classify_volatility(self, annualized_std, expected):
+        """Annualized std maps to its bucket, with exact boundaries."""
+        assert _classify_volatility(annualized_std) == expected
+
+    def test_nan_and_numpy_inputs(self):
+        """NaN stays in the top bucket and NumPy scalars classify like floats."""
+        assert _classify_volatility(float("nan")) == "high"
+        assert _classify_volatility(np.float64(0.25)) == "moderate"
+
+    def test_annualization_table_matches_direct_formula(self):
+        """Tabled factors equal sqrt(252 / days) across the accepted timeframes."""
+        for days in (1, 10, 30, 252, 365):
+            assert _ANNUALIZATION_FACTORS[days] == np.sqrt(252 / days)
 
-    def test_cautious_sentiment_low_hit_rate(self):
-        """Low hit rate = cautious."""
-        assert _determine_sentiment(0.40, 0.05) == SentimentSummary.CAUTIOUS
-        assert _determine_sentiment(0.35, 0.02) == SentimentSummary.CAUTIOUS
 
-    def test_cautious_sentiment_negative_return(self):
-        """Very negative recent return = cautious."""
-        assert _determine_sentiment(0.60, -0.15) == SentimentSummary.CAUTIOUS
-        assert _determine_sentiment(0.55, -0.12) == SentimentSummary.CAUTIOUS
+class TestSentimentDetermination:
+    """Tests for sentiment determination logic."""
 
-    def test_mixed_sentiment(self):
-        """Middle ground = mixed."""
-        assert _determine_sentiment(0.50, 0.02) == SentimentSummary.MIXED
-        assert _determine_sentiment(0.55, -0.05) == SentimentSummary.MIXED
-        assert _determine_sentiment(0.48, 0.05) == SentimentSummary.MIXED
+    @pytest.mark.parametrize(
+        ("hit_rate", "recent_return", "expected"),
+        [
+            # High hit rate + positive recent return
+            (0.60, 0.05, SentimentSummary.POSITIVE),
+            (0.70, 0.10, SentimentSummary.POSITIVE),
+            (0.56, 0.01, SentimentSummary.POSITIVE),
+            # Low hit rate
+            (0.40, 0.05, SentimentSummary.CAUTIOUS),
+            (0.35, 0.02, SentimentSummary.CAUTIOUS),
+            # Very negative recent return
+            (0.60, -0.15, SentimentSummary.CAUTIOUS),
+            (0.55, -0.12, SentimentSummary.CAUTIOUS),
+            # Middle ground
+            (0.50, 0.02, SentimentSummary.MIXED),
+            (0.55, -0.05, SentimentSummary.MIXED),
+            (0.48, 0.05, SentimentSummary.MIXED),
+        ],
+    )
+    def test_determine_sentiment(self, hit_rate, recent_return, expected):
+        """Hit rate and recent return map to the expected sentiment."""
+        assert _determine_sentiment(hit_rate, recent_return) == expected
+
+    def test_numpy_scalar_inputs(self):
+        """NumPy scalar statistics map to the same sentiment as floats."""
+        assert _determine_sentiment(np.float64(0.60), np.float64(0.05)) == (
+            SentimentSummary.POSITIVE
+        )
+        assert _determine_sentiment(np.float64(0.40), np.float64(0.05)) == (
+            SentimentSummary.CAUTIOUS
+        )
 
 
 class TestRollingReturnsComputation:
     """Tests for rolling returns computation."""
 
-    @pytest.fixture
-    def engine(self):
-        """Create OutlookEngine instance."""
-        return OutlookEngine()
-
-    def test_rolling_returns_basic(self, engine):
+    def test_rolling_returns_basic(self):
         """Test basic rolling return calculation."""
         # Simple price series: 100, 110, 121 (10% daily returns)
-        closes = np.array([100.0, 110.0, 121.0, 133.1])
+        closes = _CLOSES_UP_10PCT
 
         # Rolling 1-day returns
-        returns = engine._compute_rolling_returns(closes, window=1)
+        returns = _rolling_returns(np.log(closes), 1)
 
         # Each return should be ~10%
         assert len(returns) == 3
         np.testing.assert_almost_equal(returns[0], 0.10, decimal=2)
         np.testing.assert_almost_equal(returns[1], 0.10, decimal=2)
 
-    def test_rolling_returns_longer_window(self, engine):
+    def test_rolling_returns_longer_window(self):
         """Test rolling returns with longer window."""
         # Prices: 100, 105, 110, 115, 120
-        closes = np.array([100.0, 105.0, 110.0, 115.0, 120.0])
+        closes = _CLOSES_UP5
 
         # Rolling 2-day returns
-        returns = engine._compute_rolling_returns(closes, window=2)
+        returns = _rolling_returns(np.log(closes), 2)
 
         # First return: (110 - 100) / 100 = 0.10
         # Second return: (115 - 105) / 105 ≈ 0.095
@@ -106,47 +163,58 @@ class TestRollingReturnsComputation:
         assert len(returns) == 3
         np.testing.assert_almost_equal(returns[0], 0.10, decimal=2)
 
-    def test_rolling_returns_empty_if_insufficient_data(self, engine):
+    def test_rolling_returns_empty_if_insufficient_data(self):
         """Return empty array if not enough data for window."""
-        closes = np.array([100.0, 105.0])
-        returns = engine._compute_rolling_returns(closes, window=5)
+        closes = _CLOSES_UP2
+        returns = _rolling_returns(np.log(closes), 5)
         assert len(returns) == 0
 
-    def test_rolling_returns_negative(self, engine):
+    def test_rolling_returns_negative(self):
         """Test with declining prices."""
-        closes = np.array([100.0, 90.0, 81.0])  # 10% daily loss
-        returns = engine._compute_rolling_returns(closes, window=1)
+        closes = _CLOSES_DOWN_10PCT  # 10% daily loss
+        returns = _rolling_returns(np.log(closes), 1)
 
         assert len(returns) == 2
         np.testing.assert_almost_equal(returns[0], -0.10, decimal=2)
 
+    def test_rolling_returns_from_log_closes_match_ratio_form(self):
+        """Precomputed log closes give the same returns as the price ratio."""
+        closes = _CLOSES_NOISY
+        returns = _rolling_returns(np.log(closes), 2)
+
+        np.testing.assert_allclose(returns, closes[2:] / closes[:-2] - 1.0, rtol=1e-6)
+
+    def test_rolling_returns_match_reference_on_long_series(self):
+        """A 10k-close series yields every window return, equal to the ratio form."""
+        closes = 100.0 * np.cumprod(1 + np.random.default_rng(0).normal(0, 0.01, 10_000))
+
+        returns = _rolling_returns(np.log(closes), 20)
+
+        assert returns.shape == (len(closes) - 20,)
+        np.testing.assert_allclose(returns, closes[20:] / closes[:-20] - 1.0, rtol=1e-6)
+
 
 class TestRecentReturnComputation:
     """Tests for recent return computation."""
 
-    @pytest.fixture
-    def engine(self):
-        """Create OutlookEngine instance."""
-        return OutlookEngine()
-
-    def test_recent_return_basic(self, engine):
+    def test_recent_return_basic(self):
         """Test basic recent return calculation."""
-        closes = np.array([100.0, 105.0, 110.0, 115.0, 120.0])
+        closes = _CLOSES_UP5
 
         # 3-day return: (120 - 105) / 105 ≈ 14.3%
-        result = engine._compute_recent_return(closes, days=3)
+        result = _recent_return(np.log(closes), 3)
         np.testing.assert_almost_equal(result, 0.143, decimal=2)
 
-    def test_recent_return_full_period(self, engine):
+    def test_recent_return_full_period(self):
         """Test return over full period."""
-        closes = np.array([100.0, 120.0])  # 20% return
-        result = engine._compute_recent_return(closes, days=1)
+        closes = _CLOSES_UP_20PCT  # 20% return
+        result = _recent_return(np.log(closes), 1)
         np.testing.assert_almost_equal(result, 0.20, decimal=2)
 
-    def test_recent_return_handles_short_data(self, engine):
+    def test_recent_return_handles_short_data(self):
         """Test with less data than requested days."""
-        closes = np.array([100.0, 110.0])
-        result = engine._compute_recent_return(closes, days=30)
+        closes = _CLOSES_UP_10PCT_PAIR
+        result = _recent_return(np.log(closes), 30)
         # Should use available data
         np.testing.assert_almost_equal(result, 0.10, decimal=2)
 
@@ -154,32 +222,27 @@ class TestRecentReturnComputation:
 class TestHitRateComputation:
     """Tests for hit rate (fraction of positive windows) computation."""
 
-    @pytest.fixture
-    def engine(self):
-        """Create OutlookEngine instance."""
-        return OutlookEngine()
-
-    def test_hit_rate_all_positive(self, engine):
+    def test_hit_rate_all_positive(self):
         """All positive returns = 100% hit rate."""
         # Steadily increasing prices
-        closes = np.array([100.0, 105.0, 110.0, 115.0, 120.0, 125.0])
-        returns = engine._compute_rolling_returns(closes, window=1)
+        closes = _CLOSES_UP6
+        returns = _rolling_returns(np.log(closes), 1)
         hit_rate = float(np.mean(returns > 0))
         assert hit_rate == 1.0
 
-    def test_hit_rate_all_negative(self, engine):
+    def test_hit_rate_all_negative(self):
         """All negative returns = 0% hit rate."""
         # Steadily decreasing prices
-        closes = np.array([100.0, 95.0, 90.0, 85.0, 80.0, 75.0])
-        returns = engine._compute_rolling_returns(closes, window=1)
+        closes = _CLOSES_DOWN6
+        returns = _rolling_returns(np.log(closes), 1)
         hit_rate = float(np.mean(returns > 0))
         assert hit_rate == 0.0
 
-    def test_hit_rate_mixed(self, engine):
+    def test_hit_rate_mixed(self):
         """Mixed returns = partial hit rate."""
         # Alternating up/down
-        closes = np.array([100.0, 110.0, 100.0, 110.0, 100.0])
-        returns = engine._compute_rolling_returns(closes, window=1)
+        closes = _CLOSES_ALTERNATING
+        returns = _rolling_returns(np.log(closes), 1)
         hit_rate = float(np.mean(returns > 0))
         assert hit_rate == 0.5
 
@@ -187,38 +250,85 @@ class TestHitRateComputation:
 class TestVolatilityBandComputation:
     """Tests for volatility band (std dev) computation."""
 
-    @pytest.fixture
-    def engine(self):
-        """Create OutlookEngine instance."""
-        return OutlookEngine()
-
-    def test_volatility_band_constant_prices(self, engine):
+    def test_volatility_band_constant_prices(self):
         """Constant prices = zero volatility."""
-        closes = np.array([100.0, 100.0, 100.0, 100.0, 100.0])
-        returns = engine._compute_rolling_returns(closes, window=1)
+        closes = _CLOSES_CONST5
+        returns = _rolling_returns(np.log(closes), 1)
         std = float(np.std(returns))
         assert std == 0.0
 
-    def test_volatility_band_volatile_prices(self, engine):
+    def test_volatility_band_volatile_prices(self):
         """Large price swings = high volatility."""
         # 20% swings
-        closes = np.array([100.0, 120.0, 96.0, 115.2, 92.16])
-        returns = engine._compute_rolling_returns(closes, window=1)
+        closes = _CLOSES_SWINGS_20PCT
+        returns = _rolling_returns(np.log(closes), 1)
         std = float(np.std(returns))
         assert std > 0.15  # Should be high
 
 
+class TestReturnSummary:
+    """Tests for the combined hit rate / std reduction."""
+
+    def test_matches_numpy_reference(self):
+        """Hit rate and std match np.mean / np.std on the same returns."""
+        returns = np.array([0.05, -0.02, 0.10, 0.0, -0.07, 0.03])
+        hit_rate, std = _summarize_returns(returns)
+
+        assert hit_rate == pytest.approx(float(np.mean(returns > 0)))
+        assert std == pytest.approx(float(np.std(returns)))
+
+    def test_constant_returns_have_zero_std(self):
+        """Identical returns produce zero std without negative variance."""
+        hit_rate, std = _summarize_returns(np.full(10, 0.1))
+
+        assert hit_rate == 1.0
+        assert std == 0.0
+
+    def test_std_is_stable_for_large_mean(self):
+        """A tiny spread around a large mean is not lost to cancellation."""
+        returns = 1e4 + np.array([1e-6, -1e-6, 2e-6, -2e-6])
+        _, std = _summarize_returns(returns)
+
+        assert std == pytest.approx(float(np.std(returns)), rel=1e-6)
+
+    def test_float32_window_stats_match_float64_reference(self):
+        """Reduced-precision window buffers keep 3Y outlook statistics intact."""
+        rng = np.random.default_rng(11)
+        closes = np.round(100 * np.cumprod(1 + rng.normal(0.0005, 0.02, 756)), 2)
+        reference = closes[30:] / closes[:-30] - 1.0
+
+        hit_rate, std, _ = _outlook_stats(np.log(closes), 30, recent_days=90)
+
+        assert hit_rate == float(np.mean(reference > 0))
+        assert std == pytest.approx(float(np.std(reference)), rel=1e-5)
+
+    def test_float32_window_returns_keep_tiny_moves_on_high_prices(self):
+        """Log differences are taken in float64, so a cent on $600k is still a gain."""
+        closes = np.array([600_000.0, 600_001.0, 600_001.01])
+
+        hit_rate, _, _ = _outlook_stats(np.log(closes), 1, recent_days=1)
+
+        assert hit_rate == 1.0
+
+    def test_outlook_stats_match_separate_computations(self):
+        """The fused pass matches rolling returns, summary, and recent return helpers."""
+        closes = 100 * np.cumprod(1 + np.random.default_rng(3).normal(0, 0.02, 200))
+        returns = _rolling_returns(np.log(closes), 20)
+
+        hit_rate, std, recent = _outlook_stats(np.log(closes), 20, recent_days=90)
+
+        assert (hit_rate, std) == pytest.approx(_summarize_returns(returns))
+        assert recent == pytest.approx(_recent_return(np.log(closes), 90))
+
+
 class TestKeyDriversGeneration:
     """Tests for key drivers generation."""
 
-    @pytest.fixture
-    def engine(self):
-        """Create OutlookEngine instance."""
-        return OutlookEngine()
-
-    def test_key_drivers_always_present(self, engine):
+    @pytest.mark.parametrize("sentiment", list(SentimentSummary))
+    @pytest.mark.parametrize("volatility_label", ["low", "moderate", "high"])
+    def test_key_drivers_always_present(self, engine, volatility_label, sentiment):
         """Key drivers should always have at least 3 entries."""
-        drivers = engine._build_key_drivers("low", SentimentSummary.POSITIVE)
+        drivers = engine._build_key_drivers(volatility_label, sentiment)
         assert len(drivers) >= 3
 
     def test_key_drivers_include_volatility_context(self, engine):
@@ -235,21 +345,30 @@ class TestKeyDriversGeneration:
         # Should have different content based on sentiment
         assert positive_drivers != cautious_drivers
 
+    def test_key_drivers_are_a_fresh_list_per_call(self, engine):
+        """Mutating one outlook's drivers must not leak into the shared table."""
+        drivers = engine._build_key_drivers("high", SentimentSummary.CAUTIOUS)
+        drivers.append("caller-specific note")
+
+        assert engine._build_key_drivers("high", SentimentSummary.CAUTIOUS) == drivers[:-1]
+        assert len(drivers) == 6
+
+
+@pytest.fixture(scope="module")
+def mock_engine():
+    """One OutlookEngine over mock data, shared by the mock-generation tests."""
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(settings, "USE_MOCK_DATA", True)
+        yield OutlookEngine()
+
 
 class TestMockOutlookGeneration:
     """Integration tests for mock outlook generation."""
 
-    @pytest.fixture
-    def engine(self):
-        """Create OutlookEngine with mock mode."""
-        engine = OutlookEngine()
-        engine._use_mock = True
-        return engine
-
     @pytest.mark.asyncio
-    async def test_mock_outlook_has_all_fields(self, engine):
+    async def test_mock_outlook_has_all_fields(self, mock_engine):
         """Mock outlook should have all required fields."""
-        outlook = await engine.compute_outlook("AAPL", 30)
+        outlook = await mock_engine.compute_outlook("AAPL", 30)
 
         assert outlook.ticker == "AAPL"
         assert outlook.timeframe_days == 30
@@ -260,20 +379,284 @@ class TestMockOutlookGeneration:
         assert outlook.generated_at is not None
 
     @pytest.mark.asyncio
-    async def test_mock_outlook_consistency(self, engine):
+    async def test_mock_outlook_consistency(self, mock_engine):
         """Known tickers should produce consistent values."""
         # Known ticker should have specific sentiment
-        outlook1 = await engine.compute_outlook("AAPL", 30)
-        outlook2 = await engine.compute_outlook("AAPL", 30)
+        outlook1 = await mock_engine.compute_outlook("AAPL", 30)
+        outlook2 = await mock_engine.compute_outlook("AAPL", 30)
 
         # Hit rate should be similar (within random variation)
         assert abs(outlook1.historical_hit_rate - outlook2.historical_hit_rate) < 0.10
 
     @pytest.mark.asyncio
-    async def test_mock_outlook_unknown_ticker(self, engine):
+    async def test_mock_outlook_unknown_ticker(self, mock_engine):
         """Unknown tickers should still generate valid outlook."""
-        outlook = await engine.compute_outlook("UNKNOWN123", 30)
+        outlook = await mock_engine.compute_outlook("UNKNOWN123", 30)
 
         # Should still have all required fields
         assert outlook.ticker == "UNKNOWN123"
         assert len(outlook.key_drivers) >= 3
+
+
+class _StubHistoryProvider:
+    """Serves deterministic histories of different lengths per symbol."""
+
+    def __init__(self, closes_by_symbol: dict[str, list[float]]) -> None:
+        self._closes_by_symbol = closes_by_symbol
+
+    async def get_history(self, symbol: str, period: str, use_cache: bool = True) -> HistoryData:
+        start = datetime(2022, 1, 1, tzinfo=UTC)
+        points = [
+            HistoryPoint(
+                date=start + timedelta(days=i),
+                open=close,
+                high=close,
+                low=close,
+                close=close,
+                volume=1_000,
+            )
+            for i, close in enumerate(self._closes_by_symbol[symbol])
+        ]
+        return HistoryData.from_points(
+            ticker=symbol,
+            period=period,
+            interval="1d",
+            points=points,
+            timestamp=start,
+        )
+
+    async def get_histories(
+        self, symbols: list[str], period: str, use_cache: bool = True
+    ) -> dict[str, HistoryData]:
+        return {symbol: await self.get_history(symbol, period, use_cache) for symbol in symbols}
+
+
+class TestBatchOutlookGeneration:
+    """Tests for the multi-ticker outlook path."""
+
+    @pytest.mark.asyncio
+    async def test_batch_matches_single_ticker_outlooks(self, monkeypatch):
+        """Batch results match per-ticker results on the same cached history."""
+        # Miss on outlook reads so both paths compute instead of serving each other
+        monkeypatch.setattr(cache, "get_outlook", lambda symbol, timeframe_days: None)
+        engine = OutlookEngine()
+        symbols = ["AAPL", "nvda", "SPY"]
+
+        batch = await engine.compute_outlooks(symbols, 30)
+        singles = [await engine.compute_outlook(symbol, 30) for symbol in symbols]
+
+        assert [outlook.ticker for outlook in batch] == ["AAPL", "NVDA", "SPY"]
+        assert len({outlook.generated_at for outlook in batch}) == 1
+        for batched, single in zip(batch, singles):
+            assert batched.historical_hit_rate == single.historical_hit_rate
+            assert batched.volatility_band == pytest.approx(single.volatility_band)
+            assert batched.sentiment_summary == single.sentiment_summary
+            assert batched.key_drivers == single.key_drivers
+
+    @pytest.mark.asyncio
+    async def test_batch_handles_unequal_history_lengths(self, monkeypatch):
+        """Shorter histories are padded without affecting their statistics."""
+        monkeypatch.setattr(cache, "get_outlook", lambda symbol, timeframe_days: None)
+        rng = np.random.default_rng(7)
+        engine = OutlookEngine()
+        engine._history_provider = _StubHistoryProvider(
+            {
+                "LONG": list(100 * np.cumprod(1 + rng.normal(0, 0.02, 400))),
+                "SHORT": list(50 * np.cumprod(1 + rng.normal(0, 0.03, 120))),
+            }
+        )
+
+        batch = await engine.compute_outlooks(["LONG", "SHORT"], 20)
+
+        for batched in batch:
+            single = await engine.compute_outlook(batched.ticker, 20)
+            assert batched.historical_hit_rate == single.historical_hit_rate
+            assert batched.volatility_band == pytest.approx(single.volatility_band)
+            assert batched.sentiment_summary == single.sentiment_summary
+
+    @pytest.mark.asyncio
+    async def test_batch_empty_symbols(self):
+        """An empty watchlist returns no outlooks."""
+        assert await OutlookEngine().compute_outlooks([], 30) == []
+
+
+def test_outlook_default_generated_at_is_utc_aware():
+    """Outlooks built without an explicit timestamp default to an aware UTC time."""
+    outlook = Outlook(
+        ticker="AAPL",
+        timeframe_days=30,
+        sentiment_summary=SentimentSummary.MIXED,
+        key_drivers=["Sector trends"],
+        volatility_band=0.05,
+        historical_hit_rate=0.5,
+    )
+
+    assert outlook.generated_at.tzinfo is UTC
+
+
+class TestOutlookCaching:
+    """Tests for outlook memoization keyed on history version."""
+
+    @pytest.mark.asyncio
+    async def test_repeat_request_reuses_outlook(self):
+        """Same symbol, timeframe, and history return the cached outlook."""
+        engine = OutlookEngine()
+        engine._history_provider = _StubHistoryProvider({"CACHED": [100.0 + i for i in range(60)]})
+
+        first = await engine.compute_outlook("CACHED", 20)
+        second = await engine.compute_outlook("CACHED", 20)
+
+        assert second is first
+
+    @pytest.mark.asyncio
+    async def test_new_history_invalidates_cached_outlook(self):
+        """A newer history point forces recomputation."""
+        engine = OutlookEngine()
+        engine._history_provider = _StubHistoryProvider({"ROLLED": [100.0 + i for i in range(60)]})
+        first = await engine.compute_outlook("ROLLED", 20)
+
+        engine._history_provider = _StubHistoryProvider({"ROLLED": [100.0 + i for i in range(61)]})
+        second = await engine.compute_outlook("ROLLED", 20)
+
+        assert second is not first
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_one_computation(self):
+        """Identical in-flight requests fetch history once and get the same outlook."""
+        fetches = 0
+
+        class _SlowProvider(_StubHistoryProvider):
+            async def get_history(self, symbol, period, use_cache=True):
+                nonlocal fetches
+                fetches += 1
+                await asyncio.sleep(0.01)
+                return await super().get_history(symbol, period, use_cache)
+
+        engine = OutlookEngine()
+        engine._history_provider = _SlowProvider({"BURST": [100.0 + i for i in range(60)]})
+
+        results = await asyncio.gather(*(engine.compute_outlook("burst", 20) for _ in range(5)))
+
+        assert fetches == 1
+        assert all(result is results[0] for result in results)
+        assert len(engine._pending_outlooks) == 0
+
+    @pytest.mark.asyncio
+    async def test_batch_and_single_paths_share_cached_outlooks(self):
+        """Batch outlooks warm the per-symbol cache and reuse what is already there."""
+        engine = OutlookEngine()
+        engine._history_provider = _StubHistoryProvider(
+            {
+                "SHARED": [100.0 + i for i in range(60)],
+                "BATCHED": [200.0 - i for i in range(60)],
+            }
+        )
+
+        single = await engine.compute_outlook("SHARED", 20)
+        batch = await engine.compute_outlooks(["shared", "BATCHED", "SHARED"], 20)
+
+        assert batch[0] is single
+        assert batch[2] is single
+        assert await engine.compute_outlook("BATCHED", 20) is batch[1]
+        assert all(
+            again is first
+            for again, first in zip(await engine.compute_outlooks(["SHARED", "BATCHED"], 20), batch)
+        )
+
+
+class TestComposerDailyRange:
+    """Tests for the composer's median daily range."""
+
+    @staticmethod
+    def _history(points: list[PricePoint]) -> PriceHistory:
+        return PriceHistory(
+            ticker="TEST",
+            points=points,
+            current_price=100.0,
+            change=0.0,
+            change_percent=0.0,
+            timestamp=datetime(2024, 1, 2, tzinfo=UTC),
+            source="mock",
+        )
+
+    def test_median_skips_non_positive_closes(self):
+        """Bars with a zero close are excluded; even counts average the middle pair."""
+        date = datetime(2024, 1, 2, tzinfo=UTC)
+        history = self._history(
+            [
+                PricePoint(date=date, close=100.0, high=102.0, low=99.0),
+                PricePoint(date=date, close=50.0, high=51.0, low=49.0),
+                PricePoint(date=date, close=0.0, high=5.0, low=0.0),
+            ]
+        )
+
+        result = OutlookComposer()._median_daily_range(history)
+
+        assert result == pytest.approx((0.03 + 0.04) / 2)
+        assert history.closes is history.closes
+
+    def test_empty_history_has_zero_range(self):
+        """No usable bars yields a zero range."""
+        assert OutlookComposer()._median_daily_range(self._history([])) == 0.0
+
+
+@pytest.mark.asyncio
+async def test_compose_outlook_fetches_sources_concurrently(monkeypatch):
+    """Snapshot, history, catalysts, and news are all in flight at once."""
+    composer = OutlookComposer()
+    in_flight = 0
+    peak = 0
+
+    def track(method):
+        async def wrapper(*args, **kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0)
+            try:
+                return await method(*args, **kwargs)
+            finally:
+                in_flight -= 1
+
+        return wrapper
+
+    for service, name in [
+        (composer._ticker_service, "get_snapshot"),
+        (composer._ticker_service, "get_history"),
+        (composer._catalyst_service, "get_catalysts"),
+        (composer._news_service, "get_news"),
+    ]:
+        monkeypatch.setattr(service, name, track(getattr(service, name)))
+
+    response = await composer.compose_outlook("AAPL")
+
+    assert peak == 4
+    assert response.big_picture
+
+
+def test_scan_catalysts_tags_all_matches_but_formats_six():
+    """Tags cover every matching event; only the first six are formatted."""
+    start = datetime(2024, 1, 2, tzinfo=UTC)
+    events = [
+        CatalystEvent(
+            type=CatalystType.EARNINGS,
+            ticker="MSFT" if i % 2 else None,
+            date=start + timedelta(days=i),
+            confidence=ConfidenceLevel.HIGH,
+        )
+        for i in range(20)
+    ]
+    events += [
+        CatalystEvent(
+            type=event_type,
+            ticker=None,
+            date=start + timedelta(days=30),
+            confidence=ConfidenceLevel.HIGH,
+        )
+        for event_type in (CatalystType.CPI, CatalystType.FED_MEETING, CatalystType.PPI)
+    ]
+
+    tags, formatted = OutlookComposer()._scan_catalysts("AAPL", events)
+
+    assert tags == ["earnings", "fed week", "high inflation"]
+    assert formatted == [event.json_payload for event in events if event.ticker is None][:6]
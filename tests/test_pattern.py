@@ -2,27 +2,21 @@
 Tests for behavior pattern endpoint.
 """
 
-import pytest
-from httpx import ASGITransport, AsyncClient
-
-from app.main import app
+import re
 
+import pytest
 
-@pytest.fixture
-def async_client():
-    """Create async test client."""
-    transport = ASGITransport(app=app)
-    return AsyncClient(transport=transport, base_url="http://test")
+# Prediction/advice language as plain substrings, matched in one scan of the notes
+_FORBIDDEN_WORDS = re.compile(r"will|predict|guarantee|should buy|should sell")
 
 
-@pytest.mark.anyio
+@pytest.mark.asyncio
 async def test_pattern_basic(async_client):
     """Test basic pattern generation."""
-    async with async_client as client:
-        response = await client.post(
-            "/pattern",
-            json={"symbol": "AAPL", "context": ["earnings", "fed week"]},
-        )
+    response = await async_client.post(
+        "/pattern",
+        json={"symbol": "AAPL", "context": ["earnings", "fed week"]},
+    )
 
     assert response.status_code == 200
     data = response.json()
@@ -33,45 +27,41 @@ async def test_pattern_basic(async_client):
     assert "notes" in data
 
 
-@pytest.mark.anyio
+@pytest.mark.asyncio
 async def test_pattern_default_context(async_client):
     """Test pattern generation with no context supplied."""
-    async with async_client as client:
-        response = await client.post(
-            "/pattern",
-            json={"symbol": "SPY"},
-        )
+    response = await async_client.post(
+        "/pattern",
+        json={"symbol": "SPY"},
+    )
 
     assert response.status_code == 200
     data = response.json()
     assert data["sample_size"] >= 0
 
 
-@pytest.mark.anyio
+@pytest.mark.asyncio
 async def test_pattern_symbol_normalization(async_client):
     """Test that symbol is normalized to uppercase."""
-    async with async_client as client:
-        response = await client.post(
-            "/pattern",
-            json={"symbol": "aapl", "context": ["earnings"]},
-        )
+    response = await async_client.post(
+        "/pattern",
+        json={"symbol": "aapl", "context": ["earnings"]},
+    )
 
     assert response.status_code == 200
 
 
-@pytest.mark.anyio
+@pytest.mark.asyncio
 async def test_pattern_no_prediction_language(async_client):
     """Test that response doesn't contain prediction/advice language."""
-    async with async_client as client:
-        response = await client.post(
-            "/pattern",
-            json={"symbol": "AAPL", "context": ["earnings"]},
-        )
+    response = await async_client.post(
+        "/pattern",
+        json={"symbol": "AAPL", "context": ["earnings"]},
+    )
 
     assert response.status_code == 200
     data = response.json()
 
-    forbidden_words = ["will", "predict", "guarantee", "should buy", "should sell"]
     notes = data.get("notes", "").lower()
-    for word in forbidden_words:
-        assert word not in notes, f"Found forbidden word '{word}' in notes"
+    match = _FORBIDDEN_WORDS.search(notes)
+    assert match is None, f"Found forbidden word '{match.group()}' in notes"
@@ -5,9 +5,11 @@ Tests for PatternEngine core computations.
 from datetime import UTC, datetime
 
 import numpy as np
+import pytest
 
-from app.providers.history_provider import HistoryPoint
-from app.services.pattern_engine import PatternEngine
+from app.providers.history_provider import HistoryData, HistoryPoint
+from app.services import pattern_engine
+from app.services.pattern_engine import PatternEngine, _rolling_extreme, _to_arrays
 
 
 def _make_point(day: int, close: float, high: float, low: float) -> HistoryPoint:
@@ -21,6 +23,13 @@ def _make_point(day: int, close: float, high: float, low: float) -> HistoryPoint
     )
 
 
+def _arrays(points: list[HistoryPoint]) -> pattern_engine._HistoryArrays:
+    history = HistoryData.from_points(
+        "TEST", "5Y", "1wk", points, timestamp=datetime(2024, 1, 31, tzinfo=UTC)
+    )
+    return _to_arrays(history)
+
+
 def test_compute_window_metrics():
     engine = PatternEngine()
     points = [
@@ -31,7 +40,7 @@ def test_compute_window_metrics():
         _make_point(5, 95.0, 97.0, 90.0),
     ]
 
-    returns, ranges = engine._compute_window_metrics(points, window_size=3)
+    returns, ranges = engine._compute_window_metrics(_arrays(points), window_size=3)
 
     assert len(returns) == 3
     np.testing.assert_almost_equal(returns[0], 0.10, decimal=2)
@@ -42,10 +51,128 @@ def test_compute_window_metrics():
     np.testing.assert_almost_equal(ranges[1], 0.16, decimal=2)
 
 
-def test_matches_context_earnings_month():
+def test_compute_window_metrics_matches_per_window_reference():
+    engine = PatternEngine()
+    rng = np.random.default_rng(5)
+    closes = 100 * np.cumprod(1 + rng.normal(0, 0.02, 40))
+    closes[7] = 0.0
+    points = [
+        _make_point(1, float(close), float(close) * 1.01, float(close) * 0.99)
+        for close in closes
+    ]
+
+    returns, ranges = engine._compute_window_metrics(_arrays(points), window_size=5)
+
+    for idx in range(len(points) - 4):
+        window = points[idx : idx + 5]
+        start = window[0].close
+        if start == 0:
+            assert returns[idx] == 0.0
+            assert ranges[idx] == 0.0
+            continue
+        assert returns[idx] == pytest.approx((window[-1].close - start) / start)
+        assert ranges[idx] == pytest.approx(
+            (max(p.high for p in window) - min(p.low for p in window)) / start
+        )
+
+
+def test_build_pattern_summary_matches_reference():
+    engine = PatternEngine()
+    rng = np.random.default_rng(11)
+    closes = 100 * np.cumprod(1 + rng.normal(0, 0.03, 60))
+    points = [
+        _make_point(1, float(close), float(close) * 1.02, float(close) * 0.98)
+        for close in closes
+    ]
+    arrays = _arrays(points)
+
+    pattern = engine._build_pattern(arrays, [])
+    returns, ranges = engine._compute_window_metrics(arrays, window_size=5)
+
+    assert pattern.sample_size == len(returns)
+    assert pattern.win_rate == round(float(np.mean(returns > 0)), 2)
+    assert pattern.typical_range == round(float(np.median(ranges)), 4)
+    assert pattern.max_move == round(float(np.max(np.abs(returns))), 4)
+
+
+@pytest.mark.parametrize("window", [1, 2, 4, 5, 7, 8, 21, 63, 200])
+def test_rolling_extreme_matches_sliding_window_reference(window):
+    values = np.random.default_rng(window).normal(100, 5, 200)
+    windows = np.lib.stride_tricks.sliding_window_view(values, window)
+
+    np.testing.assert_array_equal(
+        _rolling_extreme(values, window, np.maximum), windows.max(axis=1)
+    )
+    np.testing.assert_array_equal(
+        _rolling_extreme(values, window, np.minimum), windows.min(axis=1)
+    )
+
+
+def test_select_window_indices_matches_all_context_tags():
+    engine = PatternEngine()
+    points = [
+        HistoryPoint(
+            date=datetime(year, month, 15, tzinfo=UTC),
+            open=100.0,
+            high=100.0,
+            low=100.0,
+            close=100.0,
+            volume=1_000_000,
+        )
+        for year, month in [(2024, 1), (2024, 2), (2022, 3), (2022, 4), (2024, 5)]
+    ]
+
+    arrays = _arrays(points)
+
+    assert engine._select_window_indices(arrays, 1, ["earnings"]) == [0, 3]
+    assert engine._select_window_indices(arrays, 1, ["Earnings", "fed week"]) == [0]
+    assert engine._select_window_indices(arrays, 1, ["high inflation", "fomc"]) == [2]
+    assert engine._select_window_indices(arrays, 2, ["unknown tag"]) == [0, 1, 2, 3]
+
+
+def test_normalize_context_is_memoized_and_returns_fresh_lists():
+    engine = PatternEngine()
+    pattern_engine._normalize_context_tags.cache_clear()
+
+    first = engine._normalize_context([" FOMC", "cpi", "", "Earnings Week", "custom"])
+    first.append("mutated")
+    second = engine._normalize_context([" FOMC", "cpi", "", "Earnings Week", "custom"])
+
+    assert second == ["custom", "earnings", "fed week", "high inflation"]
+    assert pattern_engine._normalize_context_tags.cache_info().hits == 1
+
+
+def test_normalize_context_resolves_free_text_tags():
+    engine = PatternEngine()
+
+    assert engine._normalize_context(
+        ["Q3 earnings season", "ahead of the FOMC decision", "hot CPI print", "defensive"]
+    ) == ["defensive", "earnings", "fed week", "high inflation"]
+    # Synonyms only match whole words
+    assert engine._normalize_context(["federal holiday"]) == ["federal holiday"]
+
+
+def test_history_arrays_cached_per_history(monkeypatch):
     engine = PatternEngine()
-    date = datetime(2024, 1, 15, tzinfo=UTC)
+    monkeypatch.setattr(pattern_engine, "_ARRAY_CACHE_SIZE", 2)
+    histories = [
+        HistoryData.from_points(
+            ticker=symbol,
+            period="5Y",
+            interval="1wk",
+            points=[_make_point(day, 100.0 + day, 101.0 + day, 99.0 + day) for day in (1, 2)],
+            timestamp=datetime(2024, 1, 3, tzinfo=UTC),
+        )
+        for symbol in ("AAA", "BBB", "CCC")
+    ]
+
+    first = engine._cached_arrays(histories[0])
+    assert engine._cached_arrays(histories[0]) is first
+    assert first.closes is histories[0].closes
+    np.testing.assert_array_equal(first.closes, [101.0, 102.0])
+    assert first.months.dtype == np.int8 and first.months.tolist() == [1, 1]
+    assert first.years.dtype == np.int16 and first.years.tolist() == [2024, 2024]
 
-    assert engine._matches_context(date, ["earnings"])
-    assert engine._matches_context(date, ["earnings", "fed week"])
-    assert not engine._matches_context(date, ["high inflation"])
+    engine._cached_arrays(histories[1])
+    engine._cached_arrays(histories[2])
+    assert [key[0] for key in engine._array_cache] == ["BBB", "CCC"]
@@ -8,8 +8,10 @@ Verifies:
 - Caching works correctly
 """
 
-from datetime import datetime
+import asyncio
+from datetime import UTC, datetime
 
+import numpy as np
 import pytest
 
 from app.providers import (
@@ -19,6 +21,7 @@ from app.providers import (
     NewsProvider,
     PriceData,
     PriceProvider,
+    SingleFlight,
     cache,
 )
 
@@ -26,8 +29,10 @@ from app.providers import (
 class TestPriceProvider:
     """Tests for the price provider."""
 
-    @pytest.fixture
-    def provider(self):
+    @pytest.fixture(scope="class")
+    @classmethod
+    def provider(cls):
+        """One provider for the class; its state lives in the shared cache."""
         return PriceProvider()
 
     @pytest.mark.asyncio
@@ -63,6 +68,129 @@ class TestPriceProvider:
         assert result.week_52_high > 0
         assert result.week_52_low > 0
 
+    @pytest.mark.asyncio
+    async def test_seeded_mock_prices_are_reproducible(self):
+        """Providers seeded alike generate identical mock quotes."""
+        first = await PriceProvider(seed=42).get_price("ZZZZ", use_cache=False)
+        second = await PriceProvider(seed=42).get_price("ZZZZ", use_cache=False)
+
+        assert (first.current_price, first.volume, first.market_cap) == (
+            second.current_price,
+            second.volume,
+            second.market_cap,
+        )
+
+    def test_batched_yfinance_quotes_from_daily_bars(self, provider, monkeypatch):
+        """Batched quotes are derived from each symbol's daily bars."""
+        import pandas as pd
+
+        from app.providers import price_provider
+
+        bars = {
+            "AAA": {"Open": [9.0, 10.0], "High": [12.0, 11.0], "Low": [8.0, 9.5],
+                    "Close": [10.0, 10.5], "Volume": [100, 200]},
+            "BBB": {"Open": [50.0, 49.0], "High": [51.0, 50.5], "Low": [48.0, 45.0],
+                    "Close": [50.0, 49.0], "Volume": [300, 400]},
+        }
+        calls = []
+
+        def fake_download(symbols, **kwargs):
+            calls.append(list(symbols))
+            return pd.concat({symbol: pd.DataFrame(bars[symbol]) for symbol in symbols}, axis=1)
+
+        monkeypatch.setattr(price_provider, "_QUOTE_BATCH_SIZE", 1)
+        monkeypatch.setattr(price_provider.yf, "download", fake_download)
+
+        prices = provider._get_yfinance_prices(["AAA", "BBB"])
+
+        assert calls == [["AAA"], ["BBB"]]
+        aaa = prices["AAA"]
+        assert (aaa.current_price, aaa.previous_close, aaa.change_percent) == (10.5, 10.0, 5.0)
+        assert (aaa.day_high, aaa.day_low, aaa.volume) == (11.0, 9.5, 200)
+        assert (aaa.week_52_high, aaa.week_52_low, aaa.market_cap) == (12.0, 8.0, None)
+        assert prices["BBB"].week_52_low == 45.0
+
+    def test_flat_single_symbol_quote_with_nan_volume(self, provider, monkeypatch):
+        """A flat one-symbol download is a known symbol; a NaN latest volume reads as 0."""
+        import pandas as pd
+
+        from app.providers import price_provider
+
+        bars = pd.DataFrame(
+            {"Open": [9.0, 10.0], "High": [12.0, 11.0], "Low": [8.0, 9.5],
+             "Close": [10.0, 10.5], "Volume": [100.0, float("nan")]}
+        )
+        monkeypatch.setattr(price_provider.yf, "download", lambda symbols, **kwargs: bars)
+        cache.clear()
+
+        prices = provider._get_yfinance_prices(["AAA"])
+
+        assert (prices["AAA"].current_price, prices["AAA"].volume) == (10.5, 0)
+        assert not cache.is_unknown_symbol("AAA")
+
+    def test_yfinance_price_reads_fast_info(self, provider, monkeypatch):
+        """Live quotes map fast_info fields and tolerate missing values."""
+        from types import SimpleNamespace
+
+        from app.core.errors import TickerNotFoundError
+        from app.providers import price_provider
+
+        class _NoShares(SimpleNamespace):
+            @property
+            def market_cap(self):
+                raise KeyError("shares")
+
+        quotes = {
+            "AAA": SimpleNamespace(
+                last_price=110.0, previous_close=100.0, day_high=111.0, day_low=float("nan"),
+                year_high=150.0, year_low=80.0, last_volume=1234.0, market_cap=2.5e12,
+            ),
+            "FUND": _NoShares(
+                last_price=50.0, previous_close=None, day_high=None, day_low=None,
+                year_high=None, year_low=None, last_volume=None,
+            ),
+            "GONE": SimpleNamespace(last_price=float("nan")),
+        }
+        monkeypatch.setattr(
+            price_provider.yf, "Ticker", lambda symbol: SimpleNamespace(fast_info=quotes[symbol])
+        )
+        cache.clear()
+
+        aaa = provider._get_yfinance_price("AAA")
+        assert (aaa.current_price, aaa.change, aaa.change_percent) == (110.0, 10.0, 10.0)
+        assert (aaa.day_high, aaa.day_low, aaa.week_52_low) == (111.0, 110.0, 80.0)
+        assert (aaa.volume, aaa.market_cap) == (1234, 2_500_000_000_000)
+
+        fund = provider._get_yfinance_price("FUND")
+        assert (fund.previous_close, fund.week_52_high, fund.volume) == (50.0, 50.0, 0)
+        assert fund.market_cap is None
+
+        with pytest.raises(TickerNotFoundError):
+            provider._get_yfinance_price("GONE")
+        assert cache.is_unknown_symbol("GONE")
+
+    @pytest.mark.asyncio
+    async def test_live_fetch_runs_off_the_event_loop_thread(self, provider, monkeypatch):
+        """Blocking yfinance calls run on the upstream pool, not the loop thread."""
+        import threading
+
+        from app.providers import price_provider
+
+        threads: list[str] = []
+
+        def fake_fetch(symbol: str) -> PriceData:
+            threads.append(threading.current_thread().name)
+            return provider._get_mock_price(symbol)
+
+        monkeypatch.setattr(price_provider.settings, "USE_MOCK_DATA", False)
+        monkeypatch.setattr(provider, "_get_yfinance_price", fake_fetch)
+        cache.clear()
+
+        await provider.get_price("AAPL", use_cache=False)
+
+        assert threads and threads[0].startswith("yf")
+        assert threads[0] != threading.current_thread().name
+
     @pytest.mark.asyncio
     async def test_price_data_to_dict(self, provider):
         """Price data can be serialized to dict."""
@@ -84,8 +212,10 @@ class TestPriceProvider:
 class TestHistoryProvider:
     """Tests for the history provider."""
 
-    @pytest.fixture
-    def provider(self):
+    @pytest.fixture(scope="class")
+    @classmethod
+    def provider(cls):
+        """One provider for the class; its state lives in the shared cache."""
         return HistoryProvider()
 
     @pytest.mark.asyncio
@@ -144,13 +274,216 @@ class TestHistoryProvider:
         closes = result.closes
         assert len(closes) == len(result.points)
         assert closes[0] == result.points[0].close
+        assert result.closes is closes
+
+    @pytest.mark.asyncio
+    async def test_history_columns_are_read_only(self, provider):
+        """Cached history columns are shared, so writes into them are rejected."""
+        result = await provider.get_history("AAPL", "1M")
+
+        for column in (result.closes, result.highs, result.volumes, result.log_closes):
+            with pytest.raises(ValueError, match="read-only"):
+                column[0] = 0
+
+    def test_yfinance_history_rows_are_converted_per_column(self, provider, monkeypatch):
+        """yfinance bars become rounded UTC HistoryPoints in index order."""
+        import pandas as pd
+
+        from app.providers import history_provider
+
+        frame = pd.DataFrame(
+            {
+                "Open": [10.004, 11.0],
+                "High": [10.506, 11.5],
+                "Low": [9.994, 10.5],
+                "Close": [10.25, 11.257],
+                "Volume": [1_000.0, 2_000.0],
+            },
+            index=pd.DatetimeIndex(["2024-01-02", "2024-01-03"]).tz_localize("America/New_York"),
+        )
+
+        class _FakeTicker:
+            def __init__(self, symbol):
+                pass
+
+            def history(self, period, interval):
+                return frame
+
+        monkeypatch.setattr(history_provider.yf, "Ticker", _FakeTicker)
+
+        data = provider._get_yfinance_history("FAKE", "1M")
+
+        first, second = data.points
+        assert first.date == datetime(2024, 1, 2, 5, tzinfo=UTC)
+        assert (first.open, first.high, first.low, first.close) == (10.0, 10.51, 9.99, 10.25)
+        assert (second.close, second.volume) == (11.26, 2_000)
+        assert isinstance(second.volume, int)
+
+    def test_naive_history_index_is_taken_as_utc(self):
+        """A tz-naive yfinance index is localized to UTC rather than converted."""
+        import pandas as pd
+
+        from app.providers.history_provider import _utc_dates
+
+        index = pd.DatetimeIndex(["2024-01-02 09:30", "2024-01-03 09:30"])
+
+        dates = _utc_dates(index)
+
+        assert dates == [
+            datetime(2024, 1, 2, 9, 30, tzinfo=UTC),
+            datetime(2024, 1, 3, 9, 30, tzinfo=UTC),
+        ]
+        assert all(type(date) is datetime for date in dates)
+
+    def test_batched_yfinance_histories_drop_unaligned_dates(self, provider, monkeypatch):
+        """Each symbol keeps only the dates it traded in the aligned download."""
+        import pandas as pd
+
+        from app.providers import history_provider
+
+        index = pd.DatetimeIndex(["2024-01-02", "2024-01-03"], tz="UTC")
+        frame = pd.concat(
+            {
+                "AAA": pd.DataFrame(
+                    {"Open": [1.0, 2.0], "High": [1.0, 2.0], "Low": [1.0, 2.0],
+                     "Close": [1.0, 2.0], "Volume": [10, 20]},
+                    index=index,
+                ),
+                "BBB": pd.DataFrame(
+                    {"Open": [None, 5.0], "High": [None, 5.0], "Low": [None, 5.0],
+                     "Close": [None, 5.0], "Volume": [None, 50]},
+                    index=index,
+                ),
+            },
+            axis=1,
+        )
+        monkeypatch.setattr(history_provider.yf, "download", lambda symbols, **kwargs: frame)
+
+        histories, unknown = provider._get_yfinance_histories(["AAA", "BBB"], "1M")
+
+        assert [p.close for p in histories["AAA"].points] == [1.0, 2.0]
+        assert [(p.close, p.volume) for p in histories["BBB"].points] == [(5.0, 50)]
+        assert unknown == []
+
+    def test_batched_yfinance_history_accepts_flat_single_symbol_frame(
+        self, provider, monkeypatch
+    ):
+        """Older yfinance returns flat OHLCV columns for one symbol; it is not unknown."""
+        import pandas as pd
+
+        from app.providers import history_provider
+
+        frame = pd.DataFrame(
+            {"Open": [1.0, 2.0], "High": [1.0, 2.0], "Low": [1.0, 2.0],
+             "Close": [1.0, 2.0], "Volume": [10, 20]},
+            index=pd.DatetimeIndex(["2024-01-02", "2024-01-03"], tz="UTC"),
+        )
+        monkeypatch.setattr(history_provider.yf, "download", lambda symbols, **kwargs: frame)
+        cache.clear()
+
+        histories, unknown = provider._get_yfinance_histories(["AAA"], "1M")
+
+        assert [p.close for p in histories["AAA"].points] == [1.0, 2.0]
+        assert unknown == []
+        assert not cache.is_unknown_symbol("AAA")
+
+    @pytest.mark.asyncio
+    async def test_get_histories_caches_valid_symbols_before_raising_unknown(
+        self, provider, monkeypatch
+    ):
+        """An unknown symbol in a batch still leaves every valid symbol cached."""
+        import pandas as pd
+
+        from app.core.errors import TickerNotFoundError
+        from app.providers import history_provider
+
+        index = pd.DatetimeIndex(["2024-01-02", "2024-01-03"], tz="UTC")
+        valid = {"Open": [1.0, 2.0], "High": [1.0, 2.0], "Low": [1.0, 2.0],
+                 "Close": [1.0, 2.0], "Volume": [10, 20]}
+        empty = dict.fromkeys(valid, [None, None])
+        frame = pd.concat(
+            {
+                "AAA": pd.DataFrame(valid, index=index),
+                "BBB": pd.DataFrame(empty, index=index),
+                "CCC": pd.DataFrame(valid, index=index),
+            },
+            axis=1,
+        )
+        monkeypatch.setattr(history_provider.settings, "USE_MOCK_DATA", False)
+        monkeypatch.setattr(history_provider.yf, "download", lambda symbols, **kwargs: frame)
+        cache.clear()
+
+        with pytest.raises(TickerNotFoundError):
+            await provider.get_histories(["AAA", "BBB", "CCC"], "1M")
+
+        assert [p.close for p in cache.get_history("AAA", "1M").points] == [1.0, 2.0]
+        assert [p.close for p in cache.get_history("CCC", "1M").points] == [1.0, 2.0]
+        assert cache.is_unknown_symbol("BBB")
+
+    @pytest.mark.asyncio
+    async def test_get_histories_reuses_cache_and_collapses_duplicates(self, provider):
+        """Batch history returns one entry per symbol and fills the shared cache."""
+        cache.clear()
+        cached = await provider.get_history("AAA", "1M")
+
+        histories = await provider.get_histories(["aaa", "BBB", "AAA"], "1M")
+
+        assert list(histories) == ["AAA", "BBB"]
+        assert histories["AAA"] is cached
+        assert cache.get_history("BBB", "1M") is histories["BBB"]
+
+    def test_seeded_mock_history_is_reproducible(self):
+        """Providers seeded alike generate identical mock bars within OHLC bounds."""
+        first = HistoryProvider(seed=3)._get_mock_history("ZZZZ", "1Y")
+        second = HistoryProvider(seed=3)._get_mock_history("ZZZZ", "1Y")
+
+        def bars(data):
+            return [(p.open, p.high, p.low, p.close, p.volume) for p in data.points]
+
+        assert len(first.points) == 252
+        assert bars(first) == bars(second)
+        assert all(p.low <= p.close <= p.high for p in first.points)
+        assert all(isinstance(p.close, float) and isinstance(p.volume, int) for p in first.points)
+
+    def test_history_points_are_built_from_columns(self):
+        """Points are a read-only view over the OHLCV columns, in any access pattern."""
+        data = HistoryProvider(seed=5)._get_mock_history("ZZZZ", "1M")
+        points = data.points
+
+        assert len(points) == len(data.dates) == len(data.closes)
+        assert list(points) == [points[i] for i in range(len(points))]
+        assert points[1:3] == [points[1], points[2]]
+        last = points[-1]
+        assert (last.date, last.close, last.volume) == (
+            data.dates[-1], data.closes[-1], data.volumes[-1]
+        )
+        assert type(last.close) is float and type(last.volume) is int
+
+    def test_history_to_dict_rows_match_points(self):
+        """Columnar serialization keeps the per-point row shape of HistoryPoint.to_dict."""
+        data = HistoryProvider(seed=9)._get_mock_history("ZZZZ", "1M")
+
+        payload = data.to_dict()
+
+        assert payload["points"] == [p.to_dict() for p in data.points]
+        assert payload["endPrice"] == data.points[-1].close
+
+    @pytest.mark.asyncio
+    async def test_history_log_closes_computed_once(self, provider):
+        """Log closes are memoized on the history object."""
+        result = await provider.get_history("AAPL", "3Y")
+
+        assert result.log_closes is result.log_closes
+        np.testing.assert_allclose(np.exp(result.log_closes), result.closes)
 
 
 class TestNewsProvider:
     """Tests for the news provider."""
 
-    @pytest.fixture
-    def provider(self):
+    @pytest.fixture(scope="class")
+    @classmethod
+    def provider(cls):
+        """One provider for the class; its state lives in the shared cache."""
         return NewsProvider()
 
     @pytest.mark.asyncio
@@ -189,12 +522,26 @@ class TestNewsProvider:
         assert result.ticker is None
         assert len(result.items) > 0
 
+    @pytest.mark.asyncio
+    async def test_seeded_mock_news_is_reproducible(self):
+        """Providers seeded alike generate identical mock items."""
+        first = await NewsProvider(seed=7).get_news("ZZZZ", use_cache=False)
+        second = await NewsProvider(seed=7).get_news("ZZZZ", use_cache=False)
+
+        def shape(data):
+            return [(item.source, data.timestamp - item.published_at) for item in data.items]
 
+        assert shape(first) == shape(second)
+
+
+# Clears and inspects the process-wide cache, so the class stays on one worker
+@pytest.mark.xdist_group("cache")
 class TestCache:
     """Tests for the caching layer."""
 
-    def setup_method(self):
-        """Clear cache before each test."""
+    @pytest.fixture(autouse=True)
+    def _clear_cache(self):
+        """Start each cache test empty; other test classes keep whatever is cached."""
         cache.clear()
 
     def test_cache_set_and_get(self):
@@ -237,6 +584,110 @@ class TestCache:
         assert stats["hits"] >= 1
         assert stats["misses"] >= 2
 
+    def test_intraday_history_expires_sooner(self):
+        """Intraday bars get the short history TTL; daily bars the long one."""
+        cache.set_history("AAPL", "1D", {"points": []})
+        cache.set_history("AAPL", "1Y", {"points": []})
+
+        intraday = cache._cache["history:AAPL:1D"]
+        daily = cache._cache["history:AAPL:1Y"]
+        assert intraday.expires_at - intraday.created_at == pytest.approx(
+            cache.TTL_HISTORY_INTRADAY, abs=1
+        )
+        assert daily.expires_at - daily.created_at == pytest.approx(cache.TTL_HISTORY, abs=1)
+
+    def test_cache_evicts_oldest_writes_past_max_entries(self, monkeypatch):
+        """The cache stays bounded; a rewritten key counts as a fresh write."""
+        monkeypatch.setattr(cache, "MAX_ENTRIES", 3)
+        for key in ("a", "b", "c"):
+            cache.set(key, key, ttl=60)
+        cache.set("a", "a2", ttl=60)
+        cache.set("d", "d", ttl=60)
+
+        assert list(cache._cache) == ["c", "a", "d"]
+        assert cache.get("b") is None
+        assert cache.get("a") == "a2"
+
+    @pytest.mark.asyncio
+    async def test_unknown_symbols_short_circuit_provider_calls(self):
+        """A recorded unknown symbol raises without another upstream fetch."""
+        from app.core.errors import TickerNotFoundError
+
+        cache.set_unknown_symbol("bogus")
+
+        with pytest.raises(TickerNotFoundError):
+            await PriceProvider().get_price("BOGUS")
+        with pytest.raises(TickerNotFoundError):
+            await HistoryProvider().get_history("BOGUS", "1M")
+        with pytest.raises(TickerNotFoundError):
+            await PriceProvider().get_prices(["AAPL", "BOGUS"])
+
+        # Bypassing the cache also bypasses the negative entry
+        assert (await PriceProvider().get_price("BOGUS", use_cache=False)).ticker == "BOGUS"
+
+
+class TestSingleFlight:
+    """Tests for coalescing concurrent upstream fetches."""
+
+    def setup_method(self):
+        cache.clear()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_loads_share_one_call(self):
+        """Callers for the same key await one load; other keys load separately."""
+        flight = SingleFlight()
+        calls = []
+
+        async def load(key):
+            calls.append(key)
+            await asyncio.sleep(0.01)
+            return object()
+
+        results = await asyncio.gather(
+            *(flight.run("a", lambda: load("a")) for _ in range(4)),
+            flight.run("b", lambda: load("b")),
+        )
+
+        assert calls == ["a", "b"]
+        assert all(result is results[0] for result in results[:4])
+        assert results[4] is not results[0]
+        await asyncio.sleep(0)
+        assert len(flight) == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_shared_load(self):
+        """One waiter's cancellation leaves the load running for the others."""
+        flight = SingleFlight()
+
+        async def load():
+            await asyncio.sleep(0.01)
+            return "done"
+
+        first = asyncio.ensure_future(flight.run("k", load))
+        second = asyncio.ensure_future(flight.run("k", load))
+        await asyncio.sleep(0)
+        first.cancel()
+
+        assert await second == "done"
+
+    @pytest.mark.asyncio
+    async def test_history_misses_coalesce_into_one_fetch(self, monkeypatch):
+        """Concurrent cache misses for one history trigger a single fetch."""
+        provider = HistoryProvider()
+        fetches = []
+        original = provider._get_mock_history
+
+        def counting_fetch(symbol, period):
+            fetches.append((symbol, period))
+            return original(symbol, period)
+
+        monkeypatch.setattr(provider, "_get_mock_history", counting_fetch)
+
+        results = await asyncio.gather(*(provider.get_history("COAL", "1M") for _ in range(5)))
+
+        assert fetches == [("COAL", "1M")]
+        assert all(result is results[0] for result in results)
+
 
 class TestProviderIntegration:
     """Integration tests verifying providers work with services."""
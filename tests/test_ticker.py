@@ -2,24 +2,24 @@
 Tests for market/ticker endpoints.
 """
 
-import pytest
-from httpx import ASGITransport, AsyncClient
-
-from app.main import app
+import asyncio
+import json
+from datetime import UTC, datetime
 
+import pytest
+from fastapi.responses import JSONResponse
+from pydantic import ValidationError as PydanticValidationError
 
-@pytest.fixture
-def async_client():
-    """Create async test client."""
-    transport = ASGITransport(app=app)
-    return AsyncClient(transport=transport, base_url="http://test")
+from app.core.responses import FastJSONResponse
+from app.models.ticker import ChartTimeRange, PricePoint, VolatilityLevel
+from app.providers.history_provider import PERIOD_MAP
+from app.services.ticker_service import _PERIOD_MAP, _calculate_volatility, _format_market_cap
 
 
 @pytest.mark.asyncio
 async def test_get_ticker_snapshot(async_client):
     """Test getting a ticker snapshot."""
-    async with async_client as client:
-        response = await client.get("/ticker/AAPL/snapshot")
+    response = await async_client.get("/ticker/AAPL/snapshot")
 
     assert response.status_code == 200
     data = response.json()
@@ -38,8 +38,7 @@ async def test_get_ticker_snapshot_not_found(async_client):
     In mock mode, providers return synthetic data for any symbol.
     In live mode (USE_MOCK_DATA=false), this would return 404.
     """
-    async with async_client as client:
-        response = await client.get("/ticker/XYZNOTREAL123/snapshot")
+    response = await async_client.get("/ticker/XYZNOTREAL123/snapshot")
 
     # Mock mode returns 200 with generated data; live mode returns 404
     # Since tests run with USE_MOCK_DATA=true, expect 200
@@ -51,8 +50,7 @@ async def test_get_ticker_snapshot_not_found(async_client):
 @pytest.mark.asyncio
 async def test_get_ticker_history(async_client):
     """Test getting ticker price history."""
-    async with async_client as client:
-        response = await client.get("/ticker/NVDA/history?range=1M")
+    response = await async_client.get("/ticker/NVDA/history?range=1M")
 
     assert response.status_code == 200
     data = response.json()
@@ -67,17 +65,19 @@ async def test_get_ticker_history(async_client):
 @pytest.mark.asyncio
 async def test_get_ticker_history_different_ranges(async_client):
     """Test history with different time ranges."""
-    async with async_client as client:
-        for range_val in ["1D", "1M", "6M", "1Y"]:
-            response = await client.get(f"/ticker/SPY/history?range={range_val}")
-            assert response.status_code == 200
+    responses = await asyncio.gather(
+        *(
+            async_client.get(f"/ticker/SPY/history?range={range_val}")
+            for range_val in ["1D", "1M", "6M", "1Y"]
+        )
+    )
+    assert [response.status_code for response in responses] == [200] * 4
 
 
 @pytest.mark.asyncio
 async def test_ticker_snapshot_has_price_fields(async_client):
     """Test that snapshot includes price-related fields."""
-    async with async_client as client:
-        response = await client.get("/ticker/AAPL/snapshot")
+    response = await async_client.get("/ticker/AAPL/snapshot")
 
     assert response.status_code == 200
     data = response.json()
@@ -91,8 +91,7 @@ async def test_ticker_snapshot_has_price_fields(async_client):
 @pytest.mark.asyncio
 async def test_history_points_have_required_fields(async_client):
     """Test that history points have date, close, high, low."""
-    async with async_client as client:
-        response = await client.get("/ticker/QQQ/history?range=1M")
+    response = await async_client.get("/ticker/QQQ/history?range=1M")
 
     assert response.status_code == 200
     data = response.json()
@@ -103,3 +102,98 @@ async def test_history_points_have_required_fields(async_client):
     assert "close" in point
     assert "high" in point
     assert "low" in point
+
+
+@pytest.mark.asyncio
+async def test_get_ticker_snapshots(async_client):
+    """Test batch snapshots keep request order and collapse duplicates."""
+    response = await async_client.get("/ticker/snapshots", params={"symbols": "nvda, AAPL,NVDA"})
+
+    assert response.status_code == 200
+    assert [item["ticker"] for item in response.json()] == ["NVDA", "AAPL"]
+
+
+@pytest.mark.asyncio
+async def test_get_ticker_snapshots_requires_symbols(async_client):
+    """Test batch snapshots reject an empty symbol list."""
+    response = await async_client.get("/ticker/snapshots", params={"symbols": " , "})
+
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_history_response_bytes_match_stdlib_encoding(async_client):
+    """The fast encoder emits exactly what the stdlib JSONResponse would."""
+    response = await async_client.get("/ticker/AAPL/history", params={"range": "1Y"})
+
+    assert response.status_code == 200
+    payload = response.json()
+    assert response.content == JSONResponse(payload).body
+    assert FastJSONResponse({"name": "Café", "n": [1, 2.5, None]}).body == JSONResponse(
+        {"name": "Café", "n": [1, 2.5, None]}
+    ).body
+
+
+@pytest.mark.parametrize(
+    ("market_cap", "expected"),
+    [
+        (None, "N/A"),
+        (0, "0"),
+        (999_999, "999,999"),
+        (1_000_000, "1.00M"),
+        (485_000_000_000, "485.00B"),
+        (999_999_999_999, "1000.00B"),
+        (1_000_000_000_000, "1.00T"),
+        (2_890_000_000_000, "2.89T"),
+        (12_345_000_000_000_000, "12345.00T"),
+    ],
+)
+def test_format_market_cap_buckets(market_cap, expected):
+    """Market caps use the largest unit they reach, with exact thresholds."""
+    assert _format_market_cap(market_cap) == expected
+
+
+@pytest.mark.parametrize(
+    ("week_52_high", "week_52_low", "expected"),
+    [
+        (129.99, 100.0, VolatilityLevel.LOW),
+        (130.0, 100.0, VolatilityLevel.MODERATE),
+        (159.99, 100.0, VolatilityLevel.MODERATE),
+        (160.0, 100.0, VolatilityLevel.HIGH),
+        (0.0, 100.0, VolatilityLevel.MODERATE),
+        (100.0, 0.0, VolatilityLevel.MODERATE),
+    ],
+)
+def test_calculate_volatility_bands(week_52_high, week_52_low, expected):
+    """Range bands are half-open: 30% and 60% belong to the higher level."""
+    assert _calculate_volatility(week_52_high, week_52_low) == expected
+
+
+def test_price_points_are_immutable():
+    """Price points reject assignment once built."""
+    point = PricePoint(date=datetime(2024, 1, 2, tzinfo=UTC), close=10.0, high=11.0, low=9.0)
+
+    with pytest.raises(PydanticValidationError):
+        point.close = 12.0
+
+
+def test_every_chart_range_maps_to_a_provider_period():
+    """Each ChartTimeRange has a history period the provider understands."""
+    assert set(_PERIOD_MAP) == set(ChartTimeRange)
+    assert set(_PERIOD_MAP.values()) <= set(PERIOD_MAP)
+
+
+@pytest.mark.asyncio
+async def test_stream_history_ndjson_lines_match_history_points(async_client, monkeypatch):
+    """Streamed NDJSON has one line per point, matching the JSON history endpoint."""
+    from app.services import ticker_service
+
+    monkeypatch.setattr(ticker_service, "_NDJSON_CHUNK_POINTS", 7)
+    history = await async_client.get("/ticker/SPY/history?range=1Y")
+    response = await async_client.get("/ticker/SPY/history.ndjson?range=1Y")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert response.text.endswith("\n")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert lines == history.json()["points"]